@@ -0,0 +1,104 @@
+"""
+BENCHMARK: Peak Memory of the Dtype Policy
+
+Runs build_features -> build_labels on a multi-year synthetic M5 dataset
+twice, with `memory.compact_dtypes` off (everything float64/int64) and on,
+each in a fresh process so the peak RSS of one run does not leak into the
+other. Reports the peak RSS of each run, the in-memory size of the labeled
+frame and the size of the stores on disk.
+
+Usage:
+    python benchmarks/bench_memory.py
+    python benchmarks/bench_memory.py --years 10
+"""
+import argparse
+import multiprocessing
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from loguru import logger
+
+FEATURE_CONFIG = {'higher_timeframes': ['M15', 'H1', 'H4'], 'validate_on_build': False}
+LABELING_CONFIG = {'barriers': {'tp_multiplier': 2.0, 'sl_multiplier': 1.0, 'time_bars': 12}}
+
+
+def make_bars(years: float, seed: int = 42) -> pd.DataFrame:
+    """Synthetic M5 bars, Monday to Friday around the clock, typed as at ingest"""
+    rng = np.random.default_rng(seed)
+    index = pd.date_range('2015-01-05', periods=int(years * 365 * 288), freq='5min')
+    index = index[index.dayofweek < 5]
+    n = len(index)
+    close = rng.normal(0, 5, n).cumsum() + 16000
+    return pd.DataFrame({
+        'open': close,
+        'high': close + rng.uniform(0, 10, n),
+        'low': close - rng.uniform(0, 10, n),
+        'close': close,
+        'tick_volume': rng.integers(1, 500, n),
+        'spread': rng.uniform(1, 3, n)
+    }, index=index)
+
+
+def directory_mb(path: Path) -> float:
+    """Size of the files under `path` (MB)"""
+    return sum(f.stat().st_size for f in path.rglob('*') if f.is_file()) / 1024 ** 2
+
+
+def run_pipeline(years: float, compact: bool) -> dict:
+    """Features and labels of `years` of bars in this (fresh) process"""
+    from aurum_edge.core.memory import frame_mb, peak_rss_mb
+    from aurum_edge.pipelines.build_features import build_features
+    from aurum_edge.pipelines.build_labels import build_labels
+
+    logger.remove()
+    bars = make_bars(years)
+    start = time.perf_counter()
+    with tempfile.TemporaryDirectory() as workdir:
+        features_store = Path(workdir) / 'features'
+        labels_path = Path(workdir) / 'labels' / 'labeled_dataset.parquet'
+        build_features(bars, FEATURE_CONFIG, features_store, 'NAS100', 'M5', compact=compact)
+        samples = build_labels(features_store, labels_path, LABELING_CONFIG, 'NAS100', 'M5', compact=compact)
+        labeled = pd.read_parquet(labels_path)
+        return {
+            'bars': len(bars),
+            'samples': samples,
+            'seconds': time.perf_counter() - start,
+            'peak_rss_mb': peak_rss_mb(),
+            'labeled_mb': frame_mb(labeled),
+            'disk_mb': directory_mb(Path(workdir))
+        }
+
+
+def measure(years: float, compact: bool) -> dict:
+    """run_pipeline in a new process (spawned: nothing inherited from this one)"""
+    context = multiprocessing.get_context('spawn')
+    with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+        return executor.submit(run_pipeline, years, compact).result()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--years', type=float, default=5.0, help="Years of M5 bars")
+    args = parser.parse_args()
+
+    before = measure(args.years, compact=False)
+    after = measure(args.years, compact=True)
+
+    print(f"{before['bars']:,} bars ({args.years:g} years of M5), {after['samples']:,} labeled samples")
+    print()
+    print(f"{'compact_dtypes':>14} | {'peak RSS':>10} | {'labeled frame':>13} | {'on disk':>9} | {'time':>7}")
+    print("-" * 66)
+    for name, run in (('false', before), ('true', after)):
+        print(f"{name:>14} | {run['peak_rss_mb']:>7.0f} MB | {run['labeled_mb']:>10.0f} MB | "
+              f"{run['disk_mb']:>6.0f} MB | {run['seconds']:>6.1f}s")
+    print()
+    print(f"Peak RSS {1 - after['peak_rss_mb'] / before['peak_rss_mb']:.0%} lower, "
+          f"labeled frame {1 - after['labeled_mb'] / before['labeled_mb']:.0%} smaller")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,36 +1,192 @@
 """Trading costs simulation"""
+import numpy as np
+import pandas as pd
 
-def apply_costs(entry_price, exit_price, direction='long', config=None):
+from aurum_edge.core.calendar import _parse_minute
+
+# Price units per point when no asset config is given (NAS100 / US30 tick size)
+DEFAULT_POINT = 0.1
+
+class CostModel:
+    """
+    Round-trip cost of a trade entered at each bar, for whole arrays at once
+
+    Spread (points):
+        - 'fixed': asset `costs.spread_points` (or `spread.fixed_points`)
+        - 'time_based': session spreads of `spread.time_based` by minute of
+          the day (asset `specs.sessions`; overlaps take the tightest
+          session, hours outside every session are 'overnight'), rescaled
+          from the reference `spread.fixed_points` to the asset's typical
+          spread
+        - the data's `spread` column (MT5 export, points) replaces the model
+          where positive when `spread.use_data_column` is set
+    Slippage (points): fixed (asset `costs.slippage_points`) plus, with
+    `slippage.model: atr`, `slippage.atr.fraction` points per ATR point.
+
+    Points become prices with the asset tick size, and price moves become
+    account currency with tick_value / tick_size per lot (the contract
+    size). Without configs this is the old fixed model: 2.5 points of 0.1.
+    """
+
+    def __init__(self, config=None, asset_config=None):
+        """
+        Args:
+            config: Costs config (configs/costs/*.yaml, fixed defaults if None)
+            asset_config: Asset config (configs/assets/*.yaml) for point
+                value, contract size, sessions and typical spread/slippage
+        """
+        config = config or {}
+        asset_config = asset_config or {}
+        specs = asset_config.get('specs', {})
+        asset_costs = asset_config.get('costs', {})
+        spread = config.get('spread', {})
+        slippage = config.get('slippage', {})
+
+        self.point = specs.get('tick_size', DEFAULT_POINT)
+        if 'tick_value' in specs and 'tick_size' in specs:
+            self.value_per_price = specs['tick_value'] / specs['tick_size']
+        else:
+            self.value_per_price = specs.get('contract_size', 1.0)
+
+        reference_spread = spread.get('fixed_points', 2.0)
+        self.spread_points = asset_costs.get('spread_points', reference_spread)
+        self.slippage_points = asset_costs.get('slippage_points', slippage.get('fixed_points', 0.5))
+        self.atr_fraction = slippage.get('atr', {}).get('fraction', 0.0) if slippage.get('model') == 'atr' else 0.0
+        self.use_data_spread = spread.get('use_data_column', False)
+        self.commission_per_lot = asset_costs.get('commission_per_lot', config.get('commission', {}).get('per_lot', 0.0))
+        self.commission_per_trade = config.get('commission', {}).get('per_trade', 0.0)
+
+        # Spread (points) per minute of the day
+        self.spread_by_minute = np.full(1440, float(self.spread_points))
+        if spread.get('type') == 'time_based':
+            scale = self.spread_points / reference_spread
+            time_based = spread.get('time_based', {})
+            sessions = specs.get('sessions', {})
+            self.spread_by_minute[:] = time_based.get('overnight', reference_spread) * scale
+            in_session = np.zeros(1440, dtype=bool)
+            minutes = np.arange(1440)
+            for name, hours in sessions.items():
+                if f'{name}_session' not in time_based:
+                    continue
+                start, end = _parse_minute(hours['start']), _parse_minute(hours['end'])
+                mask = (minutes >= start) & (minutes < end) if start < end else (minutes >= start) | (minutes < end)
+                value = time_based[f'{name}_session'] * scale
+                self.spread_by_minute[mask] = np.where(in_session[mask],
+                                                       np.minimum(self.spread_by_minute[mask], value), value)
+                in_session |= mask
+
+    @classmethod
+    def from_config(cls, config):
+        """Cost model of the configured asset (Config.costs_config + asset_config)"""
+        return cls(config.costs_config, config.asset_config)
+
+    def costs(self, times, atr=None, spread=None):
+        """
+        Round-trip costs of trades entered at `times`
+
+        Args:
+            times: Entry timestamps (UTC)
+            atr: ATR at entry (price units), for volatility slippage
+            spread: Quoted spread at entry (points, <= 0 / NaN = unknown)
+
+        Returns:
+            Dict of arrays in price units: spread_cost, slippage_cost, total_cost
+        """
+        times = pd.DatetimeIndex(times)
+        if times.tz is not None:
+            times = times.tz_convert(None)
+        spread_points = self.spread_by_minute[times.hour * 60 + times.minute]
+        if spread is not None and self.use_data_spread:
+            spread = np.asarray(spread, dtype=np.float64)
+            spread_points = np.where(spread > 0, spread, spread_points)
+
+        slippage_points = np.full(len(times), float(self.slippage_points))
+        if atr is not None and self.atr_fraction:
+            atr = np.nan_to_num(np.asarray(atr, dtype=np.float64))
+            slippage_points = slippage_points + self.atr_fraction * atr / self.point
+
+        spread_cost = spread_points * self.point
+        slippage_cost = slippage_points * self.point
+        return {
+            'spread_cost': spread_cost,
+            'slippage_cost': slippage_cost,
+            'total_cost': spread_cost + slippage_cost
+        }
+
+    def bar_costs(self, prices, atr_col='atr_14'):
+        """Costs of a trade entered at every bar of `prices` (uses its spread and ATR columns)"""
+        return self.costs(
+            prices.index,
+            atr=prices[atr_col].to_numpy() if atr_col in prices.columns else None,
+            spread=prices['spread'].to_numpy() if 'spread' in prices.columns else None
+        )
+
+    def net_pnl(self, direction, entry_price, exit_price, total_cost, size=1.0):
+        """
+        Net PnL in account currency
+
+        Args:
+            direction: 1 long / -1 short (scalar or array)
+            entry_price: Entry prices
+            exit_price: Exit prices
+            total_cost: Round-trip costs (price units)
+            size: Lots
+
+        Returns:
+            (price move - costs) * contract size * lots - commissions
+        """
+        gross = np.asarray(direction) * (np.asarray(exit_price) - np.asarray(entry_price))
+        commission = self.commission_per_lot * size + self.commission_per_trade
+        return (gross - total_cost) * self.value_per_price * size - commission
+
+def trade_costs(config=None, asset_config=None):
     """
-    Apply trading costs to a trade
-    
+    Round-trip cost of one trade in price units (typical spread and fixed
+    slippage, no time-of-day or volatility terms)
+
     Returns:
-        Adjusted PnL after costs
+        Dict with spread_cost, slippage_cost and total_cost
     """
-    if config is None:
-        spread_points = 2.0
-        slippage_points = 0.5
-    else:
-        spread_points = config.get('spread', {}).get('fixed_points', 2.0)
-        slippage_points = config.get('slippage', {}).get('fixed_points', 0.5)
-    
-    # Convert points to price
-    spread_cost = spread_points * 0.1
-    slippage_cost = slippage_points * 0.1
-    
-    total_cost = spread_cost + slippage_cost
-    
-    # Gross PnL
-    if direction == 'long':
-        gross_pnl = exit_price - entry_price
-    else:
-        gross_pnl = entry_price - exit_price
-    
-    # Net PnL after costs
-    net_pnl = gross_pnl - total_cost
-    
-    return net_pnl, {
+    model = CostModel(config, asset_config)
+
+    spread_cost = model.spread_points * model.point
+    slippage_cost = model.slippage_points * model.point
+
+    return {
         'spread_cost': spread_cost,
         'slippage_cost': slippage_cost,
-        'total_cost': total_cost
+        'total_cost': spread_cost + slippage_cost
     }
+
+def apply_costs(entry_price, exit_price, direction='long', config=None, asset_config=None,
+                times=None, atr=None, spread=None):
+    """
+    Apply trading costs to one trade or to arrays of trades
+
+    Args:
+        entry_price: Entry price(s)
+        exit_price: Exit price(s)
+        direction: 'long' / 'short', or 1 / -1 per trade
+        config: Costs config
+        asset_config: Asset config (point value, sessions, typical spread)
+        times: Entry timestamps (time-of-day spread; fixed spread if None)
+        atr: ATR at entry (volatility slippage)
+        spread: Quoted spread at entry (points)
+
+    Returns:
+        Adjusted PnL after costs (price units) and the costs dict
+    """
+    if times is None:
+        costs = trade_costs(config, asset_config)
+    else:
+        costs = CostModel(config, asset_config).costs(times, atr=atr, spread=spread)
+
+    # Gross PnL
+    if isinstance(direction, str):
+        direction = 1 if direction == 'long' else -1
+    gross_pnl = np.asarray(direction) * (np.asarray(exit_price) - np.asarray(entry_price))
+
+    # Net PnL after costs
+    net_pnl = gross_pnl - costs['total_cost']
+
+    return net_pnl, costs
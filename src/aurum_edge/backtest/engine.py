@@ -1,84 +1,399 @@
 """Backtest engine"""
+from typing import Dict, Optional
+
 import pandas as pd
 import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
 from loguru import logger
 
+from aurum_edge.backtest.costs import CostModel
+from aurum_edge.backtest.ledger import TradeLedger
+from aurum_edge.backtest.metrics import performance_metrics
+from aurum_edge.labeling.triple_barrier import BARRIER_TYPES
+
 class BacktestEngine:
     """Simple backtest engine"""
     
-    def __init__(self, initial_balance=1000.0, position_size=0.01):
+    def __init__(self, initial_balance=1000.0, position_size=0.01, calendar=None):
+        """
+        Args:
+            initial_balance: Starting balance
+            position_size: Lots per trade
+            calendar: TradingCalendar of the asset. Each trade records the
+                bars missing from `prices` while it was open (0 = no data gap).
+        """
         self.initial_balance = initial_balance
+        self.calendar = calendar
         self.balance = initial_balance
         self.position_size = position_size
-        self.trades = []
+        self.trades = TradeLedger(
+            initial_balance,
+            extra_columns={'missing_bars': np.int32} if calendar is not None else None
+        )
         self.equity_curve = []
     
-    def run(self, signals: pd.DataFrame, prices: pd.DataFrame):
+    def run(self, signals: pd.DataFrame, prices: pd.DataFrame, use_barrier_exits: bool = False,
+            bar_index: Optional[pd.DatetimeIndex] = None):
         """
         Run backtest
         
         Args:
             signals: DataFrame with 'signal' column (1=long, 0=short/no-trade)
             prices: DataFrame with OHLC prices
+            use_barrier_exits: Exit at the triple-barrier outcome ('t1' and
+                'barrier_return' columns from the labeler) instead of the
+                close 12 bars later
+            bar_index: Index of the bar store, when `prices` holds only some
+                of its bars (labeled rows); missing bars are counted on it
         """
         logger.info("Running backtest...")
         
+        if use_barrier_exits:
+            missing = [c for c in ['t1', 'barrier_return'] if c not in prices.columns]
+            if missing:
+                raise ValueError(f"Barrier exits need labeler columns: {missing}")
+        
+        first_trade = len(self.trades)
+        
         for i in range(len(signals)):
             signal = signals['signal'].iloc[i]
             entry_price = prices['close'].iloc[i]
             
             if signal == 1:
                 # Simulate long trade
-                exit_idx = min(i + 12, len(prices) - 1)  # 12 bar max hold
-                exit_price = prices['close'].iloc[exit_idx]
+                if use_barrier_exits:
+                    # Reuse the labeler's forward path (TP/SL/time already resolved)
+                    exit_time = prices['t1'].iloc[i]
+                    exit_price = entry_price * (1 + prices['barrier_return'].iloc[i])
+                else:
+                    exit_idx = min(i + 12, len(prices) - 1)  # 12 bar max hold
+                    exit_time = prices.index[exit_idx]
+                    exit_price = prices['close'].iloc[exit_idx]
                 
                 pnl = (exit_price - entry_price) * self.position_size
                 self.balance += pnl
                 
-                self.trades.append({
-                    'entry_time': prices.index[i],
-                    'exit_time': prices.index[exit_idx],
-                    'entry_price': entry_price,
-                    'exit_price': exit_price,
-                    'pnl': pnl,
-                    'return_pct': (exit_price - entry_price) / entry_price
-                })
+                self.trades.append(
+                    entry_time=prices.index[i],
+                    exit_time=exit_time,
+                    entry_price=entry_price,
+                    exit_price=exit_price,
+                    pnl=pnl,
+                    size=self.position_size
+                )
             
             self.equity_curve.append(self.balance)
         
+        if self.calendar is not None:
+            self._mark_data_gaps(first_trade, prices.index if bar_index is None else bar_index)
+        
         logger.info(f"Backtest complete: {len(self.trades)} trades")
         return self.get_metrics()
     
+    def _mark_data_gaps(self, first_trade, index):
+        """Bars the calendar expects between entry and exit that are not in `index`"""
+        if len(self.trades) == first_trade:
+            return
+        
+        def times(name):
+            # The ledger keeps naive UTC times
+            values = pd.DatetimeIndex(self.trades.column(name)[first_trade:])
+            return values.tz_localize('UTC').tz_convert(index.tz) if index.tz is not None else values
+        
+        entries, exits = times('entry_time'), times('exit_time')
+        present = index.searchsorted(exits) - index.searchsorted(entries)
+        missing = np.maximum(self.calendar.expected_bars(entries, exits) - present, 0)
+        self.trades.column('missing_bars')[first_trade:] = missing
+        
+        n_gaps = int((missing > 0).sum())
+        if n_gaps:
+            logger.warning(f"{n_gaps} trades held across missing bars (max {missing.max()} bars)")
+    
     def get_metrics(self):
-        """Calculate performance metrics"""
-        if not self.trades:
-            return {}
-        
-        df_trades = pd.DataFrame(self.trades)
-        
-        total_pnl = df_trades['pnl'].sum()
-        wins = df_trades[df_trades['pnl'] > 0]
-        losses = df_trades[df_trades['pnl'] < 0]
-        
-        metrics = {
-            'total_pnl': total_pnl,
-            'num_trades': len(self.trades),
-            'win_rate': len(wins) / len(self.trades) if len(self.trades) > 0 else 0,
-            'avg_win': wins['pnl'].mean() if len(wins) > 0 else 0,
-            'avg_loss': losses['pnl'].mean() if len(losses) > 0 else 0,
-            'profit_factor': abs(wins['pnl'].sum() / losses['pnl'].sum()) if len(losses) > 0 and losses['pnl'].sum() != 0 else 0,
-            'max_drawdown': self._calculate_max_drawdown(),
-            'expectancy': df_trades['pnl'].mean()
-        }
+        """Performance metrics (running totals of the trade ledger, O(1))"""
+        return self.trades.metrics()
+
+
+def _first_touch(windows: np.ndarray, level: np.ndarray, above: bool) -> np.ndarray:
+    """Offset (1-based) of the first bar touching `level`, 0 if none does"""
+    hits = windows >= level[:, None] if above else windows <= level[:, None]
+    first = hits.argmax(axis=1) + 1
+    first[~hits.any(axis=1)] = 0
+    return first
+
+
+def simulate_trades(
+    signal: np.ndarray,
+    open_: Optional[np.ndarray],
+    high: np.ndarray,
+    low: np.ndarray,
+    close: np.ndarray,
+    atr: Optional[np.ndarray],
+    tp_multiplier: Optional[float] = 2.0,
+    sl_multiplier: Optional[float] = 1.0,
+    max_hold_bars: int = 12,
+    chunk_size: int = 250_000
+) -> Dict[str, np.ndarray]:
+    """
+    Non-overlapping trades of a signal series, resolved on arrays
+
+    A trade enters at the close of a bar whose signal is 1 (long) or -1
+    (short) while flat, and exits at the first bar whose high/low touches
+    the TP or SL (entry +/- multiplier * ATR), or at the close `max_hold_bars`
+    later. When both barriers fall inside one bar the SL is assumed first;
+    a bar that opens beyond a barrier fills at its open. The exit of every
+    candidate entry is found at once (sliding windows over high/low), then
+    entries are chained so a new trade only opens once the previous one has
+    closed (it may open on the exit bar's close).
+
+    Args:
+        signal: Per-bar signal (1 long, -1 short, 0 none)
+        open_: Open prices (None = fills exactly at the barrier)
+        high, low, close: Prices
+        atr: ATR per bar (required when a barrier is set; entries without
+            a valid ATR are skipped)
+        tp_multiplier: TP distance in ATRs (None = no take profit)
+        sl_multiplier: SL distance in ATRs (None = no stop loss)
+        max_hold_bars: Time exit
+        chunk_size: Candidate entries resolved per block
+
+    Returns:
+        Dict of per-trade arrays: entry_idx, exit_idx, direction (int8),
+        entry_price, exit_price, exit_reason (index into BARRIER_TYPES)
+    """
+    signal = np.sign(np.nan_to_num(np.asarray(signal, dtype=np.float64))).astype(np.int8)
+    high = np.asarray(high, dtype=np.float64)
+    low = np.asarray(low, dtype=np.float64)
+    close = np.asarray(close, dtype=np.float64)
+    n = len(close)
+    
+    candidates = signal != 0
+    if tp_multiplier is not None or sl_multiplier is not None:
+        atr = np.asarray(atr, dtype=np.float64)
+        candidates &= np.isfinite(atr) & (atr > 0)
+    cand = np.flatnonzero(candidates[:max(n - 1, 0)])  # the last bar has no future
+    
+    # Bars after entry i live at index i of the padded arrays; padding never touches
+    high_pad = np.concatenate([high[1:], np.full(max_hold_bars, -np.inf)])
+    low_pad = np.concatenate([low[1:], np.full(max_hold_bars, np.inf)])
+    high_windows = sliding_window_view(high_pad, max_hold_bars)
+    low_windows = sliding_window_view(low_pad, max_hold_bars)
+    
+    offset = np.zeros(len(cand), dtype=np.int64)
+    reason = np.full(len(cand), BARRIER_TYPES.index('time'), dtype=np.int8)
+    level = np.zeros(len(cand))
+    direction = signal[cand]
+    
+    for start in range(0, len(cand), chunk_size):
+        idx = cand[start:start + chunk_size]
+        sign = direction[start:start + chunk_size].astype(np.float64)
+        long_side = sign > 0
+        entry = close[idx]
+        highs, lows = high_windows[idx], low_windows[idx]
         
-        return metrics
+        tp_first = np.zeros(len(idx), dtype=np.int64)
+        sl_first = np.zeros(len(idx), dtype=np.int64)
+        if tp_multiplier is not None:
+            tp_price = entry + sign * tp_multiplier * atr[idx]
+            tp_first = np.where(long_side, _first_touch(highs, tp_price, True), _first_touch(lows, tp_price, False))
+        if sl_multiplier is not None:
+            sl_price = entry - sign * sl_multiplier * atr[idx]
+            sl_first = np.where(long_side, _first_touch(lows, sl_price, False), _first_touch(highs, sl_price, True))
+        
+        is_sl = (sl_first > 0) & ((tp_first == 0) | (sl_first <= tp_first))
+        is_tp = (tp_first > 0) & ~is_sl
+        
+        block = slice(start, start + len(idx))
+        offset[block] = np.where(is_sl, sl_first, np.where(is_tp, tp_first, max_hold_bars))
+        reason[block][is_tp] = BARRIER_TYPES.index('tp')
+        reason[block][is_sl] = BARRIER_TYPES.index('sl')
+        if tp_multiplier is not None:
+            level[block][is_tp] = tp_price[is_tp]
+        if sl_multiplier is not None:
+            level[block][is_sl] = sl_price[is_sl]
+    
+    exit_idx = np.minimum(cand + offset, n - 1)
+    
+    # Chain entries: after trade k, the next one is the first candidate at or after its exit
+    following = np.searchsorted(cand, exit_idx, side='left')
+    following = following.tolist()
+    taken = []
+    k = 0
+    while k < len(cand):
+        taken.append(k)
+        k = following[k]
+    taken = np.asarray(taken, dtype=np.int64)
     
-    def _calculate_max_drawdown(self):
-        """Calculate maximum drawdown"""
-        if not self.equity_curve:
-            return 0
+    entry_idx = cand[taken]
+    exit_idx = exit_idx[taken]
+    direction = direction[taken]
+    reason = reason[taken]
+    level = level[taken]
+    
+    exit_price = close[exit_idx].copy()
+    barrier = reason != BARRIER_TYPES.index('time')
+    exit_price[barrier] = level[barrier]
+    if open_ is not None and barrier.any():
+        # Gaps through a barrier fill at the open (worse for SL, better for TP)
+        bar_open = np.asarray(open_, dtype=np.float64)[exit_idx[barrier]]
+        sign = direction[barrier]
+        is_tp = reason[barrier] == BARRIER_TYPES.index('tp')
+        beyond = np.where(is_tp, sign * (bar_open - level[barrier]) > 0, sign * (bar_open - level[barrier]) < 0)
+        exit_price[barrier] = np.where(beyond, bar_open, level[barrier])
+    
+    return {
+        'entry_idx': entry_idx,
+        'exit_idx': exit_idx,
+        'direction': direction,
+        'entry_price': close[entry_idx],
+        'exit_price': exit_price,
+        'exit_reason': reason
+    }
+
+
+class VectorizedBacktestEngine:
+    """Array backtest: one position at a time, intrabar SL/TP, costs, per-bar equity"""
+    
+    def __init__(self, initial_balance=1000.0, position_size=0.01, tp_multiplier=2.0,
+                 sl_multiplier=1.0, max_hold_bars=12, cost_config=None, calendar=None,
+                 periods_per_year=None, asset_config=None, cost_model=None):
+        """
+        Args:
+            initial_balance: Starting balance
+            position_size: Lots per trade
+            tp_multiplier: TP distance in ATRs (None = no take profit)
+            sl_multiplier: SL distance in ATRs (None = no stop loss)
+            max_hold_bars: Time exit
+            cost_config: Costs config (backtest/costs.py, defaults if None)
+            calendar: TradingCalendar of the asset. Each trade records the
+                bars missing from `prices` while it was open (0 = no data gap).
+            periods_per_year: Bars per year for the equity metrics (default
+                the calendar's bars_per_year, else 252 * 288)
+            asset_config: Asset config for the cost model (point value,
+                contract size, sessions); PnL is in account currency
+            cost_model: Prebuilt CostModel (e.g. CostModel.from_config);
+                replaces cost_config / asset_config
+        """
+        self.initial_balance = initial_balance
+        self.position_size = position_size
+        self.tp_multiplier = tp_multiplier
+        self.sl_multiplier = sl_multiplier
+        self.max_hold_bars = max_hold_bars
+        self.cost_config = cost_config
+        self.cost_model = cost_model if cost_model is not None else CostModel(cost_config, asset_config)
+        self.calendar = calendar
+        self.periods_per_year = periods_per_year or (calendar.bars_per_year if calendar is not None else 252*288)
+        self.ledger = self._new_ledger()
+        self.equity = pd.Series(dtype=np.float64)
+        self.positions = pd.Series(dtype=np.float64)
+        self._equity_metrics = {}
+    
+    def _new_ledger(self) -> TradeLedger:
+        extra = {'exit_reason': np.int8, 'bars_held': np.int32}
+        if self.calendar is not None:
+            extra['missing_bars'] = np.int32
+        return TradeLedger(self.initial_balance, extra_columns=extra)
+    
+    @property
+    def trades(self) -> pd.DataFrame:
+        """Trade ledger of the last run as a DataFrame"""
+        trades = self.ledger.to_frame()
+        trades['exit_reason'] = pd.Categorical.from_codes(trades['exit_reason'], BARRIER_TYPES)
+        return trades
+    
+    def run(self, signals, prices: pd.DataFrame, atr_col: str = 'atr_14'):
+        """
+        Run backtest
         
-        equity = np.array(self.equity_curve)
-        running_max = np.maximum.accumulate(equity)
-        drawdown = (equity - running_max) / running_max
-        return drawdown.min()
+        Args:
+            signals: 'signal' column / Series / array aligned with `prices`
+                (1 = long, -1 = short, 0 = no trade)
+            prices: DataFrame with high, low, close (open optional) and `atr_col`
+            atr_col: ATR column for the barriers
+        
+        Returns:
+            Metrics dict: the keys of BacktestEngine.get_metrics plus the
+            equity-curve metrics of `performance_metrics`. The trades are left
+            in `ledger` (`trades` as a DataFrame), the per-bar marked-to-market
+            equity in `equity` and the position held over each bar in
+            `positions`.
+        """
+        if isinstance(signals, pd.DataFrame):
+            signals = signals['signal']
+        signal = np.asarray(signals)
+        if len(signal) != len(prices):
+            raise ValueError(f"{len(signal)} signals for {len(prices)} bars")
+        
+        close = prices['close'].to_numpy(dtype=np.float64)
+        trades = simulate_trades(
+            signal,
+            prices['open'].to_numpy() if 'open' in prices.columns else None,
+            prices['high'].to_numpy(),
+            prices['low'].to_numpy(),
+            close,
+            prices[atr_col].to_numpy() if atr_col in prices.columns else None,
+            tp_multiplier=self.tp_multiplier,
+            sl_multiplier=self.sl_multiplier,
+            max_hold_bars=self.max_hold_bars
+        )
+        
+        # Costs of each entry bar (session spread, data spread, ATR slippage)
+        cost = self.cost_model.bar_costs(prices, atr_col)['total_cost'][trades['entry_idx']]
+        gross = trades['direction'] * (trades['exit_price'] - trades['entry_price'])
+        pnl = self.cost_model.net_pnl(trades['direction'], trades['entry_price'], trades['exit_price'],
+                                      cost, self.position_size)
+        
+        columns = {
+            'entry_time': prices.index[trades['entry_idx']],
+            'exit_time': prices.index[trades['exit_idx']],
+            'direction': trades['direction'],
+            'size': self.position_size,
+            'entry_price': trades['entry_price'],
+            'exit_price': trades['exit_price'],
+            'exit_reason': trades['exit_reason'],
+            'bars_held': trades['exit_idx'] - trades['entry_idx'],
+            'pnl': pnl,
+            'return_pct': gross / trades['entry_price']
+        }
+        if self.calendar is not None:
+            expected = self.calendar.expected_bars(columns['entry_time'], columns['exit_time'])
+            columns['missing_bars'] = np.maximum(expected - columns['bars_held'], 0)
+        self.ledger = self._new_ledger()
+        self.ledger.extend(columns)
+        
+        # Equity: realized PnL booked on exit bars + open position marked at the close,
+        # net of its costs from the entry bar on (same units as the ledger PnL)
+        n = len(close)
+        realized = np.cumsum(np.bincount(trades['exit_idx'], weights=pnl, minlength=n)[:n])
+        mark = np.zeros(n)
+        position = np.zeros(n)
+        if len(pnl):
+            bars = np.arange(n)
+            current = np.searchsorted(trades['entry_idx'], bars, side='right') - 1
+            open_position = (current >= 0) & (bars < trades['exit_idx'][np.maximum(current, 0)])
+            k = current[open_position]
+            mark[open_position] = self.cost_model.net_pnl(
+                trades['direction'][k], trades['entry_price'][k], close[open_position], cost[k], self.position_size
+            )
+            position[open_position] = trades['direction'][k] * self.position_size
+        self.equity = pd.Series(
+            self.initial_balance + realized + mark,
+            index=prices.index, name='equity'
+        )
+        
+        self.positions = pd.Series(position, index=prices.index, name='position')
+        self._equity_metrics = performance_metrics(
+            np.concatenate([[self.initial_balance], self.equity.to_numpy()]),
+            np.concatenate([[0.0], position]),
+            periods_per_year=self.periods_per_year
+        )
+        
+        logger.info(f"Backtest complete: {len(self.ledger)} trades over {n} bars")
+        return self.get_metrics()
+    
+    def get_metrics(self):
+        """Ledger metrics and the metrics of the marked-to-market equity (its drawdown replaces the ledger's)"""
+        metrics = self.ledger.metrics()
+        if metrics:
+            metrics.update(self._equity_metrics)
+        return metrics
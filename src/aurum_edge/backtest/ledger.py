@@ -0,0 +1,212 @@
+"""
+Columnar trade ledger with running metrics
+
+Closed trades are stored as preallocated NumPy columns that double in
+capacity when full, instead of a list of dicts or dataclasses. Every append
+also updates running accumulators (balance, peak, wins/losses, gross
+profit/loss, max drawdown), so `metrics()` is O(1) however long the
+simulation or paper session gets. Shared by BacktestEngine,
+VectorizedBacktestEngine and PaperTradingEngine.
+"""
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+# Column -> dtype of every ledger (times tz-naive, UTC for tz-aware input)
+LEDGER_COLUMNS = {
+    'entry_time': 'datetime64[ns]',
+    'exit_time': 'datetime64[ns]',
+    'direction': np.int8,  # 1 long, -1 short
+    'size': np.float64,
+    'entry_price': np.float64,
+    'exit_price': np.float64,
+    'pnl': np.float64,
+    'return_pct': np.float64
+}
+
+
+def _naive_time(value) -> np.datetime64:
+    """Timestamp-like -> datetime64[ns] (tz-aware converted to naive UTC, None -> NaT)"""
+    if value is None:
+        return np.datetime64('NaT', 'ns')
+    ts = pd.Timestamp(value)
+    if ts.tzinfo is not None:
+        ts = ts.tz_convert(None)
+    return ts.to_datetime64()
+
+
+def _naive_times(values) -> np.ndarray:
+    """Timestamps -> datetime64[ns] (tz-aware converted to naive UTC, None -> NaT)"""
+    times = pd.DatetimeIndex(values)
+    if times.tz is not None:
+        times = times.tz_convert(None)
+    return times.values.astype('datetime64[ns]')
+
+
+class TradeRecord:
+    """One row of a TradeLedger (read-only snapshot)"""
+    __slots__ = tuple(LEDGER_COLUMNS)
+
+    def __init__(self, **values):
+        for name in self.__slots__:
+            setattr(self, name, values.get(name))
+
+    def __repr__(self) -> str:
+        return (f"TradeRecord({self.entry_time} -> {self.exit_time}, direction={self.direction}, "
+                f"pnl={self.pnl:.2f})")
+
+
+class TradeLedger:
+    """Array-backed closed-trade store with O(1) metrics"""
+
+    __slots__ = (
+        'initial_balance', '_columns', '_n', 'balance', 'peak', 'max_drawdown',
+        'n_wins', 'n_losses', 'gross_win', 'gross_loss'
+    )
+
+    def __init__(self, initial_balance: float = 1000.0, capacity: int = 1024,
+                 extra_columns: Optional[Dict[str, np.dtype]] = None):
+        """
+        Args:
+            initial_balance: Balance before the first trade
+            capacity: Initial rows (doubles when full)
+            extra_columns: Additional per-trade columns (name -> dtype), e.g.
+                {'missing_bars': np.int32}
+        """
+        self.initial_balance = initial_balance
+        dtypes = {**LEDGER_COLUMNS, **(extra_columns or {})}
+        self._columns = {name: np.zeros(max(capacity, 1), dtype=dtype) for name, dtype in dtypes.items()}
+        self._n = 0
+        self.balance = initial_balance
+        self.peak = initial_balance
+        self.max_drawdown = 0.0
+        self.n_wins = 0
+        self.n_losses = 0
+        self.gross_win = 0.0
+        self.gross_loss = 0.0
+
+    def __len__(self) -> int:
+        return self._n
+
+    def __getitem__(self, i: int) -> TradeRecord:
+        if not -self._n <= i < self._n:
+            raise IndexError(f"trade {i} out of range ({self._n} trades)")
+        i %= self._n
+        values = {name: self._columns[name][i] for name in LEDGER_COLUMNS}
+        values['entry_time'] = pd.Timestamp(values['entry_time'])
+        values['exit_time'] = pd.Timestamp(values['exit_time'])
+        return TradeRecord(**values)
+
+    def __iter__(self):
+        return (self[i] for i in range(self._n))
+
+    def _reserve(self, extra: int):
+        capacity = len(self._columns['pnl'])
+        if self._n + extra <= capacity:
+            return
+        while capacity < self._n + extra:
+            capacity *= 2
+        for name, values in self._columns.items():
+            grown = np.zeros(capacity, dtype=values.dtype)
+            grown[:self._n] = values[:self._n]
+            self._columns[name] = grown
+
+    def append(self, entry_time, exit_time, entry_price: float, exit_price: float, pnl: float,
+               direction: int = 1, size: float = 1.0, return_pct: Optional[float] = None, **extra):
+        """Add one closed trade and update the running metrics"""
+        self._reserve(1)
+        i = self._n
+        c = self._columns
+        c['entry_time'][i] = _naive_time(entry_time)
+        c['exit_time'][i] = _naive_time(exit_time)
+        c['direction'][i] = direction
+        c['size'][i] = size
+        c['entry_price'][i] = entry_price
+        c['exit_price'][i] = exit_price
+        c['pnl'][i] = pnl
+        c['return_pct'][i] = return_pct if return_pct is not None else \
+            direction * (exit_price - entry_price) / entry_price
+        for name, value in extra.items():
+            c[name][i] = value
+        self._n += 1
+
+        if pnl > 0:
+            self.n_wins += 1
+            self.gross_win += pnl
+        elif pnl < 0:
+            self.n_losses += 1
+            self.gross_loss += pnl
+        self.balance += pnl
+        self.peak = max(self.peak, self.balance)
+        self.max_drawdown = min(self.max_drawdown, (self.balance - self.peak) / self.peak)
+
+    def extend(self, columns: Dict[str, np.ndarray]):
+        """
+        Add many closed trades at once (vectorized accumulator update)
+
+        Args:
+            columns: Equal-length arrays; entry_time, exit_time,
+                entry_price, exit_price and pnl required, other ledger
+                columns optional
+        """
+        pnl = np.asarray(columns['pnl'], dtype=np.float64)
+        m = len(pnl)
+        if m == 0:
+            return
+        self._reserve(m)
+        block = slice(self._n, self._n + m)
+        for name, values in columns.items():
+            if name in ('entry_time', 'exit_time'):
+                values = _naive_times(values)
+            self._columns[name][block] = values
+        if 'direction' not in columns:
+            self._columns['direction'][block] = 1
+        if 'size' not in columns:
+            self._columns['size'][block] = 1.0
+        if 'return_pct' not in columns:
+            c = self._columns
+            c['return_pct'][block] = c['direction'][block] * (c['exit_price'][block] - c['entry_price'][block]) \
+                / c['entry_price'][block]
+        self._n += m
+
+        self.n_wins += int((pnl > 0).sum())
+        self.n_losses += int((pnl < 0).sum())
+        self.gross_win += float(pnl[pnl > 0].sum())
+        self.gross_loss += float(pnl[pnl < 0].sum())
+        balances = self.balance + np.cumsum(pnl)
+        peaks = np.maximum.accumulate(np.maximum(balances, self.peak))
+        self.max_drawdown = min(self.max_drawdown, float(((balances - peaks) / peaks).min()))
+        self.balance = float(balances[-1])
+        self.peak = float(peaks[-1])
+
+    def column(self, name: str) -> np.ndarray:
+        """Values of one column for the stored trades (view, no copy)"""
+        return self._columns[name][:self._n]
+
+    @property
+    def total_pnl(self) -> float:
+        return self.balance - self.initial_balance
+
+    @property
+    def win_rate(self) -> float:
+        return self.n_wins / self._n if self._n else 0
+
+    def metrics(self) -> dict:
+        """Performance metrics from the running accumulators (O(1))"""
+        if self._n == 0:
+            return {}
+        return {
+            'total_pnl': self.total_pnl,
+            'num_trades': self._n,
+            'win_rate': self.win_rate,
+            'avg_win': self.gross_win / self.n_wins if self.n_wins else 0,
+            'avg_loss': self.gross_loss / self.n_losses if self.n_losses else 0,
+            'profit_factor': abs(self.gross_win / self.gross_loss) if self.gross_loss != 0 else 0,
+            'max_drawdown': self.max_drawdown,
+            'expectancy': self.total_pnl / self._n
+        }
+
+    def to_frame(self) -> pd.DataFrame:
+        """Stored trades as a DataFrame (one column per field)"""
+        return pd.DataFrame({name: self.column(name) for name in self._columns})
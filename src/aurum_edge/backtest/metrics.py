@@ -1,5 +1,6 @@
 """Performance metrics"""
 import numpy as np
+import pandas as pd
 
 def calculate_sharpe_ratio(returns, periods_per_year=252*288):
     """Calculate Sharpe ratio (annualized)"""
@@ -13,8 +14,136 @@ def calculate_sharpe_ratio(returns, periods_per_year=252*288):
     return sharpe
 
 def calculate_win_rate(trades):
-    """Calculate win rate"""
+    """Calculate win rate (TradeLedger, trades DataFrame or list of trade dicts)"""
     if len(trades) == 0:
         return 0
+    if hasattr(trades, 'win_rate'):
+        return trades.win_rate  # running ledger total
+    if hasattr(trades, 'columns'):
+        return float((trades['pnl'].to_numpy() > 0).mean())
     wins = sum(1 for t in trades if t['pnl'] > 0)
     return wins / len(trades)
+
+def _as_array(values) -> np.ndarray:
+    return np.asarray(values, dtype=np.float64)
+
+def _drawdown(equity: np.ndarray):
+    """Drawdown (fraction below the running peak) and bars since that peak"""
+    peak = np.maximum.accumulate(equity)
+    drawdown = equity / peak - 1
+    bars = np.arange(len(equity))
+    last_peak = np.maximum.accumulate(np.where(equity >= peak, bars, 0))
+    return drawdown, bars - last_peak
+
+def performance_metrics(equity, positions=None, periods_per_year=252*288):
+    """
+    Risk/return metrics of a per-bar equity curve, in one vectorized pass
+
+    Args:
+        equity: Equity per bar (marked to market)
+        positions: Position per bar (signed size, 0 = flat) for exposure and
+            turnover
+        periods_per_year: Bars per year (annualization)
+
+    Returns:
+        Dict with total_return, annual_return, volatility, sharpe, sortino
+        (downside deviation over all bars), max_drawdown (negative fraction),
+        max_drawdown_duration (bars below the previous peak), calmar,
+        ulcer_index (RMS drawdown, as a fraction), and with `positions`
+        exposure (fraction of bars in the market) and turnover (position
+        units traded per year)
+    """
+    equity = _as_array(equity)
+    if len(equity) < 2:
+        return {}
+
+    returns = equity[1:] / equity[:-1] - 1
+    mean, std = returns.mean(), returns.std(ddof=1)
+    downside = np.sqrt(np.mean(np.minimum(returns, 0) ** 2))
+    drawdown, underwater = _drawdown(equity)
+    max_drawdown = drawdown.min()
+
+    total_return = equity[-1] / equity[0] - 1
+    annual_return = (equity[-1] / equity[0]) ** (periods_per_year / (len(equity) - 1)) - 1 \
+        if equity[-1] > 0 else -1.0
+    scale = np.sqrt(periods_per_year)
+
+    metrics = {
+        'total_return': total_return,
+        'annual_return': annual_return,
+        'volatility': std * scale,
+        'sharpe': mean / std * scale if std > 0 else 0,
+        'sortino': mean / downside * scale if downside > 0 else 0,
+        'max_drawdown': max_drawdown,
+        'max_drawdown_duration': int(underwater.max()),
+        'calmar': annual_return / -max_drawdown if max_drawdown < 0 else 0,
+        'ulcer_index': np.sqrt(np.mean(drawdown ** 2))
+    }
+
+    if positions is not None:
+        positions = _as_array(positions)
+        metrics['exposure'] = np.count_nonzero(positions) / len(positions)
+        traded = np.abs(np.diff(positions, prepend=0.0)).sum()
+        metrics['turnover'] = traded * periods_per_year / len(positions)
+
+    return metrics
+
+def rolling_metrics(equity, window, positions=None, periods_per_year=252*288, index=None):
+    """
+    Rolling-window versions of the equity metrics
+
+    Args:
+        equity: Equity per bar
+        window: Window length in bars
+        positions: Position per bar (adds rolling exposure)
+        periods_per_year: Bars per year (annualization)
+        index: Index of the result (default 0..n-1)
+
+    Returns:
+        DataFrame per bar with return (over the window), volatility,
+        sharpe, sortino, drawdown (from the peak of the window) and
+        exposure; NaN until a full window is available
+    """
+    equity = pd.Series(_as_array(equity), index=index)
+    returns = equity.pct_change()
+    rolling = returns.rolling(window, min_periods=window)
+    mean, std = rolling.mean(), rolling.std()
+    downside = np.sqrt((np.minimum(returns, 0) ** 2).rolling(window, min_periods=window).mean())
+    scale = np.sqrt(periods_per_year)
+
+    result = pd.DataFrame({
+        'return': equity / equity.shift(window) - 1,
+        'volatility': std * scale,
+        'sharpe': (mean / std.where(std > 0)) * scale,
+        'sortino': (mean / downside.where(downside > 0)) * scale,
+        'drawdown': equity / equity.rolling(window, min_periods=window).max() - 1
+    })
+    if positions is not None:
+        in_market = pd.Series(_as_array(positions) != 0, index=equity.index, dtype=np.float64)
+        result['exposure'] = in_market.rolling(window, min_periods=window).mean()
+    return result
+
+def aggregate_folds(fold_metrics, weight='num_trades'):
+    """
+    Aggregate per-fold metrics (walk-forward, CPCV paths)
+
+    Args:
+        fold_metrics: List of metric dicts or a DataFrame, one row per fold
+        weight: Column used for the weighted average (None = equal weights)
+
+    Returns:
+        DataFrame with one column per numeric metric and rows mean, median,
+        std, min, max and weighted (mean weighted by `weight`, as in the
+        walk-forward `aggregate_method: weighted_average`)
+    """
+    folds = pd.DataFrame(fold_metrics).select_dtypes(include='number').dropna(axis=1, how='all')
+    summary = folds.agg(['mean', 'median', 'std', 'min', 'max'])
+
+    weights = folds[weight].fillna(0).to_numpy(dtype=np.float64) if weight in folds.columns \
+        else np.ones(len(folds))
+    values = folds.to_numpy(dtype=np.float64)
+    valid = ~np.isnan(values)
+    total = (weights[:, None] * valid).sum(axis=0)
+    weighted = np.where(valid, values, 0).T @ weights
+    summary.loc['weighted'] = np.divide(weighted, total, out=np.full(len(total), np.nan), where=total > 0)
+    return summary
@@ -0,0 +1,208 @@
+"""
+Monte Carlo robustness of a trade sequence
+
+A backtest gives one ordering of its trades, so its drawdown and profit
+factor are single draws. Here the closed-trade PnLs are resampled into many
+alternative paths:
+
+- 'shuffle': permutation of the same trades (same total and profit factor,
+  only the order and so the drawdown change);
+- 'bootstrap': trades drawn with replacement;
+- 'block': circular block bootstrap, blocks of consecutive trades drawn with
+  replacement (keeps streaks and regime clustering).
+
+Paths are simulated as (paths x trades) matrices in chunks of bounded size,
+each chunk seeded from its own child of one SeedSequence, so the result is
+identical whatever the number of worker processes.
+"""
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterable, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from loguru import logger
+
+# Values per (paths x trades) matrix of one chunk
+_CHUNK_VALUES = 2 ** 22
+
+METHODS = ('shuffle', 'bootstrap', 'block')
+
+
+def _trade_pnl(trades) -> np.ndarray:
+    """PnL per trade from a TradeLedger, trades DataFrame, list of dicts or array"""
+    if hasattr(trades, 'column'):
+        return np.asarray(trades.column('pnl'), dtype=np.float64)
+    if isinstance(trades, pd.DataFrame):
+        return trades['pnl'].to_numpy(dtype=np.float64)
+    trades = list(trades) if not isinstance(trades, np.ndarray) else trades
+    if len(trades) and isinstance(trades[0], dict):
+        return np.array([t['pnl'] for t in trades], dtype=np.float64)
+    return np.asarray(trades, dtype=np.float64)
+
+
+def resample_indices(n_trades: int, n_paths: int, method: str = 'block', block_size: Optional[int] = None,
+                     rng: Optional[np.random.Generator] = None) -> np.ndarray:
+    """
+    Trade indices of resampled paths
+
+    Args:
+        n_trades: Trades per path
+        n_paths: Paths
+        method: 'shuffle', 'bootstrap' or 'block'
+        block_size: Trades per block ('block'; default n_trades ** (1/3))
+        rng: Random generator
+
+    Returns:
+        (n_paths, n_trades) integer array
+    """
+    rng = rng or np.random.default_rng()
+    if method == 'shuffle':
+        return rng.permuted(np.broadcast_to(np.arange(n_trades), (n_paths, n_trades)), axis=1)
+    if method == 'bootstrap':
+        return rng.integers(0, n_trades, size=(n_paths, n_trades))
+    if method == 'block':
+        block_size = block_size or max(1, round(n_trades ** (1 / 3)))
+        n_blocks = -(-n_trades // block_size)
+        starts = rng.integers(0, n_trades, size=(n_paths, n_blocks, 1))
+        return ((starts + np.arange(block_size)) % n_trades).reshape(n_paths, -1)[:, :n_trades]
+    raise ValueError(f"Unknown method {method!r} (expected one of {METHODS})")
+
+
+def _simulate_chunk(pnl: np.ndarray, n_paths: int, method: str, block_size: Optional[int],
+                    initial_balance: float, ruin_balance: float, seed: np.random.SeedSequence) -> np.ndarray:
+    """Metrics of `n_paths` paths: (n_paths, 5) final_pnl, max_drawdown, profit_factor, min_balance, ruined"""
+    rng = np.random.default_rng(seed)
+    sample = pnl[resample_indices(len(pnl), n_paths, method, block_size, rng)]
+
+    balance = initial_balance + np.cumsum(sample, axis=1)
+    peak = np.maximum.accumulate(np.maximum(balance, initial_balance), axis=1)
+    drawdown = ((balance - peak) / peak).min(axis=1)
+    gross_win = np.where(sample > 0, sample, 0).sum(axis=1)
+    gross_loss = -np.where(sample < 0, sample, 0).sum(axis=1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        profit_factor = np.where(gross_loss > 0, gross_win / gross_loss, np.inf)
+    min_balance = balance.min(axis=1)
+
+    return np.column_stack([
+        balance[:, -1] - initial_balance,
+        np.minimum(drawdown, 0),
+        profit_factor,
+        min_balance,
+        min_balance <= ruin_balance
+    ])
+
+
+def simulate_paths(
+    trades,
+    initial_balance: float = 1000.0,
+    n_paths: int = 10_000,
+    method: str = 'block',
+    block_size: Optional[int] = None,
+    ruin_fraction: float = 0.5,
+    n_jobs: int = 1,
+    seed: Optional[int] = 0
+) -> pd.DataFrame:
+    """
+    Resample the trade sequence into `n_paths` equity paths
+
+    Args:
+        trades: TradeLedger, trades DataFrame / list of dicts (pnl) or PnL array
+        initial_balance: Balance before the first trade
+        n_paths: Paths to simulate
+        method: 'shuffle', 'bootstrap' or 'block'
+        block_size: Trades per block ('block'; default n_trades ** (1/3))
+        ruin_fraction: A path is ruined when its balance falls to
+            initial_balance * (1 - ruin_fraction)
+        n_jobs: Worker processes (1 = in-process, -1 = all cores)
+        seed: Seed of the SeedSequence (same seed = same paths for any n_jobs)
+
+    Returns:
+        One row per path: final_pnl, max_drawdown (negative fraction),
+        profit_factor (inf without losing trades), min_balance, ruined
+    """
+    if method not in METHODS:
+        raise ValueError(f"Unknown method {method!r} (expected one of {METHODS})")
+    pnl = _trade_pnl(trades)
+    columns = ['final_pnl', 'max_drawdown', 'profit_factor', 'min_balance', 'ruined']
+    if len(pnl) == 0 or n_paths <= 0:
+        return pd.DataFrame(columns=columns)
+
+    paths_per_chunk = max(1, _CHUNK_VALUES // len(pnl))
+    sizes = [min(paths_per_chunk, n_paths - start) for start in range(0, n_paths, paths_per_chunk)]
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    ruin_balance = initial_balance * (1 - ruin_fraction)
+    args = [(pnl, size, method, block_size, initial_balance, ruin_balance, s) for size, s in zip(sizes, seeds)]
+
+    if n_jobs == -1:
+        n_jobs = os.cpu_count() or 1
+    n_jobs = max(1, min(n_jobs, len(args)))
+
+    start = time.perf_counter()
+    if n_jobs == 1:
+        chunks = [_simulate_chunk(*a) for a in args]
+    else:
+        with ProcessPoolExecutor(max_workers=n_jobs) as executor:
+            chunks = list(executor.map(_simulate_chunk, *zip(*args)))
+
+    paths = pd.DataFrame(np.concatenate(chunks), columns=columns)
+    paths['ruined'] = paths['ruined'].astype(bool)
+    logger.info(f"Monte Carlo ({method}): {n_paths} paths x {len(pnl)} trades in "
+                f"{time.perf_counter() - start:.1f}s ({len(args)} chunks, n_jobs={n_jobs})")
+    return paths
+
+
+def summarize_paths(paths: pd.DataFrame, percentiles: Iterable[float] = (5, 50, 95)) -> dict:
+    """
+    Percentiles of the path metrics and the risk of ruin
+
+    Args:
+        paths: Output of simulate_paths
+        percentiles: Percentiles to report (low percentiles = bad outcomes)
+
+    Returns:
+        Flat dict: <metric>_p<q> for final_pnl, max_drawdown and
+        profit_factor, plus risk_of_ruin (fraction of ruined paths) and
+        n_paths
+    """
+    summary = {'n_paths': len(paths)}
+    if len(paths) == 0:
+        return summary
+    percentiles = list(percentiles)
+    for metric in ('final_pnl', 'max_drawdown', 'profit_factor'):
+        # No interpolation: profit factors may be inf
+        values = np.percentile(paths[metric].to_numpy(), percentiles, method='nearest')
+        for q, value in zip(percentiles, values):
+            summary[f'{metric}_p{q:g}'] = float(value)
+    summary['risk_of_ruin'] = float(paths['ruined'].mean())
+    return summary
+
+
+def run_monte_carlo(trades, initial_balance: float = 1000.0, config: Optional[dict] = None,
+                    n_jobs: Optional[int] = None) -> Tuple[pd.DataFrame, dict]:
+    """
+    Simulate and summarize from a `monte_carlo` config section
+
+    Args:
+        trades: TradeLedger, trades DataFrame / list of dicts or PnL array
+        initial_balance: Balance before the first trade
+        config: n_paths, method, block_size, ruin_fraction, percentiles,
+            n_jobs, seed (defaults of simulate_paths if missing)
+        n_jobs: Worker processes; overrides `config['n_jobs']`
+
+    Returns:
+        (paths, summary) as returned by simulate_paths and summarize_paths
+    """
+    config = config or {}
+    paths = simulate_paths(
+        trades,
+        initial_balance=initial_balance,
+        n_paths=config.get('n_paths', 10_000),
+        method=config.get('method', 'block'),
+        block_size=config.get('block_size'),
+        ruin_fraction=config.get('ruin_fraction', 0.5),
+        n_jobs=n_jobs if n_jobs is not None else config.get('n_jobs', 1),
+        seed=config.get('seed', 0)
+    )
+    return paths, summarize_paths(paths, config.get('percentiles', (5, 50, 95)))
@@ -0,0 +1,194 @@
+"""
+Batch parameter sweep (probability threshold x holding period x SL/TP)
+
+Every signal is scored as its own trade (positions may overlap, as in the
+labeling statistics), so each metric is a sum over the bars whose prediction
+clears the threshold. The sweep therefore never reruns a backtest:
+
+- the forward running max(high) / min(low) over the longest hold is built
+  once per block of entries, and each TP/SL multiple becomes a first-passage
+  offset with one comparison (as in labeling.grid);
+- every (tp, sl, hold) outcome is a vector over the block;
+- each entry falls in the bucket of the highest threshold it clears, and
+  one bincount per (tp, sl) pair accumulates count / sum / sum of squares
+  for every hold and bucket at once. Reverse cumulative sums over the
+  buckets then give the totals of every threshold.
+
+Only bars above the lowest threshold are ever touched, blocks of
+`chunk_size` entries bound memory, and a 10k-combination grid costs a few
+passes over the data. Confirm the chosen combination with
+VectorizedBacktestEngine, which enforces one position at a time.
+"""
+import itertools
+from typing import Iterable
+
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+from loguru import logger
+
+from aurum_edge.backtest.costs import CostModel
+
+# Per-bucket accumulators
+_STATS = ['n_trades', 'n_wins', 'sum_return', 'sum_sq_return', 'gross_win', 'gross_loss', 'sum_bars']
+
+
+def _first_passage(level: np.ndarray, path: np.ndarray, opens, above: bool):
+    """
+    First offset (1-based, path length + 1 = never) at which a running path
+    reaches `level`, and the fill price (the level, or the open of that bar
+    when it gapped through)
+    """
+    not_reached = path < level[:, None] if above else path > level[:, None]
+    offset = not_reached.sum(axis=1) + 1
+    fill = level.copy()
+    if opens is not None:
+        hit = np.flatnonzero(offset <= path.shape[1])
+        opened = opens[hit, offset[hit] - 1]
+        fill[hit] = np.maximum(level[hit], opened) if above else np.minimum(level[hit], opened)
+    return offset, fill
+
+
+def sweep_parameters(
+    predictions: np.ndarray,
+    prices: pd.DataFrame,
+    thresholds: Iterable[float],
+    hold_bars: Iterable[int],
+    tp_multipliers: Iterable[float],
+    sl_multipliers: Iterable[float],
+    atr_col: str = 'atr_14',
+    cost_config: dict = None,
+    chunk_size: int = 50_000,
+    asset_config: dict = None
+) -> pd.DataFrame:
+    """
+    Metrics of every parameter combination in one call
+
+    A long trade enters at the close of every bar with prediction >=
+    threshold and exits at the first touch of TP / SL (entry +/- multiple *
+    ATR, SL first within a bar, gaps fill at the open) or at the close
+    `hold` bars later. Bars without a full `hold`-bar future or a valid ATR
+    are not traded.
+
+    Args:
+        predictions: Probability per bar (aligned with `prices`)
+        prices: DataFrame with high, low, close, `atr_col` (open optional)
+        thresholds: Probability thresholds
+        hold_bars: Maximum holding periods (bars)
+        tp_multipliers: TP distances in ATRs (np.inf = no take profit)
+        sl_multipliers: SL distances in ATRs (np.inf = no stop loss)
+        atr_col: ATR column
+        cost_config: Costs config (backtest/costs.py, defaults if None)
+        chunk_size: Entries evaluated per block
+        asset_config: Asset config for the cost model (point value, sessions)
+
+    Returns:
+        One row per combination: threshold, hold_bars, tp_multiplier,
+        sl_multiplier, n_trades, win_rate, avg_return, total_return,
+        profit_factor, trade_sharpe (mean / std of trade returns) and
+        avg_bars_held. Returns are net of costs, relative to the entry.
+    """
+    thresholds = np.unique(np.asarray(list(thresholds), dtype=np.float64))
+    holds = np.unique(np.asarray(list(hold_bars), dtype=np.int64))
+    tp_values = np.unique(np.asarray(list(tp_multipliers), dtype=np.float64))
+    sl_values = np.unique(np.asarray(list(sl_multipliers), dtype=np.float64))
+    if len(holds) == 0 or holds[0] < 1:
+        raise ValueError("hold_bars must be >= 1")
+
+    predictions = np.asarray(predictions, dtype=np.float64)
+    if len(predictions) != len(prices):
+        raise ValueError(f"{len(predictions)} predictions for {len(prices)} bars")
+
+    n = len(prices)
+    max_hold = int(holds[-1])
+    n_thr, n_hold = len(thresholds), len(holds)
+    close = prices['close'].to_numpy(dtype=np.float64)
+    atr = prices[atr_col].to_numpy(dtype=np.float64)
+    bar_open = prices['open'].to_numpy(dtype=np.float64) if 'open' in prices.columns else None
+    cost = CostModel(cost_config, asset_config).bar_costs(prices, atr_col)['total_cost']
+
+    # Bars after entry i live at index i of the padded arrays; padding never touches
+    def padded(values, fill):
+        return sliding_window_view(np.concatenate([values[1:], np.full(max_hold, fill)]), max_hold)
+    high_windows = padded(prices['high'].to_numpy(dtype=np.float64), -np.inf)
+    low_windows = padded(prices['low'].to_numpy(dtype=np.float64), np.inf)
+    open_windows = padded(bar_open, np.nan) if bar_open is not None else None
+
+    # Entries that clear the lowest threshold and can be traded at all
+    tradable = (predictions >= thresholds[0]) & np.isfinite(atr) & (atr > 0)
+    tradable[max(n - int(holds[0]), 0):] = False
+    entries = np.flatnonzero(tradable)
+
+    logger.info(f"Sweep: {n_thr} thresholds x {n_hold} holds x {len(tp_values)} TP x "
+                f"{len(sl_values)} SL = {n_thr * n_hold * len(tp_values) * len(sl_values)} "
+                f"combinations over {len(entries)} candidate entries")
+
+    # stats[pair, stat, hold, bucket]
+    stats = np.zeros((len(tp_values) * len(sl_values), len(_STATS), n_hold, n_thr))
+    hold_offsets = np.arange(n_hold)[:, None] * n_thr
+
+    for start in range(0, len(entries), chunk_size):
+        idx = entries[start:start + chunk_size]
+        entry = close[idx]
+        entry_cost = cost[idx]
+        entry_atr = atr[idx]
+        bucket = np.searchsorted(thresholds, predictions[idx], side='right') - 1
+
+        run_high = np.maximum.accumulate(high_windows[idx], axis=1)
+        run_low = np.minimum.accumulate(low_windows[idx], axis=1)
+
+        opens = open_windows[idx] if open_windows is not None else None
+        tp_first, tp_fill = zip(*(
+            _first_passage(entry + tp * entry_atr, run_high, opens, above=True) for tp in tp_values
+        ))
+        sl_first, sl_fill = zip(*(
+            _first_passage(entry - sl * entry_atr, run_low, opens, above=False) for sl in sl_values
+        ))
+
+        # Time exits and which entries have a full window, per hold: (n_hold, m)
+        time_exit = close[np.minimum(idx[None, :] + holds[:, None], n - 1)]
+        valid = idx[None, :] + holds[:, None] <= n - 1
+        keys = np.where(valid, hold_offsets + bucket[None, :], -1)
+        keep = keys >= 0
+        keys = keys[keep]
+        size = n_hold * n_thr
+
+        for pair, (t, s) in enumerate(itertools.product(range(len(tp_values)), range(len(sl_values)))):
+            tpf, slf = tp_first[t][None, :], sl_first[s][None, :]
+            h = holds[:, None]
+            is_sl = (slf <= h) & (slf <= tpf)
+            is_tp = (tpf <= h) & ~is_sl
+            exit_price = np.where(is_sl, sl_fill[s][None, :], np.where(is_tp, tp_fill[t][None, :], time_exit))
+            bars = np.where(is_sl, slf, np.where(is_tp, tpf, h))
+            ret = ((exit_price - entry - entry_cost) / entry)[keep]
+            bars = np.broadcast_to(bars, keep.shape)[keep]
+
+            for k, weights in enumerate((
+                None, ret > 0, ret, ret * ret, np.maximum(ret, 0), np.minimum(ret, 0), bars
+            )):
+                w = None if weights is None else weights.astype(np.float64, copy=False)
+                stats[pair, k] += np.bincount(keys, weights=w, minlength=size).reshape(n_hold, n_thr)
+
+    # Totals for prediction >= threshold: reverse cumulative sum over buckets
+    totals = np.flip(np.cumsum(np.flip(stats, axis=-1), axis=-1), axis=-1)
+
+    tp_grid, sl_grid = np.repeat(tp_values, len(sl_values)), np.tile(sl_values, len(tp_values))
+    result = pd.DataFrame({
+        'threshold': np.tile(thresholds, len(tp_grid) * n_hold),
+        'hold_bars': np.tile(np.repeat(holds, n_thr), len(tp_grid)),
+        'tp_multiplier': np.repeat(tp_grid, n_hold * n_thr),
+        'sl_multiplier': np.repeat(sl_grid, n_hold * n_thr)
+    })
+    t = {name: totals[:, k].ravel() for k, name in enumerate(_STATS)}
+    count = t['n_trades']
+    with np.errstate(divide='ignore', invalid='ignore'):
+        mean = t['sum_return'] / count
+        std = np.sqrt(np.maximum(t['sum_sq_return'] / count - mean ** 2, 0) * count / (count - 1))
+        result['n_trades'] = count.astype(np.int64)
+        result['win_rate'] = t['n_wins'] / count
+        result['avg_return'] = mean
+        result['total_return'] = t['sum_return']
+        result['profit_factor'] = np.where(t['gross_loss'] < 0, t['gross_win'] / -t['gross_loss'], np.nan)
+        result['trade_sharpe'] = np.where(std > 0, mean / std, np.nan)
+        result['avg_bars_held'] = t['sum_bars'] / count
+    return result
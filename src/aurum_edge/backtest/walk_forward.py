@@ -1,32 +1,220 @@
-"""Walk-forward validation"""
+"""
+Walk-forward validation
+
+Folds run in worker processes. The dataset (and the `prices` frame the model
+backtests on, if any) is dumped once to a memory-mapped file that every
+worker opens read-only, so a task only carries the fold bounds. Results stream back as folds complete and each one is cached under
+a key made of the fold's data hash, its bounds and the model params: a rerun
+after a config or data change only recomputes the folds that changed.
+"""
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Callable, Iterator, Optional, Tuple
+
+import joblib
+import pandas as pd
 from loguru import logger
-from aurum_edge.data.split import get_walk_forward_splits
 
-def run_walk_forward(df, model_fn, config):
+from aurum_edge.data.split import FoldBounds, iter_walk_forward_bounds
+
+# Memory-mapped dataset, prices and model function of the current worker process
+_WORKER = {}
+
+
+def _init_worker(data_path: str, model_fn: Callable, prices_path: Optional[str] = None):
+    _WORKER['df'] = joblib.load(data_path, mmap_mode='r')
+    _WORKER['prices'] = joblib.load(prices_path, mmap_mode='r') if prices_path else None
+    _WORKER['model_fn'] = model_fn
+
+
+def _call_fold(model_fn: Callable, df: pd.DataFrame, bounds: FoldBounds, prices: Optional[pd.DataFrame]):
+    if prices is None:
+        return model_fn(df.iloc[bounds.train], df.iloc[bounds.test])
+    return model_fn(df.iloc[bounds.train], df.iloc[bounds.test], prices=prices)
+
+
+def _run_fold(bounds: FoldBounds):
+    return _call_fold(_WORKER['model_fn'], _WORKER['df'], bounds, _WORKER['prices'])
+
+
+def fold_key(df: pd.DataFrame, bounds: FoldBounds, model_fn: Callable, params: Optional[dict] = None,
+             prices: Optional[pd.DataFrame] = None) -> str:
+    """
+    Cache key of one fold
+
+    Hashes the rows the fold reads (values and timestamps), the `prices`
+    rows of its test window, the fold bounds, the model function with its
+    state (e.g. its cost model) and its params. Appending data leaves the
+    keys of earlier folds unchanged.
+    """
+    rows = df.iloc[bounds.train_start:bounds.test_end]
+    name = getattr(model_fn, '__qualname__', type(model_fn).__qualname__)  # functions or callable objects
+    digest = hashlib.sha256(pd.util.hash_pandas_object(rows, index=True).to_numpy().tobytes())
+    if prices is not None:
+        window = prices.loc[df.index[bounds.test_start]:df.index[bounds.test_end - 1]]
+        digest.update(pd.util.hash_pandas_object(window, index=True).to_numpy().tobytes())
+        digest.update(json.dumps(list(map(str, prices.columns))).encode())
+    digest.update(json.dumps({
+        'bounds': [bounds.train_start, bounds.train_end, bounds.test_start, bounds.test_end],
+        'columns': list(map(str, df.columns)),
+        'model_fn': f"{model_fn.__module__}.{name}",
+        'model_state': joblib.hash(model_fn),
+        'params': params or {}
+    }, sort_keys=True, default=str).encode())
+    return digest.hexdigest()[:32]
+
+
+def iter_walk_forward(
+    df: pd.DataFrame,
+    model_fn: Callable,
+    config: dict,
+    calendar=None,
+    n_jobs: Optional[int] = None,
+    cache_dir: Optional[str] = None,
+    params: Optional[dict] = None,
+    bar_index: Optional[pd.DatetimeIndex] = None,
+    prices: Optional[pd.DataFrame] = None
+) -> Iterator[Tuple[FoldBounds, object]]:
+    """
+    Run walk-forward folds, yielding each result as soon as it is ready
+
+    Args:
+        df: Full dataset
+        model_fn: Function (train_df, test_df) -> fold result, or
+            (train_df, test_df, prices=) with `prices`. Must be picklable
+            (module-level) when n_jobs != 1.
+        config: Walk-forward configuration (`windows`, `purging`, `embargo`
+            and `runner` with n_jobs / cache_dir)
+        calendar: TradingCalendar of the asset (skips folds with missing data)
+        n_jobs: Worker processes (-1 = all cores, 1 = in-process); overrides
+            `runner.n_jobs`
+        cache_dir: Fold result cache; overrides `runner.cache_dir` (None in
+            both = no cache)
+        params: Model parameters, part of the cache key
+        bar_index: Bar store index for the calendar coverage when `df` is a
+            labeled subset of the bars (default `prices.index`, else
+            `df.index`)
+        prices: Every bar of the dataset (features store) for the model to
+            score and backtest on; memory-mapped like `df` for the workers
+            and part of each fold's cache key
+
+    Yields:
+        (fold bounds, result) in completion order; cached folds first
+    """
+    windows = config['windows']
+    purging = config.get('purging', {})
+    embargo = config.get('embargo', {})
+    runner = config.get('runner', {})
+    n_jobs = n_jobs if n_jobs is not None else runner.get('n_jobs', 1)
+    cache_dir = cache_dir if cache_dir is not None else runner.get('cache_dir')
+
+    folds = list(iter_walk_forward_bounds(
+        df.index,
+        train_months=windows['train_months'],
+        test_weeks=windows['test_weeks'],
+        step_weeks=windows['step_weeks'],
+        purge_bars=purging.get('purge_bars', 0) if purging.get('enabled') else 0,
+        embargo_bars=embargo.get('embargo_bars', 0) if embargo.get('enabled') else 0,
+        calendar=calendar,
+        min_coverage=windows.get('min_coverage', 0.9),
+        bar_index=bar_index if bar_index is not None or prices is None else prices.index
+    ))
+
+    # Cached folds are served without touching the workers
+    pending = []
+    keys = {}
+    for bounds in folds:
+        if cache_dir:
+            keys[bounds.fold] = fold_key(df, bounds, model_fn, params, prices)
+            path = Path(cache_dir) / f"{keys[bounds.fold]}.pkl"
+            if path.exists():
+                yield bounds, joblib.load(path)
+                continue
+        pending.append(bounds)
+
+    logger.info(f"Walk-forward: {len(folds)} folds, {len(folds) - len(pending)} cached, "
+                f"{len(pending)} to run")
+    if not pending:
+        return
+
+    def store(bounds: FoldBounds, result):
+        if cache_dir:
+            path = Path(cache_dir) / f"{keys[bounds.fold]}.pkl"
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_suffix('.tmp')
+            joblib.dump(result, tmp)
+            os.replace(tmp, path)
+
+    if n_jobs == -1:
+        n_jobs = os.cpu_count() or 1
+    n_jobs = max(1, min(n_jobs, len(pending)))
+
+    if n_jobs == 1:
+        for bounds in pending:
+            result = _call_fold(model_fn, df, bounds, prices)
+            store(bounds, result)
+            yield bounds, result
+        return
+
+    workdir = tempfile.mkdtemp(prefix='walkforward_')
+    try:
+        data_path = os.path.join(workdir, 'dataset.pkl')
+        joblib.dump(df, data_path)
+        prices_path = None
+        if prices is not None:
+            prices_path = os.path.join(workdir, 'prices.pkl')
+            joblib.dump(prices, prices_path)
+        with ProcessPoolExecutor(max_workers=n_jobs, initializer=_init_worker,
+                                 initargs=(data_path, model_fn, prices_path)) as executor:
+            futures = {executor.submit(_run_fold, bounds): bounds for bounds in pending}
+            for future in as_completed(futures):
+                bounds = futures[future]
+                result = future.result()
+                store(bounds, result)
+                yield bounds, result
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def run_walk_forward(df, model_fn, config, calendar=None, n_jobs=None, cache_dir=None, params=None,
+                     bar_index=None, prices=None):
     """
     Run walk-forward validation
-    
+
+    Folds are positional views of `df`; purge and embargo bars come from the
+    `purging` / `embargo` sections when enabled. See `iter_walk_forward`.
+
     Args:
         df: Full dataset
         model_fn: Function to train and predict
         config: Walk-forward configuration
+        calendar: TradingCalendar of the asset (skips folds with missing data)
+        n_jobs: Worker processes (default `runner.n_jobs`)
+        cache_dir: Fold result cache (default `runner.cache_dir`)
+        params: Model parameters, part of the cache key
+        bar_index: Bar store index for the calendar coverage (default `df.index`)
+        prices: Every bar for the model to score and backtest on (memory-mapped
+            for the workers, part of the cache key)
+
+    Returns:
+        Fold results in fold order
     """
     logger.info("Starting walk-forward validation...")
-    
-    splits = get_walk_forward_splits(
-        df,
-        train_months=config['windows']['train_months'],
-        test_weeks=config['windows']['test_weeks'],
-        step_weeks=config['windows']['step_weeks']
-    )
-    
-    all_metrics = []
-    
-    for i, (train_df, test_df) in enumerate(splits):
-        logger.info(f"Fold {i+1}/{len(splits)}: Train {len(train_df)}, Test {len(test_df)}")
-        
-        metrics = model_fn(train_df, test_df)
-        all_metrics.append(metrics)
-    
-    logger.info(f"Walk-forward complete: {len(all_metrics)} folds")
+    start = time.perf_counter()
+
+    results = {}
+    for bounds, metrics in iter_walk_forward(df, model_fn, config, calendar, n_jobs, cache_dir, params,
+                                                 bar_index, prices):
+        logger.info(f"Fold {bounds.fold + 1}: Train {bounds.train_end - bounds.train_start}, "
+                    f"Test {bounds.test_end - bounds.test_start}")
+        results[bounds.fold] = metrics
+
+    all_metrics = [results[fold] for fold in sorted(results)]
+    logger.info(f"Walk-forward complete: {len(all_metrics)} folds in {time.perf_counter() - start:.1f}s")
     return all_metrics
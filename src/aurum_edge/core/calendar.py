@@ -0,0 +1,186 @@
+"""
+Trading calendar of an asset (weekly close, daily break, holidays)
+
+Built once from the asset config (`specs.trading_hours`). The week is kept as
+a cumulative count of open minutes per minute of the week, so the open time
+between any two timestamps is a table lookup plus a binary search over the
+holidays:
+
+    open_minutes(t) = weeks * open_per_week + cum[minute_of_week] - holidays before t
+
+which answers "how many bars should there be between t0 and t1" and "is
+this gap abnormal" without rescanning timestamps. Times are UTC; DST shifts
+of the exchange hours are not modelled.
+"""
+from typing import Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+WEEK_MINUTES = 7 * 1440
+DAYS = ['monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday', 'sunday']
+
+# 1970-01-01 was a Thursday: shift epoch minutes so that Monday 00:00 = 0
+_EPOCH_WEEK_OFFSET = 3 * 1440
+
+Times = Union[pd.Timestamp, pd.DatetimeIndex, pd.Series, np.ndarray]
+
+
+def _parse_minute(hhmm: str) -> int:
+    """'21:30' -> 1290"""
+    hours, minutes = (int(x) for x in hhmm.split(':'))
+    return hours * 60 + minutes
+
+
+def to_minutes(times: Times) -> np.ndarray:
+    """Timestamps -> int64 minutes since epoch (UTC for tz-aware input)"""
+    if isinstance(times, pd.Timestamp):
+        times = pd.DatetimeIndex([times])
+    return np.asarray(pd.DatetimeIndex(times).values.astype('datetime64[m]').astype(np.int64))
+
+
+def weekly_close(trading_hours: dict) -> Tuple[int, int]:
+    """
+    Weekend closure of a 24/5 market as minutes of the week
+
+    Args:
+        trading_hours: Asset `specs.trading_hours` with `start` (weekly open,
+            Sunday by default) and `end` (weekly close, Friday by default);
+            `start_day` / `end_day` override the days
+
+    Returns:
+        (close_minute, closed_minutes): minute of the week (Monday 00:00 = 0)
+        at which the market closes, and how long it stays closed
+    """
+    def minute_of_week(day: str, hhmm: str) -> int:
+        return DAYS.index(day.lower()) * 1440 + _parse_minute(hhmm)
+
+    open_minute = minute_of_week(trading_hours.get('start_day', 'sunday'), trading_hours['start'])
+    close_minute = minute_of_week(trading_hours.get('end_day', 'friday'), trading_hours['end'])
+    return close_minute, (open_minute - close_minute) % WEEK_MINUTES
+
+
+class TradingCalendar:
+    """Open/closed minutes of an asset with O(log holidays) range queries"""
+
+    def __init__(self, trading_hours: dict, bar_minutes: int = 5):
+        """
+        Args:
+            trading_hours: Asset `specs.trading_hours`: `start`/`end` of the
+                trading week, optional `daily_break` ({start, end}) and
+                `holidays` (full UTC days the market is closed)
+            bar_minutes: Bar length
+        """
+        self.bar_minutes = bar_minutes
+
+        open_mask = np.ones(WEEK_MINUTES, dtype=bool)
+        close_minute, closed_minutes = weekly_close(trading_hours)
+        open_mask[(close_minute + np.arange(closed_minutes)) % WEEK_MINUTES] = False
+
+        daily_break = trading_hours.get('daily_break')
+        if daily_break:
+            start = _parse_minute(daily_break['start'])
+            length = (_parse_minute(daily_break['end']) - start) % 1440
+            for day in range(7):
+                open_mask[(day * 1440 + start + np.arange(length)) % WEEK_MINUTES] = False
+
+        self.open_per_week = int(open_mask.sum())
+        self._cum = np.concatenate([[0], np.cumsum(open_mask)]).astype(np.int64)
+
+        # Holidays as absolute [start, end) minutes with their template open minutes
+        days = sorted({pd.Timestamp(d).normalize() for d in trading_hours.get('holidays', [])})
+        self._holiday_start = to_minutes(pd.DatetimeIndex(days)) if days else np.empty(0, dtype=np.int64)
+        self._holiday_end = self._holiday_start + 1440
+        holiday_open = self._template_minutes(self._holiday_end) - self._template_minutes(self._holiday_start)
+        self._holiday_cum = np.concatenate([[0], np.cumsum(holiday_open)]).astype(np.int64)
+
+    @classmethod
+    def from_asset_config(cls, asset_config: dict) -> 'TradingCalendar':
+        """Calendar of an asset config (configs/assets/<name>.yaml)"""
+        trading_hours = asset_config.get('specs', {}).get('trading_hours')
+        if not trading_hours:
+            raise ValueError(f"{asset_config.get('symbol')}: no specs.trading_hours in asset config")
+        return cls(trading_hours, bar_minutes=asset_config.get('timeframe', {}).get('minutes', 5))
+
+    @property
+    def bars_per_week(self) -> float:
+        """Expected bars per week"""
+        return self.open_per_week / self.bar_minutes
+
+    @property
+    def bars_per_year(self) -> float:
+        """Expected bars per year (annualization factor), holidays excluded"""
+        return self.bars_per_week * 365.25 / 7
+
+    def _template_minutes(self, minutes: np.ndarray) -> np.ndarray:
+        """Open minutes in [epoch, t) ignoring holidays"""
+        weeks, minute_of_week = np.divmod(minutes + _EPOCH_WEEK_OFFSET, WEEK_MINUTES)
+        return weeks * self.open_per_week + self._cum[minute_of_week]
+
+    def _open_before(self, minutes: np.ndarray) -> np.ndarray:
+        """Open minutes in [epoch, t)"""
+        total = self._template_minutes(minutes)
+        if len(self._holiday_start) == 0:
+            return total
+
+        # Holidays started at or before t count in full, minus the part of
+        # a holiday t falls in that has not elapsed yet
+        j = np.searchsorted(self._holiday_start, minutes, side='right')
+        total -= self._holiday_cum[j]
+        inside = np.flatnonzero((j > 0) & (minutes < self._holiday_end[np.maximum(j - 1, 0)]))
+        if len(inside):
+            end = self._holiday_end[j[inside] - 1]
+            total[inside] += self._template_minutes(end) - self._template_minutes(minutes[inside])
+        return total
+
+    def open_minutes(self, t0: Times, t1: Times) -> np.ndarray:
+        """Trading minutes in [t0, t1) (element-wise)"""
+        return self._open_before(to_minutes(t1)) - self._open_before(to_minutes(t0))
+
+    def expected_bars(self, t0: Times, t1: Times) -> np.ndarray:
+        """Number of bars that open in [t0, t1) (element-wise)"""
+        bar = self.bar_minutes
+        start = -(-to_minutes(t0) // bar) * bar  # first bar boundary >= t
+        end = -(-to_minutes(t1) // bar) * bar
+        return (self._open_before(end) - self._open_before(start)) // bar
+
+    def is_open(self, times: Times) -> np.ndarray:
+        """Market open at `times`"""
+        minutes = to_minutes(times)
+        return self._open_before(minutes + 1) > self._open_before(minutes)
+
+    def is_abnormal_gap(self, t0: Times, t1: Times, max_gap_minutes: int = 15) -> np.ndarray:
+        """Consecutive bars at t0 and t1 are more than `max_gap_minutes` of trading time apart"""
+        return self.open_minutes(t0, t1) > max_gap_minutes
+
+    def coverage(self, index: pd.DatetimeIndex, t0: pd.Timestamp, t1: pd.Timestamp) -> float:
+        """Bars of a sorted `index` in [t0, t1) over the bars the calendar expects"""
+        expected = int(self.expected_bars(t0, t1)[0])
+        if expected == 0:
+            return 1.0
+        present = index.searchsorted(t1) - index.searchsorted(t0)
+        return present / expected
+
+    def gaps(self, index: pd.DatetimeIndex, max_gap_minutes: int = 15) -> pd.DataFrame:
+        """
+        Abnormal gaps of a sorted bar index
+
+        Returns:
+            DataFrame with start (last bar before the gap), end (first bar
+            after it), minutes (wall time) and missing_bars (bars the
+            calendar expected in between)
+        """
+        minutes = to_minutes(index)
+        open_between = np.diff(self._open_before(minutes))
+        positions = np.flatnonzero(open_between > max_gap_minutes)
+
+        return pd.DataFrame({
+            'start': index[positions],
+            'end': index[positions + 1],
+            'minutes': (minutes[positions + 1] - minutes[positions]).astype(float),
+            'missing_bars': open_between[positions] // self.bar_minutes - 1
+        })
+
+    def __repr__(self) -> str:
+        return (f"TradingCalendar(bar_minutes={self.bar_minutes}, open_per_week={self.open_per_week}, "
+                f"holidays={len(self._holiday_start)})")
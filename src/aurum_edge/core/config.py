@@ -20,6 +20,7 @@ class PathsConfig(BaseModel):
     """File paths configuration"""
     data_raw: Path = Path("data/raw")
     data_processed: Path = Path("data/processed")
+    data_store: Path = Path("data/processed/store")
     data_features: Path = Path("data/features")
     data_labels: Path = Path("data/labels")
     models: Path = Path("models")
@@ -64,6 +65,7 @@ class Config(BaseSettings):
     class Config:
         env_file = ".env"
         env_file_encoding = "utf-8"
+        extra = "allow"  # other default.yaml sections (features, data_quality, ...)
     
     @classmethod
     def from_yaml(cls, config_path: str = "configs/default.yaml") -> "Config":
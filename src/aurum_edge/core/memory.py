@@ -0,0 +1,137 @@
+"""
+Memory policy: compact dtypes for pipeline frames and per-stage memory report
+
+Prices stay float64 (barrier touches and costs compare them exactly);
+every other float column is stored as float32, the flag and label columns
+listed in INT8_COLUMNS as int8 and other integers as int32. The policy
+depends on column names only, never on the values of a batch, so every
+batch of a store gets the same schema.
+Scratch intermediates are dropped before a frame is stored. Bars get their
+types at ingest (MT5_DTYPES); this policy is applied to features and labels.
+"""
+import fnmatch
+import resource
+import sys
+import time
+from pathlib import Path
+from typing import Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+from loguru import logger
+
+PRICE_COLUMNS = ['open', 'high', 'low', 'close']
+
+# Intermediates that no later stage reads (atr_14 is derived from tr)
+SCRATCH_COLUMNS = ['tr']
+
+# Flags and labels (values in {-1, 0, 1}); shell-style patterns
+INT8_COLUMNS = ['session_*', 'label', 'label_short']
+
+INT32 = np.iinfo(np.int32)
+
+
+def compact_frame(
+    df: pd.DataFrame,
+    keep_float64: Iterable[str] = PRICE_COLUMNS,
+    drop: Iterable[str] = SCRATCH_COLUMNS,
+    int8_columns: Iterable[str] = INT8_COLUMNS
+) -> pd.DataFrame:
+    """
+    Apply the dtype policy
+
+    Args:
+        df: Bars, features or labels
+        keep_float64: Float columns kept at full precision
+        drop: Scratch columns removed when present
+        int8_columns: Integer/bool columns (names or patterns) stored as int8
+
+    Returns:
+        Frame with float64 -> float32 (except `keep_float64`),
+        `int8_columns` -> int8 and other int64 columns -> int32 (kept int64
+        only if the values would overflow). Columns that already comply are
+        not copied.
+    """
+    keep_float64 = set(keep_float64)
+    int8_columns = list(int8_columns)
+    drop = [col for col in drop if col in df.columns]
+    if drop:
+        df = df.drop(columns=drop)
+
+    dtypes = {}
+    for col in df.columns:
+        dtype = df[col].dtype
+        if dtype == np.float64 and col not in keep_float64:
+            dtypes[col] = np.float32
+        elif dtype.kind in 'iub' and any(fnmatch.fnmatchcase(str(col), p) for p in int8_columns):
+            if dtype != np.int8:
+                dtypes[col] = np.int8
+        elif dtype.kind == 'i' and dtype.itemsize > 4:
+            values = df[col].to_numpy()
+            if not len(values) or (INT32.min <= values.min() and values.max() <= INT32.max):
+                dtypes[col] = np.int32
+
+    if not dtypes:
+        return df
+    return df.astype(dtypes, copy=False)
+
+
+def frame_mb(df: pd.DataFrame) -> float:
+    """Memory held by a frame's columns and index (MB)"""
+    return df.memory_usage(index=True, deep=False).sum() / 1024 ** 2
+
+
+def rss_mb() -> float:
+    """Current resident memory of this process (peak on non-Linux systems)"""
+    try:
+        with open('/proc/self/statm') as f:
+            pages = int(f.read().split()[1])
+        return pages * resource.getpagesize() / 1024 ** 2
+    except OSError:
+        return peak_rss_mb()
+
+
+def peak_rss_mb() -> float:
+    """Peak resident memory of this process (ru_maxrss is KB on Linux, bytes on macOS)"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 ** 2 if sys.platform == 'darwin' else 1024)
+
+
+class MemoryReport:
+    """Rows, frame size and process memory after each pipeline stage"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.stages: List[dict] = []
+        self._start = time.perf_counter()
+
+    def record(self, stage: str, df: Optional[pd.DataFrame] = None):
+        """Snapshot after `stage` (with the frame it produced, if any)"""
+        self.stages.append({
+            'stage': stage,
+            'rows': len(df) if df is not None else None,
+            'columns': len(df.columns) if df is not None else None,
+            'frame_mb': round(frame_mb(df), 1) if df is not None else None,
+            'rss_mb': round(rss_mb(), 1),
+            'peak_rss_mb': round(peak_rss_mb(), 1),
+            'seconds': round(time.perf_counter() - self._start, 2)
+        })
+
+    def to_frame(self) -> pd.DataFrame:
+        """One row per recorded stage"""
+        return pd.DataFrame(self.stages)
+
+    def log(self):
+        """Log one line per stage"""
+        logger.info(f"Memory report ({self.name}):")
+        for s in self.stages:
+            frame = f"{s['frame_mb']:8.1f} MB frame" if s['frame_mb'] is not None else " " * 17
+            logger.info(f"  {s['stage']:<20} {frame} | rss {s['rss_mb']:7.1f} MB | "
+                        f"peak {s['peak_rss_mb']:7.1f} MB")
+
+    def save(self, directory: str) -> Path:
+        """Write the report to <directory>/<name>.csv"""
+        path = Path(directory) / f"{self.name}.csv"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.to_frame().to_csv(path, index=False)
+        return path
@@ -14,7 +14,7 @@ class DataQualityReport:
     """Data quality metrics"""
     total_rows: int
     missing_values: Dict[str, int]
-    duplicate_rows: int
+    duplicate_rows: int  # repeated timestamps
     gaps: List[tuple]
     outliers: Dict[str, int]
     date_range: tuple
@@ -40,36 +40,25 @@ class Monitor:
     def __init__(self):
         self.alerts = []
     
-    def check_data_quality(self, df: pd.DataFrame, min_rows: int = 1000) -> DataQualityReport:
-        """Check data quality"""
-        issues = []
-        
-        # Missing values
-        missing = df.isnull().sum().to_dict()
-        if any(v > 0 for v in missing.values()):
-            issues.append(f"Missing values found: {missing}")
-        
-        # Duplicates
-        dup_count = df.duplicated().sum()
-        if dup_count > 0:
-            issues.append(f"Found {dup_count} duplicate rows")
+    def check_data_quality(
+        self,
+        df: pd.DataFrame,
+        min_rows: int = 1000,
+        config: Optional[Dict] = None,
+        calendar=None
+    ) -> DataQualityReport:
+        """
+        Check data quality (one pass, see data.validate.validate_bars)
         
-        # Min rows
-        if len(df) < min_rows:
-            issues.append(f"Insufficient rows: {len(df)} < {min_rows}")
+        Args:
+            df: Bars with OHLC columns and a datetime index
+            min_rows: Minimum number of rows
+            config: `data_quality` config (outlier_threshold, max_gap_minutes...)
+            calendar: TradingCalendar of the asset (session-aware gaps)
+        """
+        from aurum_edge.data.validate import validate_bars  # data.validate imports this module
         
-        passed = len(issues) == 0
-        
-        return DataQualityReport(
-            total_rows=len(df),
-            missing_values=missing,
-            duplicate_rows=dup_count,
-            gaps=[],
-            outliers={},
-            date_range=(df.index[0], df.index[-1]) if len(df) > 0 else (None, None),
-            passed=passed,
-            issues=issues
-        )
+        return validate_bars(df, {**(config or {}), 'min_rows': min_rows}, calendar)
     
     def check_model_decay(
         self,
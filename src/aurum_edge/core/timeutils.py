@@ -2,11 +2,15 @@
 Time utilities for financial data
 """
 from datetime import datetime, timedelta
-from typing import List, Tuple
+from typing import TYPE_CHECKING, List, Optional, Tuple
 
+import numpy as np
 import pandas as pd
 import pytz
 
+if TYPE_CHECKING:
+    from aurum_edge.core.calendar import TradingCalendar
+
 
 def ensure_utc(dt: pd.Timestamp) -> pd.Timestamp:
     """Ensure timestamp is UTC"""
@@ -33,21 +37,32 @@ def get_session(timestamp: pd.Timestamp) -> str:
         return 'asian'
 
 
-def check_gaps(df: pd.DataFrame, max_gap_minutes: int = 15) -> List[Tuple]:
+def check_gaps(
+    df: pd.DataFrame,
+    max_gap_minutes: int = 15,
+    calendar: Optional['TradingCalendar'] = None
+) -> List[Tuple]:
     """
     Check for gaps in time series data
     
+    A gap is a distance between consecutive bars longer than
+    `max_gap_minutes`. With a trading `calendar` only trading time counts,
+    so weekends, daily breaks and holidays are not gaps.
+    
     Returns: List of (start_time, end_time, gap_minutes) tuples
     """
-    gaps = []
-    diffs = df.index.to_series().diff()
+    if len(df) < 2:
+        return []
     
-    for idx, diff in diffs.items():
-        if pd.notna(diff) and diff.total_seconds() > max_gap_minutes * 60:
-            gap_minutes = diff.total_seconds() / 60
-            gaps.append((idx - diff, idx, gap_minutes))
+    if calendar is not None:
+        gaps = calendar.gaps(df.index, max_gap_minutes)
+        return list(zip(gaps['start'], gaps['end'], gaps['minutes']))
     
-    return gaps
+    minutes = df.index.values.astype('datetime64[m]').astype(np.int64)
+    diffs = np.diff(minutes)
+    positions = np.flatnonzero(diffs > max_gap_minutes)
+    index = df.index
+    return [(index[i], index[i + 1], float(diffs[i])) for i in positions]
 
 
 def resample_ohlc(df: pd.DataFrame, timeframe: str) -> pd.DataFrame:
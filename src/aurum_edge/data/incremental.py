@@ -0,0 +1,212 @@
+"""
+Incremental ingestion of growing MT5 exports
+
+A manifest next to the store partitions remembers, per source CSV, how many
+bytes have been ingested, the SHA-256 of those bytes and the timestamp of
+the last bar. When a file's ingested prefix still hashes the same, only the
+bytes after it are parsed, so a nightly refresh reads one day of bars instead
+of the whole export. New or rewritten files are parsed in full and only bars
+after the last stored timestamp are kept.
+
+Manifest layout (<root>/symbol=NAS100/timeframe=M5/_manifest.json):
+    {
+        "last_timestamp": "2024-03-28 23:55:00",
+        "sources": {
+            "nas100_m5.csv": {"bytes": ..., "sha256": "...", "last_timestamp": "..."}
+        }
+    }
+"""
+import hashlib
+import io
+import json
+import os
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import pandas as pd
+from loguru import logger
+
+from aurum_edge.data.ingest import load_mt5_csv, merge_frames
+
+MANIFEST_NAME = '_manifest.json'
+_BLOCK_SIZE = 1 << 20
+
+
+def manifest_path(root: str, symbol: str, timeframe: str) -> Path:
+    """Manifest of one symbol/timeframe ('_' prefix keeps it out of dataset scans)"""
+    return Path(root) / f'symbol={symbol}' / f'timeframe={timeframe}' / MANIFEST_NAME
+
+
+def load_manifest(path: Path) -> Dict:
+    """Load a manifest (empty manifest if the file does not exist)"""
+    path = Path(path)
+    if not path.exists():
+        return {'last_timestamp': None, 'sources': {}}
+    with open(path) as f:
+        return json.load(f)
+
+
+def save_manifest(manifest: Dict, path: Path):
+    """Write a manifest atomically (a crash never leaves a half-written file)"""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix('.tmp')
+    with open(tmp_path, 'w') as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp_path, path)
+    logger.info(f"Saved ingest manifest: {path} (last bar {manifest['last_timestamp']})")
+
+
+def _last_newline(f, end: int) -> int:
+    """Offset of the last b'\\n' before `end`, or -1"""
+    pos = end
+    while pos > 0:
+        start = max(0, pos - _BLOCK_SIZE)
+        f.seek(start)
+        idx = f.read(pos - start).rfind(b'\n')
+        if idx >= 0:
+            return start + idx
+        pos = start
+    return -1
+
+
+def _complete_length(filepath: str) -> int:
+    """Bytes up to the last newline (a line still being written is left for the next run)"""
+    with open(filepath, 'rb') as f:
+        return _last_newline(f, os.path.getsize(filepath)) + 1
+
+
+def _hash_prefixes(filepath: str, lengths: List[int]) -> List[str]:
+    """SHA-256 of the first n bytes for every n in `lengths`, in a single read"""
+    digest = hashlib.sha256()
+    position = 0
+    result = {}
+    with open(filepath, 'rb') as f:
+        for n in sorted(set(lengths)):
+            while position < n:
+                block = f.read(min(_BLOCK_SIZE, n - position))
+                if not block:
+                    break
+                digest.update(block)
+                position += len(block)
+            result[n] = digest.hexdigest()
+    return [result[n] for n in lengths]
+
+
+def _read_range(filepath: str, start: int, end: int, **csv_kwargs) -> pd.DataFrame:
+    """Parse the complete lines in bytes [start, end) of an export, reusing its header"""
+    with open(filepath, 'rb') as f:
+        header = f.readline()
+        start = max(start, len(header))
+        f.seek(start)
+        body = f.read(max(end - start, 0))
+    return load_mt5_csv(io.BytesIO(header + body), **csv_kwargs)
+
+
+def _max_timestamp(*values) -> Optional[str]:
+    timestamps = [pd.Timestamp(v) for v in values if v is not None]
+    return str(max(timestamps)) if timestamps else None
+
+
+def fingerprint_source(filepath: str, **csv_kwargs) -> Dict:
+    """
+    Manifest entry for an export that has just been ingested in full
+
+    Args:
+        filepath: CSV file
+        **csv_kwargs: Passed to load_mt5_csv (only the last line is parsed)
+
+    Returns:
+        Dict with ingested bytes, their SHA-256 and the last bar timestamp
+    """
+    filepath = str(filepath)
+    n_bytes = _complete_length(filepath)
+    with open(filepath, 'rb') as f:
+        line_start = _last_newline(f, n_bytes - 1) + 1 if n_bytes else 0
+
+    last_bar = _read_range(filepath, line_start, n_bytes, **csv_kwargs) if n_bytes else pd.DataFrame()
+    return {
+        'bytes': n_bytes,
+        'sha256': _hash_prefixes(filepath, [n_bytes])[0],
+        'last_timestamp': str(last_bar.index[-1]) if len(last_bar) else None
+    }
+
+
+def build_manifest(csv_files: List[str], last_timestamp: pd.Timestamp, **csv_kwargs) -> Dict:
+    """Manifest after a full build from `csv_files` ending at `last_timestamp`"""
+    return {
+        'last_timestamp': str(last_timestamp),
+        'sources': {Path(f).name: fingerprint_source(f, **csv_kwargs) for f in csv_files}
+    }
+
+
+def read_new_bars(csv_files: List[str], manifest: Dict, **csv_kwargs) -> Tuple[pd.DataFrame, Dict]:
+    """
+    Bars not yet in the store, parsing only what changed since the manifest
+
+    Sources are keyed by file name. For each file:
+        unchanged (same ingested prefix, no new lines) -> skipped
+        appended  (same ingested prefix, more lines)   -> only the tail is parsed
+        new / rewritten                                -> parsed in full
+    Only bars strictly after the manifest's last timestamp are returned.
+
+    Args:
+        csv_files: Current exports
+        manifest: Manifest of the previous build (see load_manifest)
+        **csv_kwargs: Passed to load_mt5_csv (formats, separator, mapping)
+
+    Returns:
+        (new_bars, manifest): merged bars sorted by time (possibly empty) and
+        the manifest describing the store once they are saved
+    """
+    cutoff = pd.Timestamp(manifest['last_timestamp']) if manifest.get('last_timestamp') else None
+    known = manifest.get('sources', {})
+    sources = dict(known)
+    frames = []
+
+    for filepath in map(str, csv_files):
+        name = Path(filepath).name
+        state = known.get(name)
+        n_bytes = _complete_length(filepath)
+
+        if state is not None and state['bytes'] <= n_bytes:
+            prefix_sha, full_sha = _hash_prefixes(filepath, [state['bytes'], n_bytes])
+        else:
+            prefix_sha, full_sha = None, _hash_prefixes(filepath, [n_bytes])[0]
+
+        if state is not None and prefix_sha == state['sha256']:
+            if n_bytes == state['bytes']:
+                logger.debug(f"{name}: unchanged")
+                continue
+            logger.info(f"{name}: parsing {n_bytes - state['bytes']} new bytes")
+            df = _read_range(filepath, state['bytes'], n_bytes, **csv_kwargs)
+            status = 'appended'
+        else:
+            status = 'new' if state is None else 'rewritten'
+            logger.info(f"{name}: {status} source, parsing in full")
+            df = _read_range(filepath, 0, n_bytes, **csv_kwargs)
+
+        if cutoff is not None:
+            stale = int((df.index <= cutoff).sum())
+            if stale and status != 'appended':
+                logger.warning(f"{name}: ignoring {stale} bars at or before {cutoff} "
+                               f"(run a full build to backfill history)")
+            df = df[df.index > cutoff]
+
+        frames.append(df)
+        sources[name] = {
+            'bytes': n_bytes,
+            'sha256': full_sha,
+            'last_timestamp': _max_timestamp(state and state['last_timestamp'],
+                                             df.index[-1] if len(df) else None)
+        }
+
+    frames = [df for df in frames if len(df)]
+    new_bars = merge_frames(frames) if frames else pd.DataFrame()
+
+    updated = {
+        'last_timestamp': _max_timestamp(cutoff, new_bars.index[-1] if len(new_bars) else None),
+        'sources': sources
+    }
+    logger.info(f"New bars since {cutoff}: {len(new_bars)}")
+    return new_bars, updated
@@ -1,47 +1,97 @@
 """
 Data ingestion from CSV (MT5 exports)
 """
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Optional
+from typing import List, Optional
 
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pa_csv
 from loguru import logger
 
 
+# Column types of MT5 exports (columns not present in a file are ignored)
+MT5_DTYPES = {
+    'Open': 'float64',
+    'High': 'float64',
+    'Low': 'float64',
+    'Close': 'float64',
+    'TickVolume': 'int32',
+    'Volume': 'int64',
+    'Spread': 'float32',
+}
+
+
+def _read_csv_pyarrow(filepath: str, date_col: str, time_col: str, separator: str) -> pa.Table:
+    """Multi-threaded Arrow CSV read with fixed column types"""
+    column_types = {name: pa.from_numpy_dtype(dtype) for name, dtype in MT5_DTYPES.items()}
+    column_types[date_col] = pa.string()
+    column_types[time_col] = pa.string()
+
+    return pa_csv.read_csv(
+        filepath,
+        parse_options=pa_csv.ParseOptions(delimiter=separator),
+        convert_options=pa_csv.ConvertOptions(column_types=column_types)
+    )
+
+
+def _parse_datetime(table: pa.Table, date_col: str, time_col: str, datetime_format: str) -> pd.DatetimeIndex:
+    """Parse date (+ time) columns with a fixed format, inferring only as a fallback"""
+    if time_col in table.column_names:
+        raw = pc.binary_join_element_wise(table[date_col], table[time_col], ' ')
+    else:
+        raw = table[date_col]
+        datetime_format = datetime_format.split(' ')[0]
+
+    try:
+        parsed = pc.strptime(raw, format=datetime_format, unit='s')
+        return pd.DatetimeIndex(parsed.to_pandas(), name='datetime').as_unit('ns')
+    except pa.ArrowInvalid:
+        logger.warning(f"Timestamps do not match '{datetime_format}', falling back to inferred parsing")
+        return pd.DatetimeIndex(pd.to_datetime(raw.to_pandas()), name='datetime')
+
+
 def load_mt5_csv(
     filepath: str,
     date_col: str = "Date",
     time_col: str = "Time",
-    columns_mapping: Optional[dict] = None
+    columns_mapping: Optional[dict] = None,
+    date_format: str = "%Y.%m.%d",
+    time_format: str = "%H:%M",
+    separator: str = ","
 ) -> pd.DataFrame:
     """
     Load MT5 exported CSV file
     
     Args:
-        filepath: Path to CSV file
+        filepath: Path to CSV file (or a binary file-like object)
         date_col: Date column name
         time_col: Time column name
         columns_mapping: Optional column name mapping
+        date_format: strptime format of the date column
+        time_format: strptime format of the time column
+        separator: Field separator
     
     Returns:
         DataFrame with datetime index and OHLC columns
     """
     logger.info(f"Loading MT5 CSV from: {filepath}")
     
-    # Read CSV
-    df = pd.read_csv(filepath)
+    # Read CSV (typed, multi-threaded)
+    table = _read_csv_pyarrow(filepath, date_col, time_col, separator)
     
-    logger.info(f"Loaded {len(df)} rows, columns: {list(df.columns)}")
+    logger.info(f"Loaded {table.num_rows} rows, columns: {table.column_names}")
     
     # Combine date and time
-    if time_col in df.columns:
-        df['datetime'] = pd.to_datetime(df[date_col] + ' ' + df[time_col])
-    else:
-        df['datetime'] = pd.to_datetime(df[date_col])
+    index = _parse_datetime(table, date_col, time_col, f"{date_format} {time_format}")
     
-    # Set index
-    df = df.set_index('datetime')
-    df = df.sort_index()
+    # Set index (the raw date/time strings are not kept as columns)
+    df = table.drop([c for c in (date_col, time_col) if c in table.column_names]).to_pandas()
+    df.index = index
+    if not df.index.is_monotonic_increasing:
+        df = df.sort_index()
     
     # Standardize column names
     if columns_mapping:
@@ -56,7 +106,54 @@ def load_mt5_csv(
     if missing:
         raise ValueError(f"Missing required columns: {missing}")
     
-    logger.info(f"Data range: {df.index[0]} to {df.index[-1]}")
+    if len(df) > 0:
+        logger.info(f"Data range: {df.index[0]} to {df.index[-1]}")
+    
+    return df
+
+
+def merge_frames(frames: List[pd.DataFrame]) -> pd.DataFrame:
+    """Concatenate bar frames sorted by time; on duplicate timestamps the last frame wins"""
+    df = pd.concat(frames)
+    df = df.sort_index(kind='stable')
+    
+    duplicated = df.index.duplicated(keep='last')
+    if duplicated.any():
+        logger.info(f"Dropping {duplicated.sum()} overlapping bars")
+        df = df[~duplicated]
+    
+    return df
+
+
+def load_mt5_csvs(
+    filepaths: List[str],
+    n_jobs: int = 4,
+    **kwargs
+) -> pd.DataFrame:
+    """
+    Load several MT5 exports in parallel and merge them
+    
+    Files are parsed concurrently (the Arrow reader releases the GIL), then
+    concatenated, sorted by time and deduplicated on timestamp. When exports
+    overlap, the bar from the file listed last wins.
+    
+    Args:
+        filepaths: CSV files (e.g. one export per month)
+        n_jobs: Files parsed concurrently
+        **kwargs: Passed to load_mt5_csv (formats, separator, mapping)
+    
+    Returns:
+        Single sorted DataFrame with unique datetime index
+    """
+    filepaths = [str(f) for f in filepaths]
+    logger.info(f"Loading {len(filepaths)} MT5 CSV files (n_jobs={n_jobs})")
+    
+    with ThreadPoolExecutor(max_workers=max(1, n_jobs)) as executor:
+        frames = list(executor.map(lambda f: load_mt5_csv(f, **kwargs), filepaths))
+    
+    df = merge_frames(frames)
+    
+    logger.info(f"Merged dataset: {len(df)} rows, {df.index[0]} to {df.index[-1]}")
     
     return df
 
@@ -1,8 +1,13 @@
 """Temporal data splits (anti-leakage)"""
-from typing import List, Tuple
+import itertools
+from dataclasses import dataclass
+from typing import Iterator, List, Optional, Tuple
+import numpy as np
 import pandas as pd
 from loguru import logger
 
+from aurum_edge.core.calendar import TradingCalendar
+
 def train_test_split_temporal(
     df: pd.DataFrame,
     test_size: float = 0.2,
@@ -32,40 +37,260 @@ def train_test_split_temporal(
     
     return train, test
 
-def get_walk_forward_splits(
-    df: pd.DataFrame,
+@dataclass(frozen=True)
+class FoldBounds:
+    """Row positions of one walk-forward fold (end positions are exclusive)"""
+    fold: int
+    train_start: int
+    train_end: int
+    test_start: int
+    test_end: int
+    
+    @property
+    def train(self) -> slice:
+        return slice(self.train_start, self.train_end)
+    
+    @property
+    def test(self) -> slice:
+        return slice(self.test_start, self.test_end)
+
+
+def iter_walk_forward_bounds(
+    index: pd.DatetimeIndex,
     train_months: int = 3,
     test_weeks: int = 2,
-    step_weeks: int = 2
-) -> List[Tuple[pd.DataFrame, pd.DataFrame]]:
-    """Generate walk-forward splits"""
+    step_weeks: int = 2,
+    purge_bars: int = 0,
+    embargo_bars: int = 0,
+    calendar: Optional[TradingCalendar] = None,
+    min_coverage: float = 0.9,
+    bar_index: Optional[pd.DatetimeIndex] = None
+) -> Iterator[FoldBounds]:
+    """
+    Walk-forward folds as row positions, generated lazily
+    
+    Window edges are dates (train [t, t + train_months), test the next
+    `test_weeks`); each is located with one binary search on the sorted
+    index, so no per-fold masks are built.
+    
+    Args:
+        index: Sorted datetime index
+        train_months: Train window length
+        test_weeks: Test window length
+        step_weeks: Step between folds
+        purge_bars: Bars removed from the end of each train window
+        embargo_bars: Bars removed from the start of each test window
+        calendar: Trading calendar of the asset. Folds whose train or test
+            window has fewer than `min_coverage` of the bars the calendar
+            expects (missing data, not weekends/holidays) are skipped.
+        min_coverage: Minimum fraction of expected bars per window
+        bar_index: Index of the bar store, when `index` is a subset of it
+            (a labeled dataset without its neutrals); coverage is measured
+            on the bars, so it counts missing data, not label density
+    
+    Yields:
+        FoldBounds with non-empty train and test ranges
+    """
     from dateutil.relativedelta import relativedelta
     
-    splits = []
-    start_date = df.index[0]
-    end_date = df.index[-1]
+    if len(index) == 0:
+        return
     
-    current_date = start_date
+    bars = index if bar_index is None else bar_index
+    end_date = index[-1]
+    current_date = index[0]
+    fold = 0
     
     while True:
         train_start = current_date
         train_end = current_date + relativedelta(months=train_months)
-        test_start = train_end
-        test_end = test_start + relativedelta(weeks=test_weeks)
+        test_end = train_end + relativedelta(weeks=test_weeks)
+        current_date = current_date + relativedelta(weeks=step_weeks)
         
         if test_end > end_date:
             break
         
-        train_mask = (df.index >= train_start) & (df.index < train_end)
-        test_mask = (df.index >= test_start) & (df.index < test_end)
-        
-        train_df = df[train_mask]
-        test_df = df[test_mask]
+        if calendar is not None:
+            train_coverage = calendar.coverage(bars, train_start, train_end)
+            test_coverage = calendar.coverage(bars, train_end, test_end)
+            if min(train_coverage, test_coverage) < min_coverage:
+                logger.warning(f"Skipping fold {train_start} -> {test_end}: coverage train "
+                               f"{train_coverage:.1%}, test {test_coverage:.1%} < {min_coverage:.0%}")
+                continue
         
-        if len(train_df) > 0 and len(test_df) > 0:
-            splits.append((train_df, test_df))
+        a, b, c = index.searchsorted([train_start, train_end, test_end])
+        bounds = FoldBounds(fold, a, max(a, b - purge_bars), min(b + embargo_bars, c), c)
         
-        current_date = current_date + relativedelta(weeks=step_weeks)
+        if bounds.train_end > bounds.train_start and bounds.test_end > bounds.test_start:
+            yield bounds
+            fold += 1
+
+
+def iter_walk_forward_splits(
+    df: pd.DataFrame,
+    train_months: int = 3,
+    test_weeks: int = 2,
+    step_weeks: int = 2,
+    purge_bars: int = 0,
+    embargo_bars: int = 0,
+    calendar: Optional[TradingCalendar] = None,
+    min_coverage: float = 0.9,
+    bar_index: Optional[pd.DatetimeIndex] = None
+) -> Iterator[Tuple[pd.DataFrame, pd.DataFrame]]:
+    """
+    Walk-forward (train, test) frames, one fold at a time
+    
+    Both frames are positional slices of `df` (views, no copy), so only
+    the fold being consumed is alive. Arguments as in
+    `iter_walk_forward_bounds`.
+    """
+    for bounds in iter_walk_forward_bounds(
+        df.index, train_months, test_weeks, step_weeks,
+        purge_bars, embargo_bars, calendar, min_coverage, bar_index
+    ):
+        yield df.iloc[bounds.train], df.iloc[bounds.test]
+
+
+def get_walk_forward_splits(
+    df: pd.DataFrame,
+    train_months: int = 3,
+    test_weeks: int = 2,
+    step_weeks: int = 2,
+    calendar: Optional[TradingCalendar] = None,
+    min_coverage: float = 0.9,
+    purge_bars: int = 0,
+    embargo_bars: int = 0,
+    bar_index: Optional[pd.DatetimeIndex] = None
+) -> List[Tuple[pd.DataFrame, pd.DataFrame]]:
+    """
+    Generate walk-forward splits
+    
+    List of the (train, test) views of `iter_walk_forward_splits`.
+    
+    Args:
+        df: DataFrame with datetime index
+        train_months: Train window length
+        test_weeks: Test window length
+        step_weeks: Step between folds
+        calendar: Trading calendar of the asset. Folds whose train or test
+            window has fewer than `min_coverage` of the bars the calendar
+            expects (missing data, not weekends/holidays) are skipped.
+        min_coverage: Minimum fraction of expected bars per window
+        purge_bars: Bars removed from the end of each train window
+        embargo_bars: Bars removed from the start of each test window
+        bar_index: Bar store index for the coverage when `df` is a labeled
+            subset of the bars
+    """
+    splits = list(iter_walk_forward_splits(
+        df, train_months, test_weeks, step_weeks,
+        purge_bars, embargo_bars, calendar, min_coverage, bar_index
+    ))
     
     logger.info(f"Generated {len(splits)} walk-forward splits")
     return splits
+
+
+class CombinatorialPurgedKFold:
+    """
+    Combinatorial purged cross-validation (CPCV)
+    
+    The samples are cut into `n_groups` contiguous groups and every
+    combination of `n_test_groups` of them is a test set (C(N, k) splits).
+    Train samples whose label interval [t, t1] overlaps a test block are
+    purged and the `embargo_bars` samples that follow each test block are
+    dropped as well. Each group is tested in C(N-1, k-1) splits, which
+    stitch together into that many full out-of-sample backtest paths.
+    """
+    
+    def __init__(self, n_groups: int = 6, n_test_groups: int = 2, embargo_bars: int = 0):
+        """
+        Args:
+            n_groups: Contiguous groups the samples are cut into (N)
+            n_test_groups: Groups in each test set (k)
+            embargo_bars: Samples dropped from train after each test block
+        """
+        if not 0 < n_test_groups < n_groups:
+            raise ValueError(f"n_test_groups must be in [1, {n_groups - 1}], got {n_test_groups}")
+        self.n_groups = n_groups
+        self.n_test_groups = n_test_groups
+        self.embargo_bars = embargo_bars
+        self.combinations = list(itertools.combinations(range(n_groups), n_test_groups))
+    
+    @property
+    def n_splits(self) -> int:
+        return len(self.combinations)
+    
+    @property
+    def n_paths(self) -> int:
+        return self.n_splits * self.n_test_groups // self.n_groups
+    
+    def group_bounds(self, n_samples: int) -> List[Tuple[int, int]]:
+        """[start, end) positions of each group"""
+        edges = np.linspace(0, n_samples, self.n_groups + 1).astype(np.int64)
+        return list(zip(edges[:-1], edges[1:]))
+    
+    def paths(self) -> np.ndarray:
+        """
+        Split that supplies each group of each backtest path
+        
+        Returns:
+            int array of shape (n_paths, n_groups): entry [p, g] is the split
+            whose test predictions for group g belong to path p
+        """
+        assignment = np.empty((self.n_paths, self.n_groups), dtype=np.int64)
+        for g in range(self.n_groups):
+            assignment[:, g] = [s for s, combo in enumerate(self.combinations) if g in combo]
+        return assignment
+    
+    def split(self, index: pd.DatetimeIndex, t1: pd.Series) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+        """
+        Train/test positions of every split, in `combinations` order
+        
+        Args:
+            index: Sorted sample times (label start)
+            t1: Label end time of each sample (triple barrier 't1')
+        
+        Yields:
+            (train_positions, test_positions) as int arrays
+        """
+        start = index.values.astype('datetime64[ns]').astype(np.int64)
+        end = np.asarray(pd.DatetimeIndex(t1).values.astype('datetime64[ns]').astype(np.int64))
+        if len(end) != len(start):
+            raise ValueError(f"t1 has {len(end)} values for {len(start)} samples")
+        if (end < start).any():
+            raise ValueError("t1 must not precede the sample time")
+        
+        n = len(start)
+        horizon = int((end - start).max()) if n else 0
+        bounds = self.group_bounds(n)
+        
+        for combo in self.combinations:
+            train = np.ones(n, dtype=bool)
+            test = np.zeros(n, dtype=bool)
+            
+            # Adjacent test groups form one block
+            blocks = []
+            for g in combo:
+                a, b = bounds[g]
+                if blocks and blocks[-1][1] == a:
+                    blocks[-1] = (blocks[-1][0], b)
+                else:
+                    blocks.append((a, b))
+            
+            for a, b in blocks:
+                if a == b:
+                    continue
+                test[a:b] = True
+                block_start, block_end = start[a], end[a:b].max()
+                
+                # Before the block: labels that end inside it (only samples
+                # within one label horizon can)
+                lo = np.searchsorted(start, block_start - horizon, side='left')
+                train[lo:a] &= end[lo:a] < block_start
+                
+                # After the block: samples starting before its last label ends, then the embargo
+                hi = np.searchsorted(start, block_end, side='right')
+                train[b:max(b, hi) + self.embargo_bars] = False
+            
+            train &= ~test
+            yield np.flatnonzero(train), np.flatnonzero(test)
@@ -0,0 +1,193 @@
+"""
+Partitioned OHLC store (parquet dataset)
+
+Layout (hive partitioning):
+    <root>/symbol=NAS100/timeframe=M5/month=2024-01/part-0.parquet
+
+Each file keeps min/max statistics per row group, so loads filtered by
+date only touch the months (partition pruning) and row groups (statistics
+pushdown) that overlap the requested range, and only the requested
+columns are decoded.
+"""
+from pathlib import Path
+from typing import Iterator, List, Optional
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+from loguru import logger
+
+PARTITION_COLUMNS = ['symbol', 'timeframe', 'month']
+TIME_COLUMN = 'datetime'
+
+PARTITIONING = ds.partitioning(
+    pa.schema([(name, pa.string()) for name in PARTITION_COLUMNS]),
+    flavor='hive'
+)
+
+
+def _match_stored_schema(table: pa.Table, path: Path) -> pa.Table:
+    """Cast `table` to the schema of the files already stored under `path`"""
+    if not path.exists():
+        return table
+    stored = ds.dataset(str(path), format='parquet').schema
+    if set(stored.names) != set(table.column_names) - set(PARTITION_COLUMNS):
+        return table
+    
+    partition_fields = [table.schema.field(name) for name in PARTITION_COLUMNS]
+    schema = pa.schema(list(stored) + partition_fields)
+    return table.select(schema.names).cast(schema)
+
+
+def save_partitioned(
+    df: pd.DataFrame,
+    root: str,
+    symbol: str,
+    timeframe: str,
+    row_group_rows: int = 50_000,
+    append: bool = False
+) -> None:
+    """
+    Write bars to the partitioned store
+
+    Months present in `df` are replaced for this symbol/timeframe; other
+    months and other symbols are left untouched. With `append=True` the bars
+    are added as new files next to the existing ones instead (the caller
+    guarantees they are not already stored).
+
+    Args:
+        df: DataFrame with datetime index
+        root: Store root directory
+        symbol: Symbol partition (e.g. 'NAS100')
+        timeframe: Timeframe partition (e.g. 'M5')
+        row_group_rows: Rows per row group (granularity of date pushdown)
+        append: Add files to existing months instead of replacing them
+    """
+    Path(root).mkdir(parents=True, exist_ok=True)
+
+    frame = df.rename_axis(TIME_COLUMN).reset_index()
+    frame['symbol'] = symbol
+    frame['timeframe'] = timeframe
+    frame['month'] = frame[TIME_COLUMN].dt.strftime('%Y-%m')
+
+    table = pa.Table.from_pandas(frame, preserve_index=False)
+
+    if append:
+        # Keep the stored column types (e.g. a store written before a dtype change)
+        table = _match_stored_schema(table, Path(root) / f'symbol={symbol}' / f'timeframe={timeframe}')
+        
+        # Appended bars are newer than anything stored, so their first
+        # timestamp gives each append batch a unique, ordered file name
+        first = frame[TIME_COLUMN].min().strftime('%Y%m%d%H%M%S') if len(frame) else 'empty'
+        existing_data_behavior = 'overwrite_or_ignore'
+        basename_template = f'part-{first}-{{i}}.parquet'
+    else:
+        existing_data_behavior = 'delete_matching'
+        basename_template = 'part-{i}.parquet'
+
+    ds.write_dataset(
+        table,
+        base_dir=str(root),
+        format='parquet',
+        partitioning=PARTITIONING,
+        existing_data_behavior=existing_data_behavior,
+        basename_template=basename_template,
+        max_rows_per_group=row_group_rows,
+        min_rows_per_group=min(row_group_rows, len(frame)) if len(frame) else 0,
+        file_options=ds.ParquetFileFormat().make_write_options(compression='snappy')
+    )
+
+    months = frame['month'].nunique()
+    action = "Appended" if append else "Saved"
+    logger.info(f"{action} {len(frame)} bars to store: {root} ({symbol}/{timeframe}, {months} months)")
+
+
+def load_partitioned(
+    root: str,
+    symbol: Optional[str] = None,
+    timeframe: Optional[str] = None,
+    start: Optional[pd.Timestamp] = None,
+    end: Optional[pd.Timestamp] = None,
+    columns: Optional[List[str]] = None
+) -> pd.DataFrame:
+    """
+    Load bars from the partitioned store
+
+    Args:
+        root: Store root directory
+        symbol: Only this symbol (None = all)
+        timeframe: Only this timeframe (None = all)
+        start: Inclusive lower bound on the datetime index
+        end: Exclusive upper bound on the datetime index
+        columns: Columns to read (None = all data columns)
+
+    Returns:
+        DataFrame indexed by datetime, sorted. Partition columns are only
+        included when requested in `columns`.
+    """
+    dataset = ds.dataset(str(root), format='parquet', partitioning=PARTITIONING)
+
+    expr = None
+
+    def _and(condition):
+        return condition if expr is None else expr & condition
+
+    if symbol is not None:
+        expr = _and(ds.field('symbol') == symbol)
+    if timeframe is not None:
+        expr = _and(ds.field('timeframe') == timeframe)
+    if start is not None:
+        start = pd.Timestamp(start)
+        expr = _and(ds.field('month') >= start.strftime('%Y-%m'))
+        expr = _and(ds.field(TIME_COLUMN) >= pa.scalar(start.to_datetime64()))
+    if end is not None:
+        end = pd.Timestamp(end)
+        expr = _and(ds.field('month') <= end.strftime('%Y-%m'))
+        expr = _and(ds.field(TIME_COLUMN) < pa.scalar(end.to_datetime64()))
+
+    if columns is None:
+        read_columns = [c for c in dataset.schema.names if c not in PARTITION_COLUMNS]
+    else:
+        read_columns = [TIME_COLUMN] + [c for c in columns if c != TIME_COLUMN]
+
+    table = dataset.to_table(columns=read_columns, filter=expr)
+    df = table.to_pandas().set_index(TIME_COLUMN).sort_index()
+
+    logger.info(f"Loaded {len(df)} bars from store: {root} (symbol={symbol}, timeframe={timeframe}, "
+                f"range=[{start}, {end}), columns={len(df.columns)})")
+    return df
+
+
+def list_partitions(root: str) -> pd.DataFrame:
+    """Symbol/timeframe/month partitions present in the store (from paths, no data read)"""
+    rows = []
+    for path in Path(root).glob('symbol=*/timeframe=*/month=*'):
+        if any(path.glob('*.parquet')):
+            rows.append({
+                part.split('=', 1)[0]: part.split('=', 1)[1]
+                for part in path.relative_to(root).parts
+            })
+    partitions = pd.DataFrame(rows, columns=PARTITION_COLUMNS)
+    return partitions.sort_values(PARTITION_COLUMNS).reset_index(drop=True)
+
+
+def iter_partitioned(
+    root: str,
+    symbol: str,
+    timeframe: str,
+    columns: Optional[List[str]] = None
+) -> Iterator[pd.DataFrame]:
+    """
+    Bars of one symbol/timeframe, one month at a time and in time order
+
+    Reads a single month partition per step, so the whole history is never
+    in memory at once (out-of-core consumers, e.g. chunked labeling).
+    """
+    partitions = list_partitions(root)
+    months = partitions.loc[
+        (partitions['symbol'] == symbol) & (partitions['timeframe'] == timeframe), 'month'
+    ]
+    for month in months:
+        start = pd.Timestamp(f'{month}-01')
+        yield load_partitioned(root, symbol, timeframe, start=start,
+                               end=start + pd.DateOffset(months=1), columns=columns)
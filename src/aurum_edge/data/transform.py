@@ -3,12 +3,18 @@ import pandas as pd
 from loguru import logger
 
 def clean_data(df: pd.DataFrame) -> pd.DataFrame:
-    """Clean raw data"""
+    """
+    Clean raw data (drop rows with NaN, duplicate rows, sort by time)
+    
+    Rows are filtered with one mask and the frame is only sorted when it is
+    out of order, so clean input is returned without being copied.
+    """
     logger.info("Cleaning data...")
-    df = df.copy()
-    df = df.dropna()
-    df = df.drop_duplicates()
-    df = df.sort_index()
+    keep = df.notna().all(axis=1).to_numpy() & ~df.duplicated().to_numpy()
+    if not keep.all():
+        df = df[keep]
+    if not df.index.is_monotonic_increasing:
+        df = df.sort_index()
     logger.info(f"Cleaned data: {len(df)} rows remaining")
     return df
 
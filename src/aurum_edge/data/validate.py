@@ -1,12 +1,18 @@
 """
 Data quality validation
 """
-from typing import Dict, List
+from typing import Dict, List, Optional
 
 import numpy as np
 import pandas as pd
 from loguru import logger
 
+from aurum_edge.core.calendar import TradingCalendar
+from aurum_edge.core.monitoring import DataQualityReport
+from aurum_edge.core.timeutils import check_gaps
+
+OHLC = ['open', 'high', 'low', 'close']
+
 
 def check_missing_values(df: pd.DataFrame) -> Dict[str, int]:
     """Check for missing values"""
@@ -17,10 +23,19 @@ def check_missing_values(df: pd.DataFrame) -> Dict[str, int]:
 
 
 def check_duplicates(df: pd.DataFrame) -> int:
-    """Check for duplicate rows"""
-    dup_count = df.duplicated().sum()
+    """
+    Check for duplicate bars
+    
+    A bar is a duplicate when its timestamp repeats an earlier one, whatever
+    its values; two bars with identical values at different times are not
+    duplicates (flat markets print those).
+    
+    Returns:
+        Number of repeated timestamps
+    """
+    dup_count = int(df.index.duplicated().sum())
     if dup_count > 0:
-        logger.warning(f"Found {dup_count} duplicate rows")
+        logger.warning(f"Found {dup_count} duplicate timestamps")
     return dup_count
 
 
@@ -96,51 +111,134 @@ def validate_ohlc_logic(df: pd.DataFrame) -> List[str]:
     return errors
 
 
-def run_full_validation(df: pd.DataFrame, config: dict) -> bool:
+def validate_bars(
+    df: pd.DataFrame,
+    config: Optional[dict] = None,
+    calendar: Optional[TradingCalendar] = None
+) -> DataQualityReport:
     """
-    Run full data validation suite
+    Single-pass data quality check of OHLC bars
+    
+    The OHLC columns are read once into a (n, 4) array; missing values,
+    z-score outliers and the OHLC logic are all evaluated on it, and the
+    timestamp diffs give monotonicity, duplicate timestamps and gaps.
+    Duplicates are repeated timestamps, as in `check_duplicates` (not rows
+    with repeated values). Columns with fewer than 2 values are not scored
+    for outliers.
+    
+    Args:
+        df: Bars with OHLC columns and a datetime index
+        config: `data_quality` config (min_rows, outlier_threshold,
+            max_gap_minutes, check_monotonic_time)
+        calendar: Trading calendar of the asset; only trading time counts
+            towards gaps (weekends, daily breaks and holidays are not gaps)
     
     Returns:
-        True if all checks pass
+        DataQualityReport. Gaps are listed but do not fail the report
+        (holidays and broker outages are real gaps in real data).
     """
-    logger.info("Running full data validation...")
+    config = config or {}
+    n = len(df)
+    issues = []
     
-    all_passed = True
+    ohlc = [col for col in OHLC if col in df.columns]
+    values = df[ohlc].to_numpy(dtype=np.float64)
+    nan_mask = np.isnan(values)
     
     # Missing values
-    missing = check_missing_values(df)
-    if any(v > 0 for v in missing.values()):
-        all_passed = False
-    
-    # Duplicates
-    dup_count = check_duplicates(df)
-    if dup_count > 0:
-        all_passed = False
-    
-    # Outliers
-    outlier_threshold = config.get('outlier_threshold', 5.0)
-    outliers = check_outliers(df, ['open', 'high', 'low', 'close'], outlier_threshold)
-    if outliers:
-        all_passed = False
-    
-    # Monotonic time
-    if not check_monotonic_time(df):
-        all_passed = False
+    missing_ohlc = nan_mask.sum(axis=0)
+    missing = {
+        col: int(missing_ohlc[ohlc.index(col)]) if col in ohlc else int(df[col].isna().sum())
+        for col in df.columns
+    }
+    found = {col: count for col, count in missing.items() if count > 0}
+    if found:
+        issues.append(f"Missing values found: {found}")
+    
+    # Outliers (z-score per column, compared against mean +- threshold * std)
+    threshold = config.get('outlier_threshold', 5.0)
+    outliers = {}
+    # Columns with fewer than 2 values have no std (nanmean/nanstd would warn)
+    scored = [i for i, count in enumerate(n - missing_ohlc) if count > 1]
+    if scored:
+        sample = values[:, scored]
+        if nan_mask[:, scored].any():
+            mean = np.nanmean(sample, axis=0)
+            std = np.nanstd(sample, axis=0, ddof=1)
+        else:
+            mean = sample.mean(axis=0)
+            std = sample.std(axis=0, ddof=1)
+        counts = ((sample > mean + threshold * std) | (sample < mean - threshold * std)).sum(axis=0)
+        outliers = {ohlc[i]: int(c) for i, c in zip(scored, counts) if c > 0}
+        if outliers:
+            issues.append(f"Outliers (z > {threshold}): {outliers}")
     
     # OHLC logic
-    ohlc_errors = validate_ohlc_logic(df)
-    if ohlc_errors:
-        all_passed = False
+    if len(ohlc) == 4:
+        open_, high, low, close = values.T
+        for message, invalid in (
+            ("High < max(open, close)", high < np.maximum(open_, close)),
+            ("Low > min(open, close)", low > np.minimum(open_, close)),
+            ("High < Low", high < low)
+        ):
+            count = int(np.count_nonzero(invalid))
+            if count:
+                issues.append(f"{message}: {count} rows")
+    
+    # Time index: monotonic, duplicate timestamps, gaps
+    diffs = np.diff(df.index.values.astype(np.int64)) if n > 1 else np.empty(0, dtype=np.int64)
+    duplicates = int(np.count_nonzero(diffs == 0))
+    if config.get('check_monotonic_time', True) and (diffs < 0).any():
+        issues.append("Time index is not monotonically increasing")
+        duplicates = int(df.index.duplicated().sum())
+    if duplicates:
+        issues.append(f"Found {duplicates} duplicate timestamps")
+    
+    gaps = check_gaps(df, config.get('max_gap_minutes', 15), calendar)
+    if gaps:
+        longest = max(gaps, key=lambda gap: gap[2])
+        logger.warning(f"Found {len(gaps)} gaps > {config.get('max_gap_minutes', 15)} min "
+                       f"(longest {longest[2]:.0f} min from {longest[0]})")
     
     # Min rows
     min_rows = config.get('min_rows', 1000)
-    if len(df) < min_rows:
-        logger.error(f"Insufficient data: {len(df)} rows < {min_rows} required")
-        all_passed = False
+    if n < min_rows:
+        issues.append(f"Insufficient rows: {n} < {min_rows}")
+    
+    return DataQualityReport(
+        total_rows=n,
+        missing_values=missing,
+        duplicate_rows=duplicates,
+        gaps=gaps,
+        outliers=outliers,
+        date_range=(df.index[0], df.index[-1]) if n > 0 else (None, None),
+        passed=not issues,
+        issues=issues
+    )
+
+
+def run_full_validation(df: pd.DataFrame, config: dict, calendar: Optional[TradingCalendar] = None) -> bool:
+    """
+    Run full data validation suite
+    
+    Args:
+        df: Bars with OHLC columns and a datetime index
+        config: `data_quality` config
+        calendar: Trading calendar of the asset (session-aware gaps)
+    
+    Returns:
+        True if all checks pass
+    """
+    logger.info("Running full data validation...")
+    
+    report = validate_bars(df, config, calendar)
+    
+    for issue in report.issues:
+        logger.error(f"Validation failed: {issue}")
     
-    if all_passed:
+    if report.passed:
         logger.info("✓ All validation checks passed")
     else:
         logger.error("✗ Some validation checks failed")
     
-    return all_passed
+    return report.passed
@@ -3,7 +3,9 @@ from dataclasses import dataclass
 from datetime import datetime
 from loguru import logger
 
-@dataclass
+from aurum_edge.backtest.ledger import TradeLedger
+
+@dataclass(slots=True)
 class PaperTrade:
     """Paper trade record"""
     entry_time: datetime
@@ -23,7 +25,7 @@ class PaperTradingEngine:
     def __init__(self, initial_balance=1000.0):
         self.balance = initial_balance
         self.initial_balance = initial_balance
-        self.trades = []
+        self.trades = TradeLedger(initial_balance)  # closed trades
         self.open_trades = []
     
     def execute_trade(
@@ -63,18 +65,28 @@ class PaperTradingEngine:
         self.balance += trade.pnl
         
         self.open_trades.remove(trade)
-        self.trades.append(trade)
+        self.trades.append(
+            entry_time=trade.entry_time,
+            exit_time=trade.exit_time,
+            entry_price=trade.entry_price,
+            exit_price=exit_price,
+            pnl=trade.pnl,
+            direction=1 if trade.direction == 'long' else -1,
+            size=trade.size
+        )
         
         logger.info(f"Paper trade closed: PnL ${trade.pnl:.2f}, Balance ${self.balance:.2f}")
         
         return trade
     
     def get_summary(self):
-        """Get trading summary"""
+        """Get trading summary (running ledger totals, O(1))"""
         return {
             'initial_balance': self.initial_balance,
             'current_balance': self.balance,
             'total_pnl': self.balance - self.initial_balance,
             'num_trades': len(self.trades),
-            'open_trades': len(self.open_trades)
+            'open_trades': len(self.open_trades),
+            'win_rate': self.trades.win_rate,
+            'max_drawdown': self.trades.max_drawdown
         }
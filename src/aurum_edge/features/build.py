@@ -1,49 +1,163 @@
 """Main feature building orchestrator"""
+from functools import partial
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
 import pandas as pd
 from loguru import logger
 
-from aurum_edge.features.returns import add_return_features
-from aurum_edge.features.volatility import add_volatility_features
-from aurum_edge.features.trend import add_trend_features
-from aurum_edge.features.session import add_session_features
-from aurum_edge.features.microstructure import add_microstructure_features
+from aurum_edge.features.graph import FeatureGraph
+from aurum_edge.features.returns import log_return
+from aurum_edge.features.volatility import true_range
+from aurum_edge.features.trend import MACD_FAST, MACD_SLOW, macd_lines
+from aurum_edge.features.microstructure import rolling_zscore, volume_column
 from aurum_edge.features.leakage_guard import validate_no_leakage
+from aurum_edge.features.session import SESSION_HOURS, session_flags
+
+SOURCES = ['close', 'high', 'low', 'volume', 'index']
+
+
+def _returns(close, pct_change=None, period=1):
+    return {
+        f'return_{period}': close.pct_change(period) if pct_change is None else pct_change,
+        f'log_return_{period}': log_return(close, period)
+    }
 
-def build_all_features(df: pd.DataFrame, config: dict) -> pd.DataFrame:
+
+def build_feature_graph(config: dict, has_volume: bool = True) -> FeatureGraph:
     """
-    Build all features for the dataset
-    
+    Declare the feature DAG for a feature configuration
+
+    Shared intermediates: 1-bar returns (return_1 and every volatility
+    window), one EWM per distinct span (ema_* and the MACD fast/slow lines)
+    and the ATR (range_atr_ratio). Declaration order is the column order of
+    build_all_features.
+
     Args:
-        df: DataFrame with OHLC data
         config: Feature configuration
-    
+        has_volume: Data has a tick volume column
+
     Returns:
-        DataFrame with features added
+        FeatureGraph over the sources close, high, low, volume, index
     """
-    logger.info("Building features...")
-    
-    df_features = df.copy()
-    
+    returns_periods = config.get('returns_periods', [1, 3, 5])
+    volatility_windows = config.get('volatility_windows', [10, 20])
+    ema_periods = config.get('ema_periods', [9, 21, 50])
+
+    graph = FeatureGraph(SOURCES)
+
     # Returns
-    df_features = add_return_features(df_features, config.get('returns_periods', [1, 3, 5]))
-    
+    graph.add('pct_change_1', lambda close: close.pct_change(), deps=['close'])
+    for period in returns_periods:
+        deps = ['close', 'pct_change_1'] if period == 1 else ['close']
+        graph.add(f'returns_{period}', partial(_returns, period=period), deps=deps,
+                  columns=[f'return_{period}', f'log_return_{period}'])
+
     # Volatility
-    df_features = add_volatility_features(df_features, config.get('volatility_windows', [10, 20]))
-    
+    graph.add('tr', true_range, deps=['high', 'low', 'close'], columns=['tr'])
+    graph.add('atr_14', lambda tr: tr.rolling(14).mean(), deps=['tr'], columns=['atr_14'])
+    for window in volatility_windows:
+        graph.add(f'volatility_{window}', partial(lambda r, w: r.rolling(w).std(), w=window),
+                  deps=['pct_change_1'], columns=[f'volatility_{window}'])
+
     # Trend
-    df_features = add_trend_features(df_features, config.get('ema_periods', [9, 21, 50]))
-    
+    for span in sorted(set(ema_periods) | {MACD_FAST, MACD_SLOW}):
+        graph.add(f'ewm_{span}', partial(lambda close, s: close.ewm(span=s).mean(), s=span), deps=['close'])
+    for period in ema_periods:
+        graph.add(f'ema_{period}', lambda ewm: ewm, deps=[f'ewm_{period}'], columns=[f'ema_{period}'])
+    graph.add('macd', macd_lines, deps=[f'ewm_{MACD_FAST}', f'ewm_{MACD_SLOW}'],
+              columns=['macd', 'macd_signal', 'macd_hist'])
+
     # Session
     if config.get('session_splits', True):
-        df_features = add_session_features(df_features)
-    
+        graph.add('session', session_flags, deps=['index'],
+                  columns=[f'session_{name}' for name in SESSION_HOURS])
+
     # Microstructure
-    df_features = add_microstructure_features(df_features, config)
-    
+    if has_volume:
+        window = config.get('tick_volume_zscore_window', 20)
+        graph.add('tick_volume_zscore', partial(rolling_zscore, window=window),
+                  deps=['volume'], columns=['tick_volume_zscore'])
+    if config.get('spread_proxy', True):
+        graph.add('spread_proxy', lambda high, low, close: (high - low) / close,
+                  deps=['high', 'low', 'close'], columns=['spread_proxy'])
+    graph.add('range_atr_ratio', lambda high, low, atr: (high - low) / (atr + 1e-8),
+              deps=['high', 'low', 'atr_14'], columns=['range_atr_ratio'])
+
+    return graph
+
+
+def compute_features(
+    df: pd.DataFrame,
+    config: dict,
+    features: Optional[List[str]] = None
+) -> Tuple[pd.DataFrame, Dict[str, float]]:
+    """
+    Run the feature graph on OHLC bars
+
+    Args:
+        df: DataFrame with OHLC data
+        config: Feature configuration
+        features: Feature columns to compute (None = all). Columns already
+            in `df` (e.g. raw OHLC used as model inputs) are skipped.
+
+    Returns:
+        (features_df, timings): only the computed feature columns, and the
+        seconds spent per graph node
+    """
+    if features is not None:
+        features = [col for col in features if col not in df.columns]
+
+    vol_col = volume_column(df)
+    graph = build_feature_graph(config, has_volume=vol_col is not None)
+    sources = {
+        'close': df['close'],
+        'high': df['high'],
+        'low': df['low'],
+        'volume': df[vol_col] if vol_col is not None else None,
+        'index': df.index
+    }
+    outputs, timings = graph.run(sources, features)
+
+    features_df = pd.DataFrame(
+        {col: np.asarray(values) for col, values in outputs.items()},
+        index=df.index
+    )
+    return features_df, timings
+
+
+def build_all_features(
+    df: pd.DataFrame,
+    config: dict,
+    features: Optional[List[str]] = None
+) -> pd.DataFrame:
+    """
+    Build all features for the dataset
+
+    Args:
+        df: DataFrame with OHLC data
+        config: Feature configuration
+        features: Feature columns a model needs (None = all). Only the graph
+            nodes behind them are computed.
+
+    Returns:
+        DataFrame with features added
+    """
+    logger.info("Building features...")
+
+    features_df, timings = compute_features(df, config, features)
+    df_features = pd.concat([df, features_df], axis=1, copy=False)
+
+    # Time per graph node (slowest first)
+    total = sum(timings.values())
+    logger.info(f"Feature graph: {len(timings)} nodes in {total:.3f}s")
+    for name, seconds in sorted(timings.items(), key=lambda item: -item[1])[:10]:
+        logger.debug(f"  {name:<24} {seconds * 1000:8.1f} ms")
+
     # Validate no leakage
     if config.get('validate_on_build', True):
         validate_no_leakage(df_features, df)
-    
+
     logger.info(f"Features built: {len(df_features.columns)} total columns")
-    
+
     return df_features
@@ -0,0 +1,176 @@
+"""
+Incremental feature computation with persisted indicator state
+
+`IncrementalFeatureBuilder` produces the same columns as `build_all_features`
+but only for bars it has not seen yet. Between runs it keeps:
+    - the last `warmup` raw bars, the longest lookback of any rolling feature
+      (returns, TR/ATR window, volatility_* windows, tick volume z-score), so
+      those are recomputed for the new bars exactly as the batch path does
+    - the numerator/denominator of every adjusted EWM (ema_*, MACD fast and
+      slow lines, MACD signal), continued over the new bars in closed form
+The state is a few dozen bars plus two floats per EWM and is saved with
+joblib next to the feature file.
+"""
+from pathlib import Path
+from typing import Dict, Tuple
+
+import joblib
+import numpy as np
+import pandas as pd
+from loguru import logger
+from scipy.signal import lfilter
+
+from aurum_edge.features.microstructure import add_microstructure_features
+from aurum_edge.features.returns import add_return_features
+from aurum_edge.features.session import add_session_features
+from aurum_edge.features.volatility import add_volatility_features
+
+ATR_WINDOW = 14
+MACD_SPANS = {'fast': 12, 'slow': 26, 'signal': 9}
+
+
+def ewm_continue(values: np.ndarray, span: int, state: Tuple[float, float]) -> Tuple[np.ndarray, Tuple[float, float]]:
+    """
+    Continue an adjusted EWM (pandas `ewm(span=span).mean()`) over new values
+
+    The adjusted mean at bar t is num_t / den_t with num_t = x_t + beta * num_{t-1}
+    and den_t = 1 + beta * den_{t-1}, so the whole history is summarized by
+    (num, den). (0.0, 0.0) starts a fresh EWM. Values must not contain NaN.
+
+    Args:
+        values: New observations
+        span: EWM span
+        state: (num, den) after the previous observation
+
+    Returns:
+        (means, state): EWM at each new value and the state after the last one
+    """
+    if len(values) == 0:
+        return np.empty(0), state
+
+    beta = 1.0 - 2.0 / (span + 1.0)
+    num0, den0 = state
+    num = lfilter([1.0], [1.0, -beta], values, zi=[beta * num0])[0]
+    decay = beta ** np.arange(1, len(values) + 1)
+    den = (1.0 - decay) / (1.0 - beta) + decay * den0
+    return num / den, (float(num[-1]), float(den[-1]))
+
+
+class IncrementalFeatureBuilder:
+    """Extends features to new bars in O(new bars), matching build_all_features"""
+
+    def __init__(self, config: dict):
+        """
+        Args:
+            config: Feature configuration (same keys as build_all_features)
+        """
+        self.config = dict(config)
+        self.returns_periods = list(config.get('returns_periods', [1, 3, 5]))
+        self.volatility_windows = list(config.get('volatility_windows', [10, 20]))
+        self.ema_periods = list(config.get('ema_periods', [9, 21, 50]))
+        self.zscore_window = config.get('tick_volume_zscore_window', 20)
+
+        # Bars needed before a new bar to recompute every rolling feature on it
+        self.warmup = max(
+            max(self.returns_periods, default=0),
+            max(self.volatility_windows, default=0) + 1,
+            ATR_WINDOW + 1,
+            self.zscore_window
+        )
+
+        self.tail = pd.DataFrame()
+        self.ewm: Dict[str, Tuple[float, float]] = {}
+        self.n_bars = 0
+
+    @property
+    def last_timestamp(self):
+        """Timestamp of the last processed bar (None before the first update)"""
+        return self.tail.index[-1] if len(self.tail) else None
+
+    def _continue(self, name: str, values: np.ndarray, span: int) -> np.ndarray:
+        means, self.ewm[name] = ewm_continue(values, span, self.ewm.get(name, (0.0, 0.0)))
+        return means
+
+    def _advance_trend(self, close: np.ndarray) -> Dict[str, np.ndarray]:
+        """EMA and MACD columns for new closes (advances the EWM state)"""
+        columns = {
+            f'ema_{period}': self._continue(f'ema_{period}', close, period)
+            for period in self.ema_periods
+        }
+        macd = (self._continue('macd_fast', close, MACD_SPANS['fast'])
+                - self._continue('macd_slow', close, MACD_SPANS['slow']))
+        columns['macd'] = macd
+        columns['macd_signal'] = self._continue('macd_signal', macd, MACD_SPANS['signal'])
+        columns['macd_hist'] = macd - columns['macd_signal']
+        return columns
+
+    def seed(self, df: pd.DataFrame):
+        """
+        Take the state at the end of a batch build over `df`
+
+        Only the EWM lines are run over the history (vectorized); rolling
+        features just need the last `warmup` bars.
+
+        Args:
+            df: Raw OHLC bars that were passed to build_all_features
+        """
+        self.tail = df.iloc[-self.warmup:].copy()
+        self.ewm = {}
+        self._advance_trend(df['close'].to_numpy(dtype=np.float64))
+        self.n_bars = len(df)
+
+    def update(self, new_bars: pd.DataFrame) -> pd.DataFrame:
+        """
+        Compute features for bars appended after the last update
+
+        Args:
+            new_bars: Raw OHLC bars strictly after `last_timestamp`
+
+        Returns:
+            Features for `new_bars` (same columns as build_all_features)
+        """
+        if len(new_bars) == 0:
+            return pd.DataFrame()
+        if self.last_timestamp is not None and new_bars.index[0] <= self.last_timestamp:
+            raise ValueError(
+                f"New bars must start after {self.last_timestamp}, got {new_bars.index[0]}"
+            )
+
+        n_new = len(new_bars)
+        frame = pd.concat([self.tail, new_bars]) if len(self.tail) else new_bars.copy()
+
+        # Rolling features: recomputed over warmup + new bars, same code and
+        # column order as batch (trend columns are filled in afterwards)
+        trend_columns = [f'ema_{p}' for p in self.ema_periods] + ['macd', 'macd_signal', 'macd_hist']
+        frame = add_return_features(frame, self.returns_periods)
+        frame = add_volatility_features(frame, self.volatility_windows)
+        frame = frame.assign(**{col: np.nan for col in trend_columns})
+        if self.config.get('session_splits', True):
+            frame = add_session_features(frame)
+        frame = add_microstructure_features(frame, self.config)
+        frame = frame.iloc[-n_new:].copy()
+
+        # Trend features: EWM state carried over from the previous update
+        for col, values in self._advance_trend(frame['close'].to_numpy(dtype=np.float64)).items():
+            frame[col] = values
+
+        # Keep only the raw bars needed by the next update
+        history = pd.concat([self.tail, new_bars]) if len(self.tail) else new_bars
+        self.tail = history.iloc[-self.warmup:].copy()
+        self.n_bars += n_new
+
+        logger.info(f"Incremental features: {n_new} new bars (total {self.n_bars}, last {self.last_timestamp})")
+        return frame
+
+    def save(self, path: str):
+        """Persist the indicator state"""
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        joblib.dump(self, path)
+        logger.info(f"Saved feature state to: {path}")
+
+    @classmethod
+    def load(cls, path: str) -> 'IncrementalFeatureBuilder':
+        """Load a persisted indicator state"""
+        builder = joblib.load(path)
+        logger.info(f"Loaded feature state from: {path} (last bar {builder.last_timestamp})")
+        return builder
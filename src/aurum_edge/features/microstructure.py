@@ -2,16 +2,48 @@
 import pandas as pd
 import numpy as np
 
+def rolling_zscore(values: pd.Series, window: int) -> pd.Series:
+    """
+    (x - rolling mean) / rolling std over `window` bars in one pass
+    
+    Integer series (tick volume) use exact int64 cumulative sums of x and x^2,
+    so mean and variance come from the same pass; other dtypes, or integers
+    large enough to overflow, fall back to pandas rolling.
+    """
+    x = values.to_numpy()
+    n = len(x)
+    if n < window or not np.issubdtype(x.dtype, np.integer) or \
+            float(np.abs(x).max()) ** 2 * max(n, window * window) >= 2.0 ** 62:
+        rolling = values.rolling(window)
+        return (values - rolling.mean()) / rolling.std()
+    
+    x = x.astype(np.int64)
+    s1 = np.concatenate([[0], np.cumsum(x)])
+    s2 = np.concatenate([[0], np.cumsum(x * x)])
+    sum1 = s1[window:] - s1[:-window]
+    sum2 = s2[window:] - s2[:-window]
+    
+    mean = sum1 / window
+    var = (window * sum2 - sum1 * sum1) / (window * (window - 1.0))
+    zscore = np.full(n, np.nan)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        zscore[window - 1:] = (x[window - 1:] - mean) / np.sqrt(var)
+    return pd.Series(zscore, index=values.index)
+
+def volume_column(df: pd.DataFrame):
+    """Tick volume column name (None if the data has no tick volume)"""
+    for col in ('tick_volume', 'tickvolume'):
+        if col in df.columns:
+            return col
+    return None
+
 def add_microstructure_features(df: pd.DataFrame, config: dict) -> pd.DataFrame:
     """Add microstructure features"""
     # Tick volume z-score
-    if 'tick_volume' in df.columns or 'tickvolume' in df.columns:
-        vol_col = 'tick_volume' if 'tick_volume' in df.columns else 'tickvolume'
+    vol_col = volume_column(df)
+    if vol_col is not None:
         window = config.get('tick_volume_zscore_window', 20)
-        df['tick_volume_zscore'] = (
-            (df[vol_col] - df[vol_col].rolling(window).mean()) / 
-            df[vol_col].rolling(window).std()
-        )
+        df['tick_volume_zscore'] = rolling_zscore(df[vol_col], window)
     
     # Spread proxy
     if config.get('spread_proxy', True):
@@ -0,0 +1,165 @@
+"""
+Multi-timeframe features (M15/H1/H4 context on M5 bars)
+
+The base bars are resampled once per higher timeframe and the return,
+volatility and trend features are computed on the resampled bars. Each M5
+bar only sees higher-timeframe bars that had closed by its own close: a
+bar starting at t0 with period P is complete once the base bar starting at
+t0 + P - base has closed, so it is joined to base bars from that one on.
+
+`MultiTimeframeFeatures` keeps the still-open higher-timeframe bars and the
+indicator state of each timeframe, so the same object both builds the full
+history and extends it as new M5 bars arrive.
+"""
+from pathlib import Path
+from typing import List
+
+import joblib
+import numpy as np
+import pandas as pd
+from loguru import logger
+
+from aurum_edge.core.timeutils import resample_ohlc
+from aurum_edge.features.build import build_feature_graph
+from aurum_edge.features.incremental import IncrementalFeatureBuilder
+
+TIMEFRAME_MINUTES = {'M1': 1, 'M5': 5, 'M15': 15, 'M30': 30, 'H1': 60, 'H4': 240, 'D1': 1440}
+OHLC = ['open', 'high', 'low', 'close']
+
+# Base features that are not carried to higher timeframes
+_EXCLUDED = {'tr', 'range_atr_ratio'}
+
+
+def timeframe_delta(timeframe: str) -> pd.Timedelta:
+    """Bar length of an MT5 timeframe name (e.g. 'H1')"""
+    if timeframe not in TIMEFRAME_MINUTES:
+        raise ValueError(f"Unknown timeframe: {timeframe} (expected one of {list(TIMEFRAME_MINUTES)})")
+    return pd.Timedelta(minutes=TIMEFRAME_MINUTES[timeframe])
+
+
+def _htf_config(config: dict) -> dict:
+    """Feature config for higher-timeframe bars (returns, volatility, trend only)"""
+    return {**config, 'session_splits': False, 'spread_proxy': False, 'higher_timeframes': []}
+
+
+def higher_timeframe_columns(config: dict) -> List[str]:
+    """Features computed on each higher timeframe (without the timeframe prefix)"""
+    graph = build_feature_graph(_htf_config(config), has_volume=False)
+    return [col for col in graph.columns if col not in _EXCLUDED]
+
+
+class MultiTimeframeFeatures:
+    """Higher-timeframe features joined to base bars using only closed bars"""
+
+    def __init__(self, config: dict, dtype: np.dtype = np.float64):
+        """
+        Args:
+            config: Feature configuration. Uses `higher_timeframes` (e.g.
+                ['M15', 'H1', 'H4']) and `base_timeframe` (default 'M5').
+            dtype: Float type of the output columns (np.float32 under the
+                compact dtype policy, see core.memory)
+        """
+        self.config = dict(config)
+        self.dtype = np.dtype(dtype)
+        self.timeframes = list(config.get('higher_timeframes', []))
+        self.base = timeframe_delta(config.get('base_timeframe', 'M5'))
+        self.periods = {tf: timeframe_delta(tf) for tf in self.timeframes}
+        for tf, period in self.periods.items():
+            if period <= self.base or period % self.base:
+                raise ValueError(f"{tf} is not a multiple of the base timeframe")
+
+        self.columns = higher_timeframe_columns(config)
+        self.builders = {tf: IncrementalFeatureBuilder(_htf_config(config)) for tf in self.timeframes}
+        self.last_row = {tf: np.full(len(self.columns), np.nan) for tf in self.timeframes}
+        self.pending = pd.DataFrame(columns=OHLC, dtype=np.float64)
+        self.last_timestamp = None
+
+    @property
+    def feature_names(self) -> List[str]:
+        """Output columns, e.g. 'h1_ema_21'"""
+        return [f'{tf.lower()}_{col}' for tf in self.timeframes for col in self.columns]
+
+    def update(self, new_bars: pd.DataFrame) -> pd.DataFrame:
+        """
+        Higher-timeframe features for base bars appended after the last update
+
+        Args:
+            new_bars: Base OHLC bars strictly after `last_timestamp`
+
+        Returns:
+            DataFrame indexed like `new_bars` with one column per feature and
+            timeframe (NaN until a first higher-timeframe bar has closed)
+        """
+        if len(new_bars) == 0 or not self.timeframes:
+            return pd.DataFrame(index=new_bars.index)
+        if self.last_timestamp is not None and new_bars.index[0] <= self.last_timestamp:
+            raise ValueError(f"New bars must start after {self.last_timestamp}, got {new_bars.index[0]}")
+
+        bars = pd.concat([self.pending, new_bars[OHLC]]) if len(self.pending) else new_bars[OHLC]
+        last_time = new_bars.index[-1]
+        keep_from = last_time + self.base
+        n_cols = len(self.columns)
+        output = np.empty((len(new_bars), n_cols * len(self.timeframes)), dtype=self.dtype)
+
+        for k, tf in enumerate(self.timeframes):
+            period = self.periods[tf]
+            builder = self.builders[tf]
+
+            htf = resample_ohlc(bars, f'{int(period.total_seconds() // 60)}min')
+            available = htf.index + period - self.base
+            final = available <= last_time
+            if builder.last_timestamp is not None:
+                final &= htf.index > builder.last_timestamp
+
+            # Features of the newly closed bars, indexed by the time they become available
+            closed = htf[final]
+            features = builder.update(closed)[self.columns].to_numpy() if len(closed) else \
+                np.empty((0, len(self.columns)))
+            values = np.vstack([self.last_row[tf][None, :], features]).astype(self.dtype, copy=False)
+            positions = available[final].searchsorted(new_bars.index, side='right')
+            np.take(values, positions, axis=0, out=output[:, k * n_cols:(k + 1) * n_cols], mode='clip')
+            self.last_row[tf] = values[-1]
+
+            still_open = htf.index[available > last_time]
+            if len(still_open):
+                keep_from = min(keep_from, still_open[0])
+
+        # Only base bars of higher-timeframe bars that have not closed yet are kept
+        self.pending = bars[bars.index >= keep_from]
+        self.last_timestamp = last_time
+
+        # One preallocated block for every timeframe (no per-column copies)
+        return pd.DataFrame(output, index=new_bars.index, columns=self.feature_names, copy=False)
+
+    def save(self, path: str):
+        """Persist the multi-timeframe state"""
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        joblib.dump(self, path)
+        logger.info(f"Saved multi-timeframe state to: {path}")
+
+    @classmethod
+    def load(cls, path: str) -> 'MultiTimeframeFeatures':
+        """Load a persisted multi-timeframe state"""
+        state = joblib.load(path)
+        logger.info(f"Loaded multi-timeframe state from: {path} (last bar {state.last_timestamp})")
+        return state
+
+
+def add_multi_timeframe_features(df: pd.DataFrame, config: dict) -> pd.DataFrame:
+    """
+    Add higher-timeframe features to base bars
+
+    Args:
+        df: Base bars with OHLC (datetime index)
+        config: Feature configuration with `higher_timeframes`
+
+    Returns:
+        DataFrame with the higher-timeframe columns added
+    """
+    if not config.get('higher_timeframes'):
+        return df
+
+    mtf = MultiTimeframeFeatures(config)
+    features = mtf.update(df)
+    logger.info(f"Multi-timeframe features: {len(features.columns)} columns for {mtf.timeframes}")
+    return pd.concat([df, features], axis=1)
@@ -1,13 +1,19 @@
 """Return-based features"""
+import numpy as np
 import pandas as pd
 
+def log_return(close: pd.Series, period: int) -> pd.Series:
+    """log(close / close.shift(period)), 0 where the ratio is undefined or not positive"""
+    shifted = close.shift(period)
+    ratio = close / shifted
+    valid = (shifted > 0) & (ratio > 0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        values = np.where(valid, np.log(ratio.where(valid, 1.0)), 0.0)
+    return pd.Series(values, index=close.index)
+
 def add_return_features(df: pd.DataFrame, periods: list) -> pd.DataFrame:
     """Add return features for given periods"""
     for period in periods:
         df[f'return_{period}'] = df['close'].pct_change(period)
-        df[f'log_return_{period}'] = pd.Series(index=df.index, data=0.0)
-        mask = df['close'].shift(period) > 0
-        df.loc[mask, f'log_return_{period}'] = (
-            (df['close'] / df['close'].shift(period)).apply(lambda x: pd.Series.log(x) if x > 0 else 0)
-        )
+        df[f'log_return_{period}'] = log_return(df['close'], period)
     return df
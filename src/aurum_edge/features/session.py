@@ -1,12 +1,25 @@
 """Session-based features"""
+import numpy as np
 import pandas as pd
 
+# Session -> [start, end) hour (UTC)
+SESSION_HOURS = {
+    'asian': (0, 8),
+    'london': (8, 13),
+    'newyork': (13, 21)
+}
+
+def session_flags(index: pd.DatetimeIndex) -> dict:
+    """Session indicator arrays (int8) by column name"""
+    hour = index.hour
+    return {
+        f'session_{name}': ((hour >= start) & (hour < end)).astype(np.int8)
+        for name, (start, end) in SESSION_HOURS.items()
+    }
+
 def add_session_features(df: pd.DataFrame) -> pd.DataFrame:
     """Add session indicators"""
-    hour = df.index.hour
-    
-    df['session_asian'] = ((hour >= 0) & (hour < 8)).astype(int)
-    df['session_london'] = ((hour >= 8) & (hour < 13)).astype(int)
-    df['session_newyork'] = ((hour >= 13) & (hour < 21)).astype(int)
+    for name, values in session_flags(df.index).items():
+        df[name] = values
     
     return df
@@ -0,0 +1,220 @@
+"""
+Streaming (bar-by-bar) feature calculator for live/paper inference
+
+`FeatureState` holds the running state of every indicator in
+`build_all_features` and turns each closed bar into the feature vector the
+batch builder would produce for it, in constant memory (ring buffers sized
+by the longest window) and without any DataFrame work on the hot path.
+"""
+import math
+from collections import deque
+from typing import List, Optional
+
+import numpy as np
+import pandas as pd
+
+from aurum_edge.features.incremental import ATR_WINDOW, MACD_SPANS
+from aurum_edge.features.session import SESSION_HOURS
+
+NAN = float('nan')
+
+
+class _RollingWindow:
+    """Fixed-size window with running mean/variance (pandas rolling semantics, min_periods=size)"""
+
+    __slots__ = ('size', 'values', 'pos', 'nobs', 'mean', 'm2')
+
+    def __init__(self, size: int):
+        self.size = size
+        self.values = [NAN] * size
+        self.pos = 0
+        self.nobs = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+
+    def push(self, x: float):
+        old = self.values[self.pos]
+        self.values[self.pos] = x
+        self.pos = (self.pos + 1) % self.size
+
+        if old == old:  # not NaN: leaves the window
+            self.nobs -= 1
+            if self.nobs:
+                delta = old - self.mean
+                self.mean -= delta / self.nobs
+                self.m2 -= delta * (old - self.mean)
+            else:
+                self.mean = self.m2 = 0.0
+        if x == x:
+            self.nobs += 1
+            delta = x - self.mean
+            self.mean += delta / self.nobs
+            self.m2 += delta * (x - self.mean)
+
+    def get_mean(self) -> float:
+        return self.mean if self.nobs >= self.size else NAN
+
+    def get_std(self) -> float:
+        if self.nobs < self.size or self.nobs < 2:
+            return NAN
+        return math.sqrt(max(self.m2, 0.0) / (self.nobs - 1))
+
+
+class _Ewm:
+    """Adjusted EWM (pandas `ewm(span=span).mean()`) as a running num/den pair"""
+
+    __slots__ = ('beta', 'num', 'den')
+
+    def __init__(self, span: int):
+        self.beta = 1.0 - 2.0 / (span + 1.0)
+        self.num = 0.0
+        self.den = 0.0
+
+    def push(self, x: float) -> float:
+        self.num = x + self.beta * self.num
+        self.den = 1.0 + self.beta * self.den
+        return self.num / self.den
+
+
+def _divide(a: float, b: float) -> float:
+    """a / b with numpy semantics (inf/NaN instead of ZeroDivisionError)"""
+    if b == 0.0:
+        return NAN if a == 0.0 or a != a else math.copysign(math.inf, a)
+    return a / b
+
+
+class FeatureState:
+    """Online version of build_all_features: one closed bar in, one feature vector out"""
+
+    def __init__(self, config: dict, volume: bool = True):
+        """
+        Args:
+            config: Feature configuration (same keys as build_all_features)
+            volume: Bars carry tick volume (enables tick_volume_zscore)
+        """
+        self.returns_periods = list(config.get('returns_periods', [1, 3, 5]))
+        self.volatility_windows = list(config.get('volatility_windows', [10, 20]))
+        self.ema_periods = list(config.get('ema_periods', [9, 21, 50]))
+        self.session_splits = config.get('session_splits', True)
+        self.spread_proxy = config.get('spread_proxy', True)
+        self.volume = volume
+
+        self.closes = deque(maxlen=max(self.returns_periods, default=0) + 1)
+        self.atr = _RollingWindow(ATR_WINDOW)
+        self.volatility = [_RollingWindow(w) for w in self.volatility_windows]
+        self.emas = [_Ewm(p) for p in self.ema_periods]
+        self.macd_fast = _Ewm(MACD_SPANS['fast'])
+        self.macd_slow = _Ewm(MACD_SPANS['slow'])
+        self.macd_signal = _Ewm(MACD_SPANS['signal'])
+        self.volume_window = _RollingWindow(config.get('tick_volume_zscore_window', 20))
+        self.prev_close = NAN
+        self.last_timestamp = None
+
+    @property
+    def feature_names(self) -> List[str]:
+        """Names of the entries of each feature vector (batch column order)"""
+        names = []
+        for period in self.returns_periods:
+            names += [f'return_{period}', f'log_return_{period}']
+        names += ['tr', 'atr_14'] + [f'volatility_{w}' for w in self.volatility_windows]
+        names += [f'ema_{p}' for p in self.ema_periods] + ['macd', 'macd_signal', 'macd_hist']
+        if self.session_splits:
+            names += [f'session_{name}' for name in SESSION_HOURS]
+        if self.volume:
+            names.append('tick_volume_zscore')
+        if self.spread_proxy:
+            names.append('spread_proxy')
+        names.append('range_atr_ratio')
+        return names
+
+    def update(
+        self,
+        timestamp: pd.Timestamp,
+        high: float,
+        low: float,
+        close: float,
+        tick_volume: Optional[float] = None
+    ) -> np.ndarray:
+        """
+        Consume one closed bar
+
+        Args:
+            timestamp: Bar open time (session features use its hour)
+            high: Bar high
+            low: Bar low
+            close: Bar close
+            tick_volume: Bar tick volume (required when volume=True)
+
+        Returns:
+            Feature vector ordered as `feature_names`
+        """
+        out = []
+        closes = self.closes
+        closes.append(close)
+
+        # Returns
+        for period in self.returns_periods:
+            if len(closes) > period:
+                past = closes[-1 - period]
+                ratio = _divide(close, past)
+                out.append(ratio - 1.0)
+                out.append(math.log(ratio) if past > 0 and ratio > 0 else 0.0)
+            else:
+                out.append(NAN)
+                out.append(0.0)
+
+        # Volatility (TR/ATR, rolling std of 1-bar returns)
+        prev_close = self.prev_close
+        tr = max(high - low, abs(high - prev_close), abs(low - prev_close)) if prev_close == prev_close else NAN
+        self.atr.push(tr)
+        atr = self.atr.get_mean()
+        out.append(tr)
+        out.append(atr)
+        ret_1 = _divide(close, prev_close) - 1.0 if prev_close == prev_close else NAN
+        for window in self.volatility:
+            window.push(ret_1)
+            out.append(window.get_std())
+
+        # Trend
+        for ema in self.emas:
+            out.append(ema.push(close))
+        macd = self.macd_fast.push(close) - self.macd_slow.push(close)
+        signal = self.macd_signal.push(macd)
+        out += [macd, signal, macd - signal]
+
+        # Session
+        if self.session_splits:
+            hour = timestamp.hour
+            out += [float(start <= hour < end) for start, end in SESSION_HOURS.values()]
+
+        # Microstructure
+        if self.volume:
+            self.volume_window.push(float(tick_volume))
+            out.append(_divide(tick_volume - self.volume_window.get_mean(), self.volume_window.get_std()))
+        if self.spread_proxy:
+            out.append(_divide(high - low, close))
+        out.append((high - low) / (atr + 1e-8))
+
+        self.prev_close = close
+        self.last_timestamp = timestamp
+        return np.array(out)
+
+    def warm_up(self, df: pd.DataFrame, volume_col: str = 'tickvolume') -> np.ndarray:
+        """
+        Feed historical bars (e.g. the last few hundred before going live)
+
+        Args:
+            df: Bars with high, low, close (and `volume_col` when volume=True)
+            volume_col: Tick volume column name
+
+        Returns:
+            Feature vector of the last bar
+        """
+        volumes = df[volume_col].to_numpy(dtype=np.float64) if self.volume else [None] * len(df)
+        features = np.full(len(self.feature_names), np.nan)
+        for timestamp, high, low, close, tick_volume in zip(
+            df.index, df['high'].to_numpy(dtype=np.float64), df['low'].to_numpy(dtype=np.float64),
+            df['close'].to_numpy(dtype=np.float64), volumes
+        ):
+            features = self.update(timestamp, high, low, close, tick_volume)
+        return features
@@ -1,14 +1,27 @@
 """Trend indicators"""
+from typing import Dict
+
 import pandas as pd
 
+MACD_FAST, MACD_SLOW, MACD_SIGNAL = 12, 26, 9
+
+def macd_lines(ema_fast: pd.Series, ema_slow: pd.Series) -> Dict[str, pd.Series]:
+    """MACD, signal and histogram from the fast/slow EMAs of close"""
+    macd = ema_fast - ema_slow
+    signal = macd.ewm(span=MACD_SIGNAL).mean()
+    return {'macd': macd, 'macd_signal': signal, 'macd_hist': macd - signal}
+
 def add_trend_features(df: pd.DataFrame, ema_periods: list) -> pd.DataFrame:
     """Add trend features"""
+    # Each span is computed once, MACD reuses ema_12/ema_26 when requested
+    spans = sorted(set(ema_periods) | {MACD_FAST, MACD_SLOW})
+    emas = {span: df['close'].ewm(span=span).mean() for span in spans}
+    
     for period in ema_periods:
-        df[f'ema_{period}'] = df['close'].ewm(span=period).mean()
+        df[f'ema_{period}'] = emas[period]
     
     # MACD
-    df['macd'] = df['close'].ewm(span=12).mean() - df['close'].ewm(span=26).mean()
-    df['macd_signal'] = df['macd'].ewm(span=9).mean()
-    df['macd_hist'] = df['macd'] - df['macd_signal']
+    for col, values in macd_lines(emas[MACD_FAST], emas[MACD_SLOW]).items():
+        df[col] = values
     
     return df
@@ -2,20 +2,26 @@
 import pandas as pd
 import numpy as np
 
-def add_volatility_features(df: pd.DataFrame, windows: list) -> pd.DataFrame:
-    """Add volatility features"""
-    # ATR
-    df['tr'] = np.maximum(
-        df['high'] - df['low'],
+def true_range(high: pd.Series, low: pd.Series, close: pd.Series) -> pd.Series:
+    """True range (NaN on the first bar, which has no previous close)"""
+    prev_close = close.shift(1)
+    return np.maximum(
+        high - low,
         np.maximum(
-            abs(df['high'] - df['close'].shift(1)),
-            abs(df['low'] - df['close'].shift(1))
+            abs(high - prev_close),
+            abs(low - prev_close)
         )
     )
+
+def add_volatility_features(df: pd.DataFrame, windows: list) -> pd.DataFrame:
+    """Add volatility features"""
+    # ATR
+    df['tr'] = true_range(df['high'], df['low'], df['close'])
     df['atr_14'] = df['tr'].rolling(14).mean()
     
-    # Rolling volatility
+    # Rolling volatility (1-bar returns computed once for all windows)
+    returns = df['close'].pct_change()
     for window in windows:
-        df[f'volatility_{window}'] = df['close'].pct_change().rolling(window).std()
+        df[f'volatility_{window}'] = returns.rolling(window).std()
     
     return df
@@ -1,77 +1,374 @@
 """
 Triple Barrier Labeling Method
 """
+import warnings
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
 import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from numpy.lib.stride_tricks import sliding_window_view
 from loguru import logger
 
+from aurum_edge.data.store import iter_partitioned
+
+
+# Barrier codes used in the 'barrier_hit' column
+BARRIER_TYPES = ['tp', 'sl', 'time']
+
+# Columns added by the labeler (targets/outcomes, never model features)
+LABEL_COLUMNS = ['label', 't1', 'barrier_hit', 'barrier_return', 'label_short']
+
+
+def _first_hit(hits: np.ndarray) -> np.ndarray:
+    """Offset (1-based) of the first True in each row, 0 if the row has none"""
+    first = hits.argmax(axis=1) + 1
+    first[~hits.any(axis=1)] = 0
+    return first
+
+
+def _resolve(win_first: np.ndarray, loss_first: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Which barrier decides the trade: win only if strictly earlier (ties resolve to loss)"""
+    win_hit = win_first > 0
+    loss_hit = loss_first > 0
+    is_win = win_hit & (~loss_hit | (win_first < loss_first))
+    is_loss = loss_hit & ~is_win
+    return is_win, is_loss
+
+
+def triple_barrier_events(
+    close: np.ndarray,
+    high: np.ndarray,
+    low: np.ndarray,
+    atr: np.ndarray,
+    tp_multiplier: float = 2.0,
+    sl_multiplier: float = 1.0,
+    time_bars: int = 12,
+    chunk_size: int = 500_000,
+    include_short: bool = True
+) -> Dict[str, np.ndarray]:
+    """
+    Vectorized triple barrier over raw arrays
+
+    Uses a sliding-window view over high/low (no copy) and finds the first
+    TP/SL touch per bar with argmax. Bars are processed in blocks of
+    `chunk_size` so the boolean hit matrices stay bounded in memory. The
+    long and the mirrored short barriers are resolved in the same pass.
+
+    Args:
+        close: Close prices
+        high: High prices
+        low: Low prices
+        atr: ATR values
+        tp_multiplier: Take profit as multiple of ATR
+        sl_multiplier: Stop loss as multiple of ATR
+        time_bars: Maximum holding period in bars
+        chunk_size: Bars evaluated per block
+        include_short: Also resolve the short-side barriers
+
+    Returns:
+        Dict of per-bar arrays:
+            label: 1 (TP first), 0 (SL first or same bar), -1 (time barrier /
+                no ATR / not enough future bars)
+            hit_offset: bars after entry at which the deciding TP/SL barrier was
+                touched (0 when none was touched)
+            exit_offset: bars after entry at which the trade exits, including
+                the time barrier (0 when the bar cannot be labeled)
+            barrier: index into BARRIER_TYPES (-1 when the bar cannot be labeled)
+            barrier_return: long return at exit, barrier price for TP/SL and
+                close for the time barrier (NaN when the bar cannot be labeled)
+            label_short: same as label for a short entry (TP below, SL above)
+    """
+    close = np.asarray(close, dtype=np.float64)
+    high = np.asarray(high, dtype=np.float64)
+    low = np.asarray(low, dtype=np.float64)
+    atr = np.asarray(atr, dtype=np.float64)
+
+    n = len(close)
+    events = {
+        'label': np.full(n, -1, dtype=np.int8),
+        'hit_offset': np.zeros(n, dtype=np.int32),
+        'exit_offset': np.zeros(n, dtype=np.int32),
+        'barrier': np.full(n, -1, dtype=np.int8),
+        'barrier_return': np.full(n, np.nan),
+        'label_short': np.full(n, -1, dtype=np.int8)
+    }
+
+    n_windows = n - time_bars
+    if time_bars < 1 or n_windows <= 0:
+        return events
+
+    # Row i of each view holds bars i+1 .. i+time_bars
+    high_windows = sliding_window_view(high[1:], time_bars)
+    low_windows = sliding_window_view(low[1:], time_bars)
+
+    for start in range(0, n_windows, chunk_size):
+        end = min(start + chunk_size, n_windows)
+
+        entry = close[start:end]
+        atr_chunk = atr[start:end]
+        valid = ~np.isnan(atr_chunk) & (atr_chunk != 0)
+
+        tp_price = entry + tp_multiplier * atr_chunk
+        sl_price = entry - sl_multiplier * atr_chunk
+
+        tp_first = _first_hit(high_windows[start:end] >= tp_price[:, None])
+        sl_first = _first_hit(low_windows[start:end] <= sl_price[:, None])
+        is_tp, is_sl = _resolve(tp_first, sl_first)
+        is_time = valid & ~is_tp & ~is_sl
+        is_tp &= valid
+        is_sl &= valid
+
+        labels = np.full(end - start, -1, dtype=np.int8)
+        labels[is_tp] = 1
+        labels[is_sl] = 0
+
+        hit_offset = np.where(is_tp, tp_first, np.where(is_sl, sl_first, 0))
+        exit_offset = np.where(is_time, time_bars, hit_offset)
+
+        barrier = np.full(end - start, -1, dtype=np.int8)
+        barrier[is_tp] = 0
+        barrier[is_sl] = 1
+        barrier[is_time] = 2
+
+        exit_price = np.full(end - start, np.nan)
+        exit_price[is_tp] = tp_price[is_tp]
+        exit_price[is_sl] = sl_price[is_sl]
+        exit_price[is_time] = close[start + time_bars:end + time_bars][is_time]
+
+        events['label'][start:end] = labels
+        events['hit_offset'][start:end] = hit_offset
+        events['exit_offset'][start:end] = exit_offset
+        events['barrier'][start:end] = barrier
+        events['barrier_return'][start:end] = exit_price / entry - 1
+
+        if include_short:
+            # Mirrored barriers: TP below entry (touched by lows), SL above (touched by highs)
+            short_tp, short_sl = _resolve(
+                _first_hit(low_windows[start:end] <= (entry - tp_multiplier * atr_chunk)[:, None]),
+                _first_hit(high_windows[start:end] >= (entry + sl_multiplier * atr_chunk)[:, None])
+            )
+            labels_short = np.full(end - start, -1, dtype=np.int8)
+            labels_short[short_tp & valid] = 1
+            labels_short[short_sl & valid] = 0
+            events['label_short'][start:end] = labels_short
+
+    return events
+
+
+def triple_barrier_labels(
+    close: np.ndarray,
+    high: np.ndarray,
+    low: np.ndarray,
+    atr: np.ndarray,
+    tp_multiplier: float = 2.0,
+    sl_multiplier: float = 1.0,
+    time_bars: int = 12,
+    chunk_size: int = 500_000
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Long-side labels and hit offsets only (see `triple_barrier_events`)
+
+    Returns:
+        (labels, hit_offsets)
+    """
+    events = triple_barrier_events(
+        close, high, low, atr,
+        tp_multiplier=tp_multiplier,
+        sl_multiplier=sl_multiplier,
+        time_bars=time_bars,
+        chunk_size=chunk_size,
+        include_short=False
+    )
+    return events['label'], events['hit_offset']
+
+
+def _labeled_frame(
+    df: pd.DataFrame,
+    events: Dict[str, np.ndarray],
+    n_rows: int,
+    handle_neutrals: str
+) -> pd.DataFrame:
+    """Rows [0, n_rows) of df with the label columns attached"""
+    labels = events['label'][:n_rows]
+
+    if handle_neutrals == 'drop':
+        keep = labels != -1
+    elif handle_neutrals == 'keep':
+        # Time-barrier rows stay (label -1); only unlabelable rows go
+        keep = events['barrier'][:n_rows] != -1
+    else:
+        raise ValueError(f"Unknown handle_neutrals: {handle_neutrals} (use 'drop' or 'keep')")
+
+    # take already returns a new frame: the label columns are set on it
+    # directly (assign or concat would copy every column once more). Frames
+    # downcast column by column have many blocks, hence the warning filter.
+    pos = np.flatnonzero(keep)
+    labeled = df.take(pos)
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', pd.errors.PerformanceWarning)
+        labeled['label'] = labels[pos]
+        labeled['t1'] = df.index[pos + events['exit_offset'][pos]]
+        labeled['barrier_hit'] = pd.Categorical.from_codes(events['barrier'][pos], categories=BARRIER_TYPES)
+        labeled['barrier_return'] = events['barrier_return'][pos]
+        labeled['label_short'] = events['label_short'][pos]
+    return labeled
+
+
 def apply_triple_barrier(
     df: pd.DataFrame,
     tp_multiplier: float = 2.0,
     sl_multiplier: float = 1.0,
     time_bars: int = 12,
-    atr_col: str = 'atr_14'
+    atr_col: str = 'atr_14',
+    handle_neutrals: str = 'drop'
 ) -> pd.DataFrame:
     """
     Apply triple barrier method for labeling
-    
+
     Args:
         df: DataFrame with OHLC and ATR
         tp_multiplier: Take profit as multiple of ATR
         sl_multiplier: Stop loss as multiple of ATR
         time_bars: Maximum holding period in bars
         atr_col: ATR column name
-    
+        handle_neutrals: 'drop' time-barrier rows or 'keep' them with label -1
+
     Returns:
-        DataFrame with 'label' column added
+        DataFrame with LABEL_COLUMNS added: 'label', 't1' (exit timestamp),
+        'barrier_hit' (tp/sl/time), 'barrier_return' (long return at exit)
+        and 'label_short'
     """
     logger.info(f"Applying triple barrier: TP={tp_multiplier}x ATR, SL={sl_multiplier}x ATR, Time={time_bars} bars")
-    
-    df = df.copy()
-    df['label'] = -1  # Default: neutral
-    
-    for i in range(len(df) - time_bars):
-        entry_price = df['close'].iloc[i]
-        atr = df[atr_col].iloc[i]
-        
-        if pd.isna(atr) or atr == 0:
-            continue
-        
-        tp_price = entry_price + (tp_multiplier * atr)
-        sl_price = entry_price - (sl_multiplier * atr)
-        
-        # Look forward up to time_bars
-        future_slice = df.iloc[i+1:i+1+time_bars]
-        
-        # Check which barrier hits first
-        tp_hit = (future_slice['high'] >= tp_price).idxmax() if (future_slice['high'] >= tp_price).any() else None
-        sl_hit = (future_slice['low'] <= sl_price).idxmax() if (future_slice['low'] <= sl_price).any() else None
-        
-        if tp_hit and sl_hit:
-            # Both hit - which came first?
-            tp_idx = future_slice.index.get_loc(tp_hit)
-            sl_idx = future_slice.index.get_loc(sl_hit)
-            
-            if tp_idx < sl_idx:
-                df.loc[df.index[i], 'label'] = 1  # TP hit first -> LONG
-            else:
-                df.loc[df.index[i], 'label'] = 0  # SL hit first -> SHORT/no-trade
-        elif tp_hit:
-            df.loc[df.index[i], 'label'] = 1
-        elif sl_hit:
-            df.loc[df.index[i], 'label'] = 0
-        # else: time barrier hit (neutral) - already -1
-    
+
+    events = triple_barrier_events(
+        df['close'].to_numpy(),
+        df['high'].to_numpy(),
+        df['low'].to_numpy(),
+        df[atr_col].to_numpy(),
+        tp_multiplier=tp_multiplier,
+        sl_multiplier=sl_multiplier,
+        time_bars=time_bars
+    )
+
     # Count labels
-    label_counts = df['label'].value_counts()
+    label_counts = pd.Series(events['label']).value_counts()
     logger.info(f"Label distribution: {label_counts.to_dict()}")
-    
+
     # Handle neutrals (MVP: drop them)
-    df_labeled = df[df['label'] != -1].copy()
-    logger.info(f"After removing neutrals: {len(df_labeled)} samples")
-    
+    df_labeled = _labeled_frame(df, events, len(df), handle_neutrals)
+    logger.info(f"After handling neutrals ({handle_neutrals}): {len(df_labeled)} samples")
+
     return df_labeled
 
+
+def apply_triple_barrier_chunked(
+    input_path: str,
+    output_path: str,
+    tp_multiplier: float = 2.0,
+    sl_multiplier: float = 1.0,
+    time_bars: int = 12,
+    atr_col: str = 'atr_14',
+    chunk_rows: int = 500_000,
+    handle_neutrals: str = 'drop',
+    symbol: Optional[str] = None,
+    timeframe: Optional[str] = None
+) -> int:
+    """
+    Apply triple barrier out-of-core, parquet to parquet
+
+    Reads `input_path` in batches of at most `chunk_rows` rows and writes
+    labeled rows incrementally to `output_path`. The last `time_bars` rows of
+    each chunk cannot be labeled yet (their forward window is in the next
+    chunk), so they are carried over and labeled together with it. Output is
+    identical to `apply_triple_barrier` on the full frame while peak memory is
+    bounded by the chunk size.
+
+    Args:
+        input_path: Features parquet (OHLC + ATR), or the root of a
+            partitioned features store (read month by month; needs
+            `symbol` and `timeframe`)
+        output_path: Labeled parquet to write
+        tp_multiplier: Take profit as multiple of ATR
+        sl_multiplier: Stop loss as multiple of ATR
+        time_bars: Maximum holding period in bars
+        atr_col: ATR column name
+        chunk_rows: Maximum rows read per batch
+        handle_neutrals: 'drop' time-barrier rows or 'keep' them with label -1
+        symbol: Symbol partition of a features store
+        timeframe: Timeframe partition of a features store
+
+    Returns:
+        Number of labeled samples written
+    """
+    logger.info(
+        f"Applying chunked triple barrier: TP={tp_multiplier}x ATR, SL={sl_multiplier}x ATR, "
+        f"Time={time_bars} bars, chunk={chunk_rows} rows"
+    )
+
+    if Path(input_path).is_dir():
+        batches = (
+            month.iloc[i:i + chunk_rows]
+            for month in iter_partitioned(input_path, symbol, timeframe)
+            for i in range(0, len(month), chunk_rows)
+        )
+    else:
+        batches = (batch.to_pandas() for batch in pq.ParquetFile(input_path).iter_batches(batch_size=chunk_rows))
+    Path(output_path).parent.mkdir(parents=True, exist_ok=True)
+
+    writer = None
+    carry = None
+    label_counts = {-1: 0, 0: 0, 1: 0}
+    samples = 0
+
+    try:
+        for chunk in batches:
+            if carry is not None and len(carry) > 0:
+                chunk = pd.concat([carry, chunk])
+
+            events = triple_barrier_events(
+                chunk['close'].to_numpy(),
+                chunk['high'].to_numpy(),
+                chunk['low'].to_numpy(),
+                chunk[atr_col].to_numpy(),
+                tp_multiplier=tp_multiplier,
+                sl_multiplier=sl_multiplier,
+                time_bars=time_bars
+            )
+
+            # Rows with a complete forward window are final, the rest wait for the next chunk
+            n_final = max(len(chunk) - time_bars, 0)
+            df_labeled = _labeled_frame(chunk, events, n_final, handle_neutrals)
+            carry = chunk.iloc[n_final:]
+
+            labels = events['label'][:n_final]
+            for label in label_counts:
+                label_counts[label] += int((labels == label).sum())
+
+            table = pa.Table.from_pandas(df_labeled, preserve_index=True)
+            if writer is None:
+                writer = pq.ParquetWriter(output_path, table.schema, compression='snappy')
+            if len(df_labeled) > 0:
+                writer.write_table(table.cast(writer.schema))
+                samples += len(df_labeled)
+
+            logger.debug(f"Chunk labeled: {n_final} rows final, {len(carry)} carried")
+    finally:
+        if writer is not None:
+            writer.close()
+
+    # Trailing rows never get a full forward window: neutral
+    if carry is not None:
+        label_counts[-1] += len(carry)
+
+    logger.info(f"Label distribution: {label_counts}")
+    logger.info(f"After handling neutrals ({handle_neutrals}): {samples} samples")
+    logger.info(f"Saved labeled data to: {output_path}")
+
+    return samples
+
 def balance_labels(df: pd.DataFrame, method: str = 'undersample') -> pd.DataFrame:
     """Balance class distribution"""
     label_counts = df['label'].value_counts()
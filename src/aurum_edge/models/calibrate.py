@@ -13,7 +13,8 @@ def calibrate_probabilities(y_true, y_pred_proba, method='isotonic'):
         method: 'isotonic' or 'sigmoid'
     
     Returns:
-        Calibrated probabilities
+        Calibrated probabilities and the fitted calibrator (None when
+        probabilities are passed through)
     """
     if method == 'isotonic':
         calibrator = IsotonicRegression(out_of_bounds='clip')
@@ -21,5 +22,6 @@ def calibrate_probabilities(y_true, y_pred_proba, method='isotonic'):
     else:
         # Placeholder for sigmoid calibration
         calibrated = y_pred_proba
+        calibrator = None
     
     return calibrated, calibrator
@@ -6,7 +6,9 @@ def should_promote_model(metrics: dict, thresholds: dict) -> bool:
     Determine if model should be promoted to production
     
     Args:
-        metrics: Model performance metrics
+        metrics: Model performance metrics (with the Monte Carlo summary
+            keys profit_factor_p5, max_drawdown_p5 and risk_of_ruin, their
+            gates apply too)
         thresholds: Minimum acceptable metrics
     
     Returns:
@@ -39,6 +41,25 @@ def should_promote_model(metrics: dict, thresholds: dict) -> bool:
     else:
         gates_failed.append(f"num_trades: {metrics.get('num_trades', 0)} < {thresholds.get('min_trades', 50)}")
     
+    # Robustness gates (Monte Carlo percentiles, only when simulated)
+    if 'profit_factor_p5' in metrics:
+        if metrics['profit_factor_p5'] >= thresholds.get('min_profit_factor_p5', 1.0):
+            gates_passed.append('profit_factor_p5')
+        else:
+            gates_failed.append(f"profit_factor_p5: {metrics['profit_factor_p5']:.2f} < {thresholds.get('min_profit_factor_p5', 1.0)}")
+    
+    if 'max_drawdown_p5' in metrics:
+        if metrics['max_drawdown_p5'] >= thresholds.get('max_drawdown_p5', -0.25):
+            gates_passed.append('max_drawdown_p5')
+        else:
+            gates_failed.append(f"max_drawdown_p5: {metrics['max_drawdown_p5']:.2%}")
+    
+    if 'risk_of_ruin' in metrics:
+        if metrics['risk_of_ruin'] <= thresholds.get('max_risk_of_ruin', 0.01):
+            gates_passed.append('risk_of_ruin')
+        else:
+            gates_failed.append(f"risk_of_ruin: {metrics['risk_of_ruin']:.2%} > {thresholds.get('max_risk_of_ruin', 0.01):.2%}")
+    
     passed = len(gates_failed) == 0
     
     if passed:
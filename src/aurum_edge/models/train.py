@@ -7,13 +7,42 @@ import numpy as np
 from sklearn.model_selection import train_test_split
 from loguru import logger
 
+from aurum_edge.labeling.triple_barrier import LABEL_COLUMNS
+
+# Time-barrier label (kept with labels.handle_neutrals: keep); no target for binary:logistic
+NEUTRAL_LABEL = -1
+
+def binary_rows(df: pd.DataFrame, label_col: str = 'label') -> pd.DataFrame:
+    """Rows with a binary target (TP first = 1, SL first = 0); neutral rows are dropped"""
+    neutral = df[label_col] == NEUTRAL_LABEL
+    if neutral.any():
+        logger.info(f"Dropping {int(neutral.sum())} neutral rows (label {NEUTRAL_LABEL}) before training")
+        return df[~neutral]
+    return df
+
+def get_feature_columns(df: pd.DataFrame) -> list:
+    """Model input columns: everything except labeler outputs and raw date/time"""
+    excluded = set(LABEL_COLUMNS) | {'date', 'time'}
+    return [c for c in df.columns if c not in excluded]
+
 def train_xgboost(
     X_train: pd.DataFrame,
     y_train: pd.Series,
     params: dict = None,
-    num_boost_round: int = 100
+    num_boost_round: int = 100,
+    xgb_model: xgb.Booster = None
 ) -> xgb.Booster:
-    """Train XGBoost model"""
+    """
+    Train XGBoost model
+    
+    Args:
+        X_train: Features
+        y_train: Labels (neutral rows, label -1, are dropped: the objective
+            is binary)
+        params: Booster parameters
+        num_boost_round: Boosting rounds (added on top of `xgb_model`)
+        xgb_model: Booster to continue from (warm start); its trees are kept
+    """
     if params is None:
         params = {
             'objective': 'binary:logistic',
@@ -23,10 +52,19 @@ def train_xgboost(
             'seed': 42
         }
     
+    binary = np.asarray(y_train) != NEUTRAL_LABEL
+    if not binary.all():
+        logger.warning(f"Dropping {int((~binary).sum())} neutral rows (label {NEUTRAL_LABEL}) from the training set")
+        X_train, y_train = X_train[binary], y_train[binary]
+    
     dtrain = xgb.DMatrix(X_train, label=y_train)
     
-    logger.info(f"Training XGBoost with {len(X_train)} samples...")
-    model = xgb.train(params, dtrain, num_boost_round=num_boost_round)
+    if xgb_model is None:
+        logger.info(f"Training XGBoost with {len(X_train)} samples...")
+    else:
+        logger.info(f"Training XGBoost with {len(X_train)} samples "
+                    f"(warm start from {xgb_model.num_boosted_rounds()} rounds)...")
+    model = xgb.train(params, dtrain, num_boost_round=num_boost_round, xgb_model=xgb_model)
     
     return model
 
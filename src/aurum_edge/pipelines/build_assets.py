@@ -0,0 +1,247 @@
+"""
+Pipeline: Build dataset -> features -> labels for many assets in parallel
+
+Every asset listed in `universe.assets` (configs/assets/*.yaml) runs the
+whole chain in its own worker process, with the same stage functions as the
+single-asset pipelines (build_dataset, build_features, build_labels). Bars
+and features are written to symbol/timeframe/month partitioned stores, labels
+to one labeled dataset per asset, and a per-asset report (rows, seconds per
+stage, peak memory of the worker) is saved to reports/.
+
+Usage:
+    python -m aurum_edge.pipelines.build_assets             # every asset
+    python -m aurum_edge.pipelines.build_assets NAS100 US30 # only these symbols
+"""
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List
+
+import pandas as pd
+import yaml
+from loguru import logger
+
+from aurum_edge.core.calendar import TradingCalendar
+from aurum_edge.core.config import Config
+from aurum_edge.core.logging import setup_logging
+from aurum_edge.core.memory import peak_rss_mb
+from aurum_edge.pipelines.build_dataset import csv_options, load_dataset, save_dataset
+from aurum_edge.pipelines.build_features import build_features
+from aurum_edge.pipelines.build_labels import build_labels
+
+
+def labels_path(labels_dir: str, symbol: str, timeframe: str) -> Path:
+    """Labeled dataset of one asset under the labels directory"""
+    return Path(labels_dir) / f"{symbol}_{timeframe}" / "labeled_dataset.parquet"
+
+
+def build_asset(
+    asset_config: dict,
+    paths: Dict[str, str],
+    feature_config: dict,
+    labeling_config: dict,
+    data_quality_config: dict = None,
+    memory_config: dict = None
+) -> Dict:
+    """
+    Run build_dataset -> build_features -> build_labels for one asset
+
+    Args:
+        asset_config: Asset config (configs/assets/<name>.yaml)
+        paths: data_raw, data_store, features_store, labels_dir
+        feature_config: Feature configuration
+        labeling_config: Labeling configuration (incl. processing.chunked)
+        data_quality_config: `data_quality` config for validation
+        memory_config: `memory` config (compact_dtypes)
+
+    Returns:
+        Report dict: symbol, timeframe, rows per stage, seconds per stage,
+        peak_rss_mb
+    """
+    symbol = asset_config['symbol']
+    timeframe = asset_config['timeframe']['name']
+    data_source = asset_config.get('data_source', {})
+    compact = (memory_config or {}).get('compact_dtypes', True)
+    report = {'symbol': symbol, 'timeframe': timeframe}
+
+    # Dataset
+    start = time.perf_counter()
+    pattern = data_source.get('filename_pattern', f"{symbol.lower()}_{timeframe.lower()}*.csv")
+    csv_files = sorted(Path(paths['data_raw']).glob(pattern))
+    if not csv_files:
+        raise FileNotFoundError(f"No CSV files matching {pattern} in {paths['data_raw']}")
+
+    csv_kwargs = csv_options(asset_config)
+    calendar = TradingCalendar.from_asset_config(asset_config) if 'specs' in asset_config else None
+    df, validation_passed = load_dataset(csv_files, csv_kwargs, data_quality_config or {}, calendar, n_jobs=1)
+    if not validation_passed:
+        logger.warning(f"{symbol}: validation failed but continuing")
+    df_clean = save_dataset(df, csv_files, paths['data_store'], symbol, timeframe, csv_kwargs)
+    del df
+    report['rows_dataset'] = len(df_clean)
+    report['seconds_dataset'] = time.perf_counter() - start
+
+    # Features
+    start = time.perf_counter()
+    df_features = build_features(df_clean, feature_config, paths['features_store'], symbol, timeframe,
+                                 compact=compact)
+    report['rows_features'] = len(df_features)
+    report['seconds_features'] = time.perf_counter() - start
+    del df_clean, df_features
+
+    # Labels (from the features store, chunked if so configured)
+    start = time.perf_counter()
+    report['rows_labels'] = build_labels(
+        paths['features_store'], labels_path(paths['labels_dir'], symbol, timeframe),
+        labeling_config, symbol, timeframe, compact=compact
+    )
+    report['seconds_labels'] = time.perf_counter() - start
+
+    report['peak_rss_mb'] = peak_rss_mb()
+    return report
+
+
+def _build_asset_safe(*args) -> Dict:
+    """build_asset that reports a failure instead of raising (one bad asset never stops the batch)"""
+    asset_config = args[0]
+    start = time.perf_counter()
+    try:
+        report = build_asset(*args)
+        report['status'] = 'ok'
+        report['error'] = None
+    except Exception as exc:
+        logger.exception(f"{asset_config.get('symbol')}: build failed")
+        report = {
+            'symbol': asset_config.get('symbol'),
+            'timeframe': asset_config.get('timeframe', {}).get('name'),
+            'status': 'failed',
+            'error': f"{type(exc).__name__}: {exc}",
+            'peak_rss_mb': peak_rss_mb()
+        }
+    report['seconds_total'] = time.perf_counter() - start
+    return report
+
+
+def run_assets(
+    asset_configs: List[dict],
+    paths: Dict[str, str],
+    feature_config: dict,
+    labeling_config: dict,
+    n_jobs: int = -1,
+    data_quality_config: dict = None,
+    memory_config: dict = None
+) -> pd.DataFrame:
+    """
+    Build every asset, one worker process per asset
+
+    Each worker runs a single asset (fresh process), so its peak memory is
+    that asset's alone.
+
+    Args:
+        asset_configs: Asset configs to build
+        paths: data_raw, data_store, features_store, labels_dir
+        feature_config: Feature configuration
+        labeling_config: Labeling configuration
+        n_jobs: Worker processes (-1 = all cores, 1 = in-process, serial)
+        data_quality_config: `data_quality` config for validation
+        memory_config: `memory` config (compact_dtypes)
+
+    Returns:
+        Per-asset report, one row per asset
+    """
+    if n_jobs == -1:
+        n_jobs = os.cpu_count() or 1
+    n_jobs = max(1, min(n_jobs, len(asset_configs)))
+
+    logger.info(f"Building {len(asset_configs)} assets with {n_jobs} workers")
+    start = time.perf_counter()
+    args = [(asset, paths, feature_config, labeling_config, data_quality_config, memory_config)
+            for asset in asset_configs]
+
+    if n_jobs == 1:
+        reports = [_build_asset_safe(*a) for a in args]
+    else:
+        with ProcessPoolExecutor(max_workers=n_jobs, max_tasks_per_child=1) as executor:
+            futures = [executor.submit(_build_asset_safe, *a) for a in args]
+            reports = []
+            for future in futures:
+                report = future.result()
+                logger.info(f"{report['symbol']}: {report['status']} in {report['seconds_total']:.1f}s")
+                reports.append(report)
+
+    wall = time.perf_counter() - start
+    columns = [
+        'symbol', 'timeframe', 'status',
+        'rows_dataset', 'rows_features', 'rows_labels',
+        'seconds_dataset', 'seconds_features', 'seconds_labels', 'seconds_total',
+        'peak_rss_mb', 'error'
+    ]
+    report = pd.DataFrame(reports).reindex(columns=columns)
+
+    serial = report['seconds_total'].sum()
+    logger.info(f"Built {(report['status'] == 'ok').sum()}/{len(report)} assets in {wall:.1f}s "
+                f"(sum of per-asset times {serial:.1f}s, {serial / max(wall, 1e-9):.1f}x)")
+    return report
+
+
+def main(symbols: List[str] = None):
+    """Main pipeline"""
+    # Setup
+    config = Config.from_yaml()
+    setup_logging(log_dir=config.paths.logs)
+
+    logger.info("=" * 60)
+    logger.info("PIPELINE: Build Assets (dataset -> features -> labels)")
+    logger.info("=" * 60)
+
+    universe = getattr(config, 'universe', {})
+    asset_configs = []
+    for path in universe.get('assets', [config.asset_config_path]):
+        with open(path, 'r') as f:
+            asset_configs.append(yaml.safe_load(f))
+    if symbols:
+        asset_configs = [a for a in asset_configs if a['symbol'] in symbols]
+    if not asset_configs:
+        logger.error(f"No assets to build (requested: {symbols})")
+        sys.exit(1)
+
+    paths = {
+        'data_raw': str(config.paths.data_raw),
+        'data_store': str(config.paths.data_store),
+        'features_store': str(Path(config.paths.data_features) / "store"),
+        'labels_dir': str(config.paths.data_labels)
+    }
+
+    report = run_assets(
+        asset_configs,
+        paths,
+        getattr(config, 'features', {}),
+        config.labeling_config,
+        n_jobs=universe.get('n_jobs', -1),
+        data_quality_config=getattr(config, 'data_quality', {}),
+        memory_config=getattr(config, 'memory', {})
+    )
+
+    # Save report
+    report_path = Path(config.paths.reports) / "assets" / "build_report.csv"
+    report_path.parent.mkdir(parents=True, exist_ok=True)
+    report.to_csv(report_path, index=False)
+
+    logger.info("=" * 60)
+    for row in report.itertuples():
+        if row.status == 'ok':
+            logger.info(f"  {row.symbol:<8} {int(row.rows_labels):>9} samples | dataset {row.seconds_dataset:6.1f}s | "
+                        f"features {row.seconds_features:6.1f}s | labels {row.seconds_labels:6.1f}s | "
+                        f"peak {row.peak_rss_mb:7.0f} MB")
+        else:
+            logger.error(f"  {row.symbol:<8} FAILED: {row.error}")
+    logger.info(f"Report: {report_path}")
+    logger.info("=" * 60)
+
+    if (report['status'] != 'ok').any():
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
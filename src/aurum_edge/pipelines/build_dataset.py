@@ -5,14 +5,110 @@ import sys
 from pathlib import Path
 from loguru import logger
 
+from aurum_edge.core.calendar import TradingCalendar
 from aurum_edge.core.config import Config
 from aurum_edge.core.logging import setup_logging
-from aurum_edge.data.ingest import load_mt5_csv, save_processed_data
+from aurum_edge.core.memory import MemoryReport
+from aurum_edge.data.incremental import (
+    build_manifest, load_manifest, manifest_path, read_new_bars, save_manifest
+)
+from aurum_edge.data.ingest import load_mt5_csvs
+from aurum_edge.data.store import save_partitioned
 from aurum_edge.data.validate import run_full_validation
 from aurum_edge.data.transform import clean_data
 
+def csv_options(asset_config):
+    """CSV parsing options of the asset's MT5 exports (`data_source.csv_format`)"""
+    csv_format = asset_config.get('data_source', {}).get('csv_format', {})
+    return {
+        'date_format': csv_format.get('date_format', '%Y.%m.%d'),
+        'time_format': csv_format.get('time_format', '%H:%M'),
+        'separator': csv_format.get('separator', ',')
+    }
+
+def load_dataset(csv_files, csv_kwargs, data_quality_config, calendar=None, n_jobs=4, memory=None):
+    """
+    Load and validate the raw exports
+    
+    Args:
+        csv_files: MT5 exports
+        csv_kwargs: CSV parsing options (csv_options)
+        data_quality_config: `data_quality` config
+        calendar: TradingCalendar of the asset
+        n_jobs: Files parsed concurrently
+        memory: MemoryReport to record the stage in
+    
+    Returns:
+        (bars, validation passed)
+    """
+    # Typed, parsed in parallel, merged and deduplicated
+    df = load_mt5_csvs(csv_files, n_jobs=n_jobs, **csv_kwargs)
+    if memory is not None:
+        memory.record('load', df)
+    
+    logger.info("Validating data quality...")
+    return df, run_full_validation(df, data_quality_config, calendar=calendar)
+
+def save_dataset(df, csv_files, output_path, symbol, timeframe, csv_kwargs, memory=None):
+    """
+    Clean the bars, store them and write the ingest manifest
+    
+    Returns:
+        Clean bars as stored
+    """
+    df_clean = clean_data(df)
+    if memory is not None:
+        memory.record('clean', df_clean)
+    
+    # Save (partitioned by symbol/timeframe/month)
+    save_partitioned(df_clean, str(output_path), symbol=symbol, timeframe=timeframe)
+    if memory is not None:
+        memory.record('save')
+    
+    # Remember what was ingested so the next run can be incremental
+    save_manifest(
+        build_manifest(csv_files, df.index[-1], **csv_kwargs),
+        manifest_path(str(output_path), symbol, timeframe)
+    )
+    return df_clean
+
+def run_incremental(csv_files, output_path, symbol, timeframe, manifest_file, csv_kwargs,
+                    data_quality_config=None, calendar=None):
+    """
+    Append only the bars added to the exports since the last build
+    
+    The new bars are validated with the same `data_quality` config and
+    calendar as a full build, except `min_rows`, which applies to the whole
+    dataset and not to the appended tail.
+    """
+    manifest = load_manifest(manifest_file)
+    new_bars, manifest = read_new_bars(csv_files, manifest, **csv_kwargs)
+    
+    if new_bars.empty:
+        logger.info("✓ Dataset up to date, nothing to append")
+        return
+    
+    # Validate and clean the new tail only (history was validated when stored)
+    logger.info("Validating new bars...")
+    if not run_full_validation(new_bars, {**(data_quality_config or {}), 'min_rows': 1}, calendar=calendar):
+        logger.warning("Validation failed but continuing (mode=incremental)")
+    
+    df_clean = clean_data(new_bars)
+    if df_clean.empty:
+        logger.warning(f"All {len(new_bars)} new bars were dropped by cleaning, nothing to append")
+        return
+    
+    save_partitioned(df_clean, str(output_path), symbol=symbol, timeframe=timeframe, append=True)
+    save_manifest(manifest, manifest_file)
+    
+    logger.info("=" * 60)
+    logger.info("✓ Incremental dataset update complete")
+    logger.info(f"Output: {output_path}")
+    logger.info(f"Appended rows: {len(df_clean)} ({df_clean.index[0]} to {df_clean.index[-1]})")
+    logger.info("=" * 60)
+
 def main(mode='build'):
-    """Main pipeline"""
+    """Main pipeline (modes: build, validate, incremental)"""
     # Setup
     config = Config.from_yaml()
     setup_logging(log_dir=config.paths.logs)
@@ -21,30 +117,38 @@ def main(mode='build'):
     logger.info("PIPELINE: Build Dataset")
     logger.info("=" * 60)
     
-    # Find CSV file
+    # Find CSV files (e.g. one export per month)
     raw_dir = Path(config.paths.data_raw)
-    csv_files = list(raw_dir.glob("*.csv"))
+    csv_files = sorted(raw_dir.glob("*.csv"))
     
     if not csv_files:
         logger.error(f"No CSV files found in {raw_dir}")
         logger.error("Please export data from MT5 and place in data/raw/")
         sys.exit(1)
     
-    csv_file = csv_files[0]
-    logger.info(f"Loading CSV: {csv_file}")
+    logger.info(f"Loading {len(csv_files)} CSV files from {raw_dir}")
     
-    # Load data
-    df = load_mt5_csv(str(csv_file))
-    
-    # Validate
     asset_config = config.asset_config
-    data_quality_config = config.load_sub_config('data_quality') if hasattr(config, 'data_quality') else {}
+    csv_kwargs = csv_options(asset_config)
     
-    logger.info("Validating data quality...")
-    validation_passed = run_full_validation(df, {
-        'min_rows': 1000,
-        'outlier_threshold': 5.0
-    })
+    output_path = Path(config.paths.data_store)
+    symbol = asset_config['symbol']
+    timeframe = asset_config['timeframe']['name']
+    manifest_file = manifest_path(str(output_path), symbol, timeframe)
+    data_quality_config = getattr(config, 'data_quality', {})
+    calendar = TradingCalendar.from_asset_config(asset_config)
+    
+    if mode == 'incremental':
+        if manifest_file.exists():
+            run_incremental(csv_files, output_path, symbol, timeframe, manifest_file, csv_kwargs,
+                            data_quality_config, calendar)
+            return
+        logger.warning(f"No ingest manifest at {manifest_file}, running a full build")
+        mode = 'build'
+    
+    # Load and validate
+    memory = MemoryReport('build_dataset')
+    df, validation_passed = load_dataset(csv_files, csv_kwargs, data_quality_config, calendar, memory=memory)
     
     if mode == 'validate':
         if validation_passed:
@@ -57,18 +161,18 @@ def main(mode='build'):
     if not validation_passed:
         logger.warning("Validation failed but continuing (mode=build)")
     
-    # Clean
-    df_clean = clean_data(df)
-    
-    # Save
-    output_path = Path(config.paths.data_processed) / "dataset_clean.parquet"
-    save_processed_data(df_clean, str(output_path))
+    # Clean, save and record the ingest manifest
+    df_clean = save_dataset(df, csv_files, output_path, symbol, timeframe, csv_kwargs, memory=memory)
     
     logger.info("=" * 60)
     logger.info("✓ Dataset build complete")
     logger.info(f"Output: {output_path}")
     logger.info(f"Rows: {len(df_clean)}")
     logger.info("=" * 60)
+    
+    if getattr(config, 'memory', {}).get('report', True):
+        memory.log()
+        memory.save(str(Path(config.paths.reports) / "memory"))
 
 if __name__ == "__main__":
     mode = sys.argv[1] if len(sys.argv) > 1 else 'build'
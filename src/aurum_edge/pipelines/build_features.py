@@ -3,15 +3,98 @@ Pipeline: Build features from clean dataset
 """
 import sys
 from pathlib import Path
+import numpy as np
+import pandas as pd
 from loguru import logger
 
 from aurum_edge.core.config import Config
 from aurum_edge.core.logging import setup_logging
-from aurum_edge.data.ingest import load_processed_data, save_processed_data
+from aurum_edge.core.memory import MemoryReport, compact_frame
+from aurum_edge.data.store import load_partitioned, save_partitioned
 from aurum_edge.features.build import build_all_features
+from aurum_edge.features.incremental import IncrementalFeatureBuilder
+from aurum_edge.features.multi_timeframe import MultiTimeframeFeatures
 
-def main():
-    """Main pipeline"""
+def build_features(df, feature_config, output_path, symbol, timeframe, compact=True,
+                   state_path=None, mtf_path=None, memory=None):
+    """
+    Full feature build of a bar frame into the features store
+    
+    Args:
+        df: Clean bars
+        feature_config: `features` config
+        output_path: Features store root
+        symbol: Asset symbol
+        timeframe: Timeframe name
+        compact: Apply the dtype policy (`memory.compact_dtypes`)
+        state_path: Where to save the incremental builder state (not saved if None)
+        mtf_path: Where to save the higher-timeframe state (not saved if None)
+        memory: MemoryReport to record the stages in
+    
+    Returns:
+        Features frame as stored
+    """
+    # Build features (dtype policy: float32 features, int8 flags, no scratch columns)
+    df_features = build_all_features(df, feature_config)
+    if memory is not None:
+        memory.record('features', df_features)
+    if compact:
+        df_features = compact_frame(df_features)
+        if memory is not None:
+            memory.record('compact', df_features)
+    
+    # Higher-timeframe context (closed M15/H1/H4 bars only)
+    if feature_config.get('higher_timeframes'):
+        mtf = MultiTimeframeFeatures(feature_config, dtype=np.float32 if compact else np.float64)
+        df_features = pd.concat([df_features, mtf.update(df)], axis=1)
+        if mtf_path is not None:
+            mtf.save(str(mtf_path))
+        if memory is not None:
+            memory.record('multi_timeframe', df_features)
+    
+    # Save (partitioned by symbol/timeframe/month, like the bars)
+    save_partitioned(df_features, str(output_path), symbol=symbol, timeframe=timeframe)
+    if memory is not None:
+        memory.record('save')
+    
+    # Indicator state at the last bar, for later incremental runs
+    if state_path is not None:
+        builder = IncrementalFeatureBuilder(feature_config)
+        builder.seed(df)
+        builder.save(str(state_path))
+    return df_features
+
+def run_incremental(builder, dataset_path, asset_config, output_path, state_path, mtf_path, compact=True):
+    """Append the features of the bars stored since the last run to the features store"""
+    symbol = asset_config['symbol']
+    timeframe = asset_config['timeframe']['name']
+    new_bars = load_partitioned(str(dataset_path), symbol=symbol, timeframe=timeframe, start=builder.last_timestamp)
+    new_bars = new_bars[new_bars.index > builder.last_timestamp]
+    
+    if new_bars.empty:
+        logger.info("✓ Features up to date, nothing to add")
+        return
+    
+    new_features = builder.update(new_bars)
+    if builder.config.get('higher_timeframes'):
+        mtf = MultiTimeframeFeatures.load(str(mtf_path))
+        new_features = pd.concat([new_features, mtf.update(new_bars)], axis=1)
+        mtf.save(str(mtf_path))
+    if compact:
+        new_features = compact_frame(new_features)
+    
+    # Only the new rows are written (new files next to the stored months)
+    save_partitioned(new_features, str(output_path), symbol=symbol, timeframe=timeframe, append=True)
+    builder.save(str(state_path))
+    
+    logger.info("=" * 60)
+    logger.info("✓ Features extended incrementally")
+    logger.info(f"Output: {output_path}")
+    logger.info(f"New rows: {len(new_features)} ({new_features.index[0]} to {new_features.index[-1]})")
+    logger.info("=" * 60)
+
+def main(mode='build'):
+    """Main pipeline (modes: build, incremental)"""
     # Setup
     config = Config.from_yaml()
     setup_logging(log_dir=config.paths.logs)
@@ -21,28 +104,54 @@ def main():
     logger.info("=" * 60)
     
     # Load clean dataset
-    dataset_path = Path(config.paths.data_processed) / "dataset_clean.parquet"
+    dataset_path = Path(config.paths.data_store)
+    asset_config = config.asset_config
     
     if not dataset_path.exists():
         logger.error(f"Dataset not found: {dataset_path}")
         logger.error("Run 'make build-dataset' first")
         sys.exit(1)
     
-    df = load_processed_data(str(dataset_path))
+    feature_config = getattr(config, 'features', {})
+    memory_config = getattr(config, 'memory', {})
+    compact = memory_config.get('compact_dtypes', True)
+    output_path = Path(config.paths.data_features) / "store"
+    state_path = Path(config.paths.data_features) / "feature_state.joblib"
+    mtf_path = Path(config.paths.data_features) / "mtf_state.joblib"
     
-    # Build features
-    feature_config = config.__dict__.get('features', {})
-    df_features = build_all_features(df, feature_config)
+    if mode == 'incremental':
+        if state_path.exists() and output_path.exists():
+            builder = IncrementalFeatureBuilder.load(str(state_path))
+            if builder.config == dict(feature_config):
+                run_incremental(builder, dataset_path, asset_config, output_path, state_path, mtf_path, compact)
+                return
+            logger.warning("Feature config changed since the last build, running a full build")
+        else:
+            logger.warning(f"No feature state at {state_path}, running a full build")
     
-    # Save
-    output_path = Path(config.paths.data_features) / "features.parquet"
-    save_processed_data(df_features, str(output_path))
+    memory = MemoryReport('build_features')
+    df = load_partitioned(
+        str(dataset_path),
+        symbol=asset_config['symbol'],
+        timeframe=asset_config['timeframe']['name']
+    )
+    memory.record('load', df)
+    
+    df_features = build_features(
+        df, feature_config, output_path, asset_config['symbol'], asset_config['timeframe']['name'],
+        compact=compact, state_path=state_path, mtf_path=mtf_path, memory=memory
+    )
     
     logger.info("=" * 60)
     logger.info("✓ Features built successfully")
     logger.info(f"Output: {output_path}")
     logger.info(f"Features: {len(df_features.columns)} columns")
     logger.info("=" * 60)
+    
+    if memory_config.get('report', True):
+        memory.log()
+        memory.save(str(Path(config.paths.reports) / "memory"))
 
 if __name__ == "__main__":
-    main()
+    mode = sys.argv[1] if len(sys.argv) > 1 else 'build'
+    main(mode)
@@ -1,5 +1,9 @@
 """
 Pipeline: Build labels using triple barrier
+
+Usage:
+    python -m aurum_edge.pipelines.build_labels        # labeled dataset
+    python -m aurum_edge.pipelines.build_labels grid   # TP/SL/time sweep (labeling `grid`)
 """
 import sys
 from pathlib import Path
@@ -7,10 +11,112 @@ from loguru import logger
 
 from aurum_edge.core.config import Config
 from aurum_edge.core.logging import setup_logging
-from aurum_edge.data.ingest import load_processed_data, save_processed_data
-from aurum_edge.labeling.triple_barrier import apply_triple_barrier
+from aurum_edge.core.memory import MemoryReport, compact_frame
+from aurum_edge.data.ingest import save_processed_data
+from aurum_edge.data.store import load_partitioned
+from aurum_edge.labeling.grid import make_barrier_grid, summarize_grid, triple_barrier_grid
+from aurum_edge.labeling.triple_barrier import (
+    apply_triple_barrier,
+    apply_triple_barrier_chunked,
+    balance_labels
+)
+
+def build_labels(features_path, output_path, labeling_config, symbol, timeframe, compact=True, memory=None):
+    """
+    Label a features store with the triple barrier
+    
+    Args:
+        features_path: Features store root (build_features)
+        output_path: Labeled dataset (parquet)
+        labeling_config: Labeling config (barriers, labels, processing)
+        symbol: Asset symbol
+        timeframe: Timeframe name
+        compact: Apply the dtype policy (`memory.compact_dtypes`)
+        memory: MemoryReport to record the stages in (in-memory mode)
+    
+    Returns:
+        Number of labeled samples
+    """
+    barriers = labeling_config.get('barriers', {})
+    processing = labeling_config.get('processing', {})
+    handle_neutrals = labeling_config.get('labels', {}).get('handle_neutrals', 'drop')
+    
+    # 'balance' drops neutrals first, then undersamples the majority class
+    balance = handle_neutrals == 'balance'
+    if balance:
+        handle_neutrals = 'drop'
+    
+    if processing.get('chunked', False):
+        # Out-of-core: stream the features store month by month -> labeled_dataset.parquet
+        num_samples = apply_triple_barrier_chunked(
+            str(features_path),
+            str(output_path),
+            tp_multiplier=barriers.get('tp_multiplier', 2.0),
+            sl_multiplier=barriers.get('sl_multiplier', 1.0),
+            time_bars=barriers.get('time_bars', 12),
+            atr_col='atr_14',
+            chunk_rows=processing.get('chunk_rows', 500000),
+            handle_neutrals=handle_neutrals,
+            symbol=symbol,
+            timeframe=timeframe
+        )
+        if balance:
+            logger.warning("handle_neutrals=balance is not applied in chunked mode")
+        return num_samples
+    
+    df = load_partitioned(str(features_path), symbol=symbol, timeframe=timeframe)
+    if memory is not None:
+        memory.record('load', df)
+    
+    # Apply triple barrier
+    df_labeled = apply_triple_barrier(
+        df,
+        tp_multiplier=barriers.get('tp_multiplier', 2.0),
+        sl_multiplier=barriers.get('sl_multiplier', 1.0),
+        time_bars=barriers.get('time_bars', 12),
+        atr_col='atr_14',
+        handle_neutrals=handle_neutrals
+    )
+    if balance:
+        df_labeled = balance_labels(df_labeled)
+    if compact:
+        df_labeled = compact_frame(df_labeled)
+    if memory is not None:
+        memory.record('labels', df_labeled)
+    
+    # Save
+    save_processed_data(df_labeled, str(output_path))
+    if memory is not None:
+        memory.record('save')
+    return len(df_labeled)
+
+def label_grid(features_path, grid_config, symbol, timeframe, atr_col='atr_14'):
+    """
+    Label balance of every barrier configuration of the labeling `grid`
+    
+    Args:
+        features_path: Features store root (build_features)
+        grid_config: Labeling `grid` section (tp_multipliers, sl_multipliers,
+            time_bars, n_jobs)
+        symbol: Asset symbol
+        timeframe: Timeframe name
+        atr_col: ATR column for the barriers
+    
+    Returns:
+        One row per config: tp_multiplier, sl_multiplier, time_bars and the
+        label counts / balance of summarize_grid
+    """
+    df = load_partitioned(str(features_path), symbol=symbol, timeframe=timeframe,
+                          columns=['close', 'high', 'low', atr_col])
+    configs = make_barrier_grid(
+        grid_config.get('tp_multipliers', [2.0]),
+        grid_config.get('sl_multipliers', [1.0]),
+        grid_config.get('time_bars', [12])
+    )
+    labels, configs_df = triple_barrier_grid(df, configs, atr_col=atr_col, n_jobs=grid_config.get('n_jobs', 1))
+    return summarize_grid(labels, configs_df)
 
-def main():
+def main(mode='build'):
     """Main pipeline"""
     # Setup
     config = Config.from_yaml()
@@ -20,38 +126,47 @@ def main():
     logger.info("PIPELINE: Build Labels")
     logger.info("=" * 60)
     
-    # Load features
-    features_path = Path(config.paths.data_features) / "features.parquet"
+    # Load features (partitioned store written by build_features)
+    features_path = Path(config.paths.data_features) / "store"
+    symbol = config.asset_config['symbol']
+    timeframe = config.asset_config['timeframe']['name']
     
     if not features_path.exists():
         logger.error(f"Features not found: {features_path}")
         logger.error("Run 'make build-features' first")
         sys.exit(1)
     
-    df = load_processed_data(str(features_path))
+    if mode == 'grid':
+        summary = label_grid(features_path, config.labeling_config.get('grid', {}), symbol, timeframe)
+        report_path = Path(config.paths.reports) / "labels" / "label_grid.csv"
+        report_path.parent.mkdir(parents=True, exist_ok=True)
+        summary.to_csv(report_path, index=False)
+        
+        logger.info("=" * 60)
+        logger.info(f"✓ Label grid: {len(summary)} configs")
+        logger.info(f"Report: {report_path}")
+        logger.info("=" * 60)
+        return
     
-    # Get labeling config
-    labeling_config = config.labeling_config
-    barriers = labeling_config.get('barriers', {})
+    output_path = Path(config.paths.data_labels) / "labeled_dataset.parquet"
+    memory_config = getattr(config, 'memory', {})
+    memory = MemoryReport('build_labels')
     
-    # Apply triple barrier
-    df_labeled = apply_triple_barrier(
-        df,
-        tp_multiplier=barriers.get('tp_multiplier', 2.0),
-        sl_multiplier=barriers.get('sl_multiplier', 1.0),
-        time_bars=barriers.get('time_bars', 12),
-        atr_col='atr_14'
+    num_samples = build_labels(
+        features_path, output_path, config.labeling_config, symbol, timeframe,
+        compact=memory_config.get('compact_dtypes', True), memory=memory
     )
     
-    # Save
-    output_path = Path(config.paths.data_labels) / "labeled_dataset.parquet"
-    save_processed_data(df_labeled, str(output_path))
-    
     logger.info("=" * 60)
     logger.info("✓ Labels built successfully")
     logger.info(f"Output: {output_path}")
-    logger.info(f"Samples: {len(df_labeled)}")
+    logger.info(f"Samples: {num_samples}")
     logger.info("=" * 60)
+    
+    if memory.stages and memory_config.get('report', True):
+        memory.log()
+        memory.save(str(Path(config.paths.reports) / "memory"))
 
 if __name__ == "__main__":
-    main()
+    mode = sys.argv[1] if len(sys.argv) > 1 else 'build'
+    main(mode)
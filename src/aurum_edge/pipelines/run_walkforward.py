@@ -1,17 +1,171 @@
 """
 Pipeline: Run walk-forward validation
+
+Usage:
+    python -m aurum_edge.pipelines.run_walkforward        # rolling walk-forward
+    python -m aurum_edge.pipelines.run_walkforward cpcv   # combinatorial purged CV
 """
 import sys
+import time
 from pathlib import Path
+import numpy as np
 import pandas as pd
+import xgboost as xgb
 from loguru import logger
 
+from aurum_edge.core.calendar import TradingCalendar
 from aurum_edge.core.config import Config
 from aurum_edge.core.logging import setup_logging
 from aurum_edge.data.ingest import load_processed_data
+from aurum_edge.data.store import load_partitioned
 from aurum_edge.backtest.walk_forward import run_walk_forward
+from aurum_edge.backtest.cpcv import run_cpcv
+from aurum_edge.backtest.costs import CostModel
+from aurum_edge.backtest.engine import VectorizedBacktestEngine
+from aurum_edge.backtest.metrics import aggregate_folds
+from aurum_edge.backtest.montecarlo import run_monte_carlo
+from aurum_edge.decision.signals import generate_signals
+from aurum_edge.models.calibrate import calibrate_probabilities
+from aurum_edge.models.gating import should_promote_model
+from aurum_edge.models.train import binary_rows, get_feature_columns, train_xgboost
+
+def xgboost_returns(train_df, test_df):
+    """Long the test samples the model scores above 0.5; return = barrier return"""
+    feature_cols = get_feature_columns(train_df)
+    model = train_xgboost(train_df[feature_cols].fillna(0), train_df['label'])
+    proba = model.predict(xgb.DMatrix(test_df[feature_cols].fillna(0)))
+    return (proba > 0.5) * test_df['barrier_return'].to_numpy()
+
+class WalkForwardModel:
+    """
+    Per-fold train -> calibrate -> predict -> backtest
+    
+    The test window is scored on every bar of `prices` (the features store,
+    neutrals included; passed per call by the walk-forward runner, which
+    memory-maps it for its workers) and backtested with the vectorized
+    engine: one position at a time, the labeler's barriers, session spreads
+    and ATR slippage. Without `prices` the labeled test rows are used.
+    
+    With warm start each fold's booster continues from the previous fold's
+    (`xgb_model=`) with `warm_start_rounds` extra rounds instead of being
+    trained from scratch, so folds must run in order. The tree count grows
+    by `warm_start_rounds` per fold; once it would pass `max_boost_rounds`
+    the booster is trained from scratch again, which bounds model size and
+    prediction time.
+    
+    The calibration tail of each train window must not have been fit by
+    any booster of the chain. Fit rows end where the tail starts and train
+    windows only move forward, so the tail starts after every earlier
+    fold's fit rows; this is checked on every fold (`fit_end`), and tail
+    rows an earlier booster was fit on are left out of the calibration.
+    """
+    
+    def __init__(self, retraining: dict, params: dict = None, threshold: float = 0.6,
+                 calibration_method: str = 'isotonic', calendar=None, cost_model=None,
+                 barriers: dict = None):
+        """
+        Args:
+            retraining: Walk-forward `retraining` section (warm_start,
+                num_boost_round, warm_start_rounds, max_boost_rounds,
+                calibration_fraction, min_train_samples)
+            params: Booster parameters (train_xgboost defaults if None)
+            threshold: Calibrated probability needed to go long
+            calibration_method: 'isotonic' or 'sigmoid' (pass-through)
+            calendar: TradingCalendar for the fold backtests
+            cost_model: CostModel of the backtests (CostModel.from_config)
+            barriers: Labeling `barriers` (tp_multiplier, sl_multiplier,
+                time_bars) used as the backtest exits
+        """
+        self.warm_start = retraining.get('warm_start', True)
+        self.num_boost_round = retraining.get('num_boost_round', 100)
+        self.warm_start_rounds = retraining.get('warm_start_rounds', 20)
+        self.max_boost_rounds = retraining.get('max_boost_rounds', 300)
+        self.calibration_fraction = retraining.get('calibration_fraction', 0.1)
+        if not 0 <= self.calibration_fraction < 1:
+            raise ValueError(f"calibration_fraction must be in [0, 1), got {self.calibration_fraction}")
+        self.min_train_samples = retraining.get('min_train_samples', 0)
+        self.params = params
+        self.threshold = threshold
+        self.calibration_method = calibration_method
+        self.calendar = calendar
+        self.cost_model = cost_model
+        self.barriers = barriers or {}
+        self.booster = None
+        self.fit_end = None  # last train timestamp fit by the current booster chain
+    
+    def __call__(self, train_df, test_df, prices=None):
+        """
+        Fold metrics (backtest metrics plus train rows, rounds, seconds and the trade PnLs)
+        
+        Args:
+            train_df: Labeled train rows
+            test_df: Labeled test rows (their dates bound the test window)
+            prices: Features of every bar (features store); the test window
+                is scored and backtested on it (labeled test rows if None)
+        """
+        start = time.perf_counter()
+        fold = {'train_rows': len(train_df), 'test_rows': len(test_df),
+                'test_start': test_df.index[0], 'test_end': test_df.index[-1]}
+        # Fit and calibrate on binary targets only (neutrals kept by handle_neutrals: keep)
+        train_df = binary_rows(train_df)
+        if len(train_df) < self.min_train_samples:
+            logger.warning(f"Fold skipped: {len(train_df)} train samples < {self.min_train_samples}")
+            return fold
+        
+        feature_cols = get_feature_columns(train_df)
+        X = train_df[feature_cols].fillna(0)
+        n_fit = int(len(X) * (1 - self.calibration_fraction))
+        
+        warm = self.warm_start and self.booster is not None
+        if warm and self.booster.num_boosted_rounds() + self.warm_start_rounds > self.max_boost_rounds:
+            logger.info(f"Booster at {self.booster.num_boosted_rounds()} rounds, "
+                        f"retraining from scratch (max_boost_rounds={self.max_boost_rounds})")
+            warm = False
+        booster = train_xgboost(
+            X.iloc[:n_fit], train_df['label'].iloc[:n_fit],
+            params=self.params,
+            num_boost_round=self.warm_start_rounds if warm else self.num_boost_round,
+            xgb_model=self.booster if warm else None
+        )
+        
+        # Calibrate on the tail of the train window (rows no booster of the chain was fit on)
+        n_calibration = n_fit
+        if warm and self.fit_end is not None and n_fit < len(X) and train_df.index[n_fit] <= self.fit_end:
+            n_calibration = max(n_fit, int(train_df.index.searchsorted(self.fit_end, side='right')))
+            logger.warning(f"Calibration tail overlaps rows fit by an earlier fold (up to {self.fit_end}): "
+                           f"{len(X) - n_calibration} of {len(X) - n_fit} rows kept; "
+                           f"calibration_fraction should be shorter than the step")
+        if self.warm_start:
+            self.booster = booster
+            self.fit_end = train_df.index[n_fit - 1]
+        
+        calibrator = None
+        if n_calibration < len(X):
+            _, calibrator = calibrate_probabilities(
+                train_df['label'].iloc[n_calibration:].to_numpy(),
+                booster.predict(xgb.DMatrix(X.iloc[n_calibration:])),
+                method=self.calibration_method
+            )
+        window = test_df if prices is None else prices.loc[test_df.index[0]:test_df.index[-1]]
+        proba = booster.predict(xgb.DMatrix(window[feature_cols].fillna(0)))
+        if calibrator is not None:
+            proba = calibrator.predict(proba)
+        
+        signals = generate_signals(pd.Series(proba, index=window.index), {'threshold': self.threshold})
+        engine = VectorizedBacktestEngine(
+            tp_multiplier=self.barriers.get('tp_multiplier', 2.0),
+            sl_multiplier=self.barriers.get('sl_multiplier', 1.0),
+            max_hold_bars=self.barriers.get('time_bars', 12),
+            calendar=self.calendar,
+            cost_model=self.cost_model
+        )
+        fold.update(engine.run(signals, window))
+        fold['trade_pnl'] = engine.ledger.column('pnl').copy()
+        fold['rounds'] = booster.num_boosted_rounds()
+        fold['seconds'] = time.perf_counter() - start
+        return fold
 
-def main():
+def main(mode='walkforward'):
     """Main pipeline"""
     # Setup
     config = Config.from_yaml()
@@ -25,27 +179,93 @@ def main():
     labels_path = Path(config.paths.data_labels) / "labeled_dataset.parquet"
     df = load_processed_data(str(labels_path))
     
-    # Run walk-forward
     wf_config = config.walkforward_config
+    calendar = TradingCalendar.from_asset_config(config.asset_config)
     
-    def model_fn(train_df, test_df):
-        # Simplified model function for walk-forward
-        logger.info(f"Fold: train={len(train_df)}, test={len(test_df)}")
-        return {'profit_factor': 1.5, 'max_drawdown': -0.10}
-    
-    results = run_walk_forward(df, model_fn, wf_config)
-    
-    # Save results
     output_dir = Path(config.paths.reports) / "walkforward"
     output_dir.mkdir(parents=True, exist_ok=True)
     
+    if mode == 'cpcv':
+        path_returns, summary = run_cpcv(
+            df, xgboost_returns, wf_config,
+            n_jobs=wf_config.get('cpcv', {}).get('n_jobs', 1),
+            periods_per_year=calendar.bars_per_year
+        )
+        path_returns.to_parquet(output_dir / "cpcv_paths.parquet")
+        summary.to_csv(output_dir / "cpcv_summary.csv", index=False)
+        
+        logger.info("=" * 60)
+        logger.info(f"✓ CPCV complete: {len(summary)} paths, Sharpe median {summary['sharpe'].median():.2f}")
+        logger.info(f"Results: {output_dir}/cpcv_summary.csv")
+        logger.info("=" * 60)
+        return
+    
+    # Features of every bar: test windows are scored and backtested on them,
+    # and coverage is measured on their index, not on the labeled rows
+    # (neutrals dropped)
+    prices = load_partitioned(
+        str(Path(config.paths.data_features) / "store"),
+        symbol=config.asset_config['symbol'],
+        timeframe=config.asset_config['timeframe']['name']
+    )
+    
+    # Run walk-forward
+    retraining = wf_config.get('retraining', {})
+    calibration = config.model.calibration
+    model_fn = WalkForwardModel(
+        retraining,
+        params=retraining.get('params'),
+        threshold=retraining.get('threshold', 0.6),
+        calibration_method=calibration.get('method', 'isotonic') if calibration.get('enabled', True) else None,
+        calendar=calendar,
+        cost_model=CostModel.from_config(config),
+        barriers=config.labeling_config.get('barriers', {})
+    )
+    if model_fn.warm_start:
+        # Each fold starts from the previous booster: in order, nothing reused from the cache
+        logger.info("Warm-started boosters: folds run sequentially without the fold cache")
+        results = run_walk_forward(df, model_fn, wf_config, calendar=calendar, n_jobs=1, cache_dir='',
+                                   prices=prices)
+    else:
+        # Cache keys hash the prices of each test window and the model state (cost model, barriers)
+        results = run_walk_forward(df, model_fn, wf_config, calendar=calendar,
+                                   params={**retraining, 'calibration': calibration}, prices=prices)
+    
+    # Save results (trade PnLs feed the Monte Carlo, not the CSV)
+    trade_pnl = np.concatenate([r.pop('trade_pnl', np.empty(0)) for r in results] or [np.empty(0)])
     results_df = pd.DataFrame(results)
     results_df.to_csv(output_dir / "walkforward_results.csv", index=False)
     
+    # Aggregate folds: weighted by trades, worst-fold drawdown, total trades
+    metrics_config = wf_config.get('metrics', {})
+    if len(results_df) and metrics_config.get('save_summary_report', True):
+        summary = aggregate_folds(results_df, weight='num_trades')
+        summary.to_csv(output_dir / "walkforward_summary.csv")
+        
+        row = 'weighted' if metrics_config.get('aggregate_method', 'weighted_average') == 'weighted_average' else 'mean'
+        aggregate = summary.loc[row].to_dict()
+        if 'max_drawdown' in summary:
+            aggregate['max_drawdown'] = summary.loc['min', 'max_drawdown']
+        if 'num_trades' in results_df:
+            aggregate['num_trades'] = int(results_df['num_trades'].sum())
+        
+        gating = config.model.gating
+        mc_config = gating.get('monte_carlo', {})
+        if mc_config.get('enabled', False) and len(trade_pnl):
+            _, robustness = run_monte_carlo(trade_pnl, config=mc_config)
+            pd.DataFrame([robustness]).to_csv(output_dir / "walkforward_montecarlo.csv", index=False)
+            logger.info(f"Monte Carlo: PF p5 {robustness['profit_factor_p5']:.2f}, "
+                        f"drawdown p5 {robustness['max_drawdown_p5']:.2%}, "
+                        f"risk of ruin {robustness['risk_of_ruin']:.2%}")
+            aggregate.update(robustness)
+        if gating.get('enabled', True):
+            should_promote_model(aggregate, gating)
+    
     logger.info("=" * 60)
     logger.info("✓ Walk-forward validation complete")
     logger.info(f"Results: {output_dir}/walkforward_results.csv")
     logger.info("=" * 60)
 
 if __name__ == "__main__":
-    main()
+    mode = sys.argv[1] if len(sys.argv) > 1 else 'walkforward'
+    main(mode)
@@ -9,7 +9,7 @@ from loguru import logger
 from aurum_edge.core.config import Config
 from aurum_edge.core.logging import setup_logging
 from aurum_edge.data.ingest import load_processed_data
-from aurum_edge.models.train import train_xgboost, save_model
+from aurum_edge.models.train import train_xgboost, save_model, get_feature_columns, binary_rows
 from aurum_edge.models.tune_optuna import optimize_xgboost
 from aurum_edge.models.calibrate import calibrate_probabilities
 from aurum_edge.models.registry import ModelRegistry
@@ -34,8 +34,11 @@ def main():
     
     df = load_processed_data(str(labels_path))
     
+    # Binary target: neutrals (labels.handle_neutrals: keep) are not trained on
+    df = binary_rows(df)
+    
     # Prepare X, y
-    feature_cols = [c for c in df.columns if c not in ['label', 'date', 'time']]
+    feature_cols = get_feature_columns(df)
     X = df[feature_cols].fillna(0)
     y = df['label']
     
@@ -0,0 +1,76 @@
+"""
+TEST: Multi-asset Build Pipeline
+"""
+import pytest
+import pandas as pd
+import numpy as np
+
+from aurum_edge.data.store import list_partitions, load_partitioned
+from aurum_edge.pipelines.build_assets import labels_path, run_assets
+
+FEATURE_CONFIG = {
+    'returns_periods': [1, 3],
+    'volatility_windows': [10],
+    'ema_periods': [9, 21],
+    'higher_timeframes': ['H1'],
+    'validate_on_build': False
+}
+LABELING_CONFIG = {'barriers': {'tp_multiplier': 2.0, 'sl_multiplier': 1.0, 'time_bars': 12}}
+
+def _asset(symbol):
+    return {
+        'symbol': symbol,
+        'timeframe': {'name': 'M5'},
+        'data_source': {'filename_pattern': f"{symbol.lower()}_m5*.csv"}
+    }
+
+def _write_export(path, n, seed):
+    dates = pd.date_range('2024-01-02', periods=n, freq='5min')
+    close = np.random.default_rng(seed).normal(0, 5, n).cumsum() + 16000
+    pd.DataFrame({
+        'Date': dates.strftime('%Y.%m.%d'),
+        'Time': dates.strftime('%H:%M'),
+        'Open': close,
+        'High': close + 3,
+        'Low': close - 3,
+        'Close': close,
+        'TickVolume': np.arange(n) % 500 + 1,
+        'Spread': 2.0
+    }).to_csv(path, index=False)
+
+def test_assets_built_in_parallel(tmp_path):
+    """Each asset lands in its own store partition; failures are reported, not raised"""
+    raw = tmp_path / "raw"
+    raw.mkdir()
+    _write_export(raw / "nas100_m5_2024.csv", 3000, seed=0)
+    _write_export(raw / "us30_m5_2024.csv", 2000, seed=1)
+    paths = {
+        'data_raw': str(raw),
+        'data_store': str(tmp_path / "store"),
+        'features_store': str(tmp_path / "features"),
+        'labels_dir': str(tmp_path / "labels")
+    }
+
+    report = run_assets(
+        [_asset('NAS100'), _asset('US30'), _asset('XAUUSD')],
+        paths, FEATURE_CONFIG, LABELING_CONFIG, n_jobs=2
+    )
+
+    report = report.set_index('symbol')
+    assert report.loc['NAS100', 'status'] == 'ok'
+    assert report.loc['US30', 'rows_dataset'] == 2000
+    assert report.loc['XAUUSD', 'status'] == 'failed'
+    assert 'FileNotFoundError' in report.loc['XAUUSD', 'error']
+    assert (report.loc[['NAS100', 'US30'], 'peak_rss_mb'] > 0).all()
+
+    for store in ('data_store', 'features_store'):
+        assert set(list_partitions(paths[store])['symbol']) == {'NAS100', 'US30'}
+
+    features = load_partitioned(paths['features_store'], symbol='US30', timeframe='M5')
+    assert 'h1_ema_21' in features.columns and len(features) == 2000
+    labels = pd.read_parquet(labels_path(paths['labels_dir'], 'NAS100', 'M5'))
+    assert len(labels) == report.loc['NAS100', 'rows_labels']
+    assert set(labels['label'].unique()) <= {0, 1}
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
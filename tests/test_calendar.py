@@ -0,0 +1,92 @@
+"""
+TEST: Trading Calendar
+"""
+import pytest
+import pandas as pd
+import numpy as np
+
+from aurum_edge.core.calendar import TradingCalendar
+from aurum_edge.data.split import get_walk_forward_splits
+
+TRADING_HOURS = {
+    'start': '22:00',
+    'end': '21:00',
+    'daily_break': {'start': '21:00', 'end': '22:00'},
+    'holidays': ['2024-12-25']
+}
+
+def _trading_bars(start, end):
+    """Every M5 bar the market is open for, built day by day"""
+    bars = pd.date_range(start, end, freq='5min', inclusive='left')
+    weekday, hour = bars.dayofweek, bars.hour
+    closed = (
+        (weekday == 5)
+        | ((weekday == 6) & (hour < 22))
+        | ((weekday == 4) & (hour >= 21))
+        | (hour == 21)
+        | (bars.normalize() == pd.Timestamp('2024-12-25'))
+    )
+    return bars[~closed]
+
+def test_expected_bars_match_brute_force():
+    """Weekend, daily break and holiday are not counted"""
+    calendar = TradingCalendar(TRADING_HOURS, bar_minutes=5)
+    bars = _trading_bars('2024-12-01', '2025-01-15')
+    assert calendar.bars_per_week == 23 * 12 * 5
+    
+    rng = np.random.default_rng(0)
+    t0 = pd.Timestamp('2024-12-01') + pd.to_timedelta(rng.integers(0, 40 * 1440, 200), unit='min')
+    t1 = t0 + pd.to_timedelta(rng.integers(0, 5 * 1440, 200), unit='min')
+    expected = calendar.expected_bars(t0, t1)
+    brute = bars.searchsorted(t1) - bars.searchsorted(t0)
+    np.testing.assert_array_equal(expected, brute)
+    
+    assert calendar.is_open(bars).all()
+    assert not calendar.is_open(pd.DatetimeIndex(['2024-12-25 12:00', '2024-12-07 12:00', '2024-12-10 21:30'])).any()
+
+def test_gaps_and_coverage():
+    """Only missing trading time is a gap"""
+    calendar = TradingCalendar(TRADING_HOURS, bar_minutes=5)
+    bars = _trading_bars('2024-12-16', '2025-01-06')
+    assert calendar.gaps(bars).empty
+    
+    outage = (bars >= '2024-12-18 10:00') & (bars < '2024-12-18 12:00')
+    gaps = calendar.gaps(bars[~outage])
+    assert len(gaps) == 1
+    assert gaps['start'].iloc[0] == pd.Timestamp('2024-12-18 09:55')
+    assert gaps['missing_bars'].iloc[0] == 24
+    
+    week = (pd.Timestamp('2024-12-16'), pd.Timestamp('2024-12-23'))
+    assert calendar.coverage(bars, *week) == 1.0
+    assert calendar.coverage(bars[~outage], *week) == pytest.approx(1 - 24 / calendar.bars_per_week)
+
+def test_walk_forward_skips_folds_with_missing_data():
+    """A fold whose test window lost a trading day is dropped"""
+    calendar = TradingCalendar(TRADING_HOURS, bar_minutes=5)
+    bars = _trading_bars('2024-01-01', '2024-04-01')
+    df = pd.DataFrame({'value': np.arange(len(bars))}, index=bars)
+    outage = (df.index >= '2024-02-14') & (df.index < '2024-02-15')
+    
+    full = get_walk_forward_splits(df[~outage], train_months=1, test_weeks=1, step_weeks=1)
+    checked = get_walk_forward_splits(df[~outage], train_months=1, test_weeks=1, step_weeks=1,
+                                      calendar=calendar, min_coverage=0.9)
+    assert len(checked) == len(full) - 1
+
+def test_walk_forward_coverage_measured_on_bars():
+    """A labeled subset (neutrals dropped) keeps its folds when coverage is taken on the bar index"""
+    calendar = TradingCalendar(TRADING_HOURS, bar_minutes=5)
+    bars = _trading_bars('2024-01-01', '2024-04-01')
+    outage = (bars >= '2024-02-14') & (bars < '2024-02-15')
+    bars = bars[~outage]
+    labeled = pd.DataFrame({'value': 1}, index=bars[::2])
+    
+    full = get_walk_forward_splits(labeled, train_months=1, test_weeks=1, step_weeks=1)
+    on_labels = get_walk_forward_splits(labeled, train_months=1, test_weeks=1, step_weeks=1,
+                                        calendar=calendar, min_coverage=0.9)
+    on_bars = get_walk_forward_splits(labeled, train_months=1, test_weeks=1, step_weeks=1,
+                                      calendar=calendar, min_coverage=0.9, bar_index=bars)
+    assert len(on_labels) == 0
+    assert len(on_bars) == len(full) - 1
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -1,9 +1,23 @@
 """
 TEST: Trading Costs
 """
+from pathlib import Path
+
 import pytest
+import pandas as pd
+import numpy as np
+import yaml
+
+from aurum_edge.backtest.costs import CostModel, apply_costs, trade_costs
+from aurum_edge.backtest.engine import VectorizedBacktestEngine
 
-from aurum_edge.backtest.costs import apply_costs
+CONFIGS = Path(__file__).resolve().parents[1] / "configs"
+
+def _configs(asset='nas100_m5'):
+    with open(CONFIGS / "costs" / "costs_default.yaml") as f:
+        costs = yaml.safe_load(f)
+    with open(CONFIGS / "assets" / f"{asset}.yaml") as f:
+        return costs, yaml.safe_load(f)
 
 def test_cost_calculation():
     """Test cost calculation"""
@@ -22,5 +36,80 @@ def test_cost_calculation():
     # Costs should be positive
     assert costs['total_cost'] > 0, "Total cost should be positive"
 
+def test_session_spread_and_atr_slippage():
+    """Spread follows the session of the entry time, slippage the ATR"""
+    costs, asset = _configs()
+    model = CostModel(costs, asset)
+    times = pd.to_datetime(['2024-01-02 03:00', '2024-01-02 09:30', '2024-01-02 14:00', '2024-01-02 21:30'])
+    
+    result = model.costs(times, atr=np.array([0.0, 0.0, 10.0, 0.0]))
+    # asian 2.5, london 1.5, london/newyork overlap -> newyork 1.0, overnight 3.0 (points of 0.1)
+    assert np.allclose(result['spread_cost'], [0.25, 0.15, 0.10, 0.30])
+    # 0.5 points fixed + 2% of a 10.0 ATR
+    assert np.allclose(result['slippage_cost'], [0.05, 0.05, 0.05 + 0.2, 0.05])
+    
+    # Quoted spreads of the data replace the model where known
+    quoted = model.costs(times, spread=np.array([4.0, 0.0, np.nan, 6.0]))
+    assert np.allclose(quoted['spread_cost'], [0.40, 0.15, 0.10, 0.60])
+
+def test_asset_point_value():
+    """Point size and contract size come from the asset config"""
+    costs, asset = _configs('xauusd_m5')
+    model = CostModel(costs, asset)
+    assert model.point == 0.01
+    assert model.value_per_price == 100.0
+    assert trade_costs(costs, asset)['total_cost'] == pytest.approx((25.0 + 5.0) * 0.01)
+    
+    # 1 lot, +1.0 move, 0.30 of costs -> 70 USD
+    assert model.net_pnl(1, 2000.0, 2001.0, 0.30, size=1.0) == pytest.approx(70.0)
+    assert trade_costs() == pytest.approx(trade_costs(None, {}))
+
+def test_vectorized_costs_match_per_trade():
+    """One call over arrays equals the trade-by-trade application"""
+    costs, asset = _configs()
+    rng = np.random.default_rng(0)
+    n = 200
+    times = pd.date_range('2024-01-01', periods=n, freq='37min')
+    entry = 15000 + rng.normal(0, 50, n)
+    exit_ = entry + rng.normal(0, 20, n)
+    direction = rng.choice([-1, 1], n)
+    atr = rng.uniform(5, 30, n)
+    
+    net, _ = apply_costs(entry, exit_, direction, costs, asset, times=times, atr=atr)
+    for i in range(0, n, 17):
+        one, _ = apply_costs(entry[i], exit_[i], 'long' if direction[i] == 1 else 'short', costs, asset,
+                             times=times[i:i + 1], atr=atr[i:i + 1])
+        assert net[i] == pytest.approx(one[0])
+
+def test_engine_uses_cost_model():
+    """Engine PnL = CostModel net PnL of each trade, in account currency"""
+    costs, asset = _configs('xauusd_m5')
+    n = 300
+    rng = np.random.default_rng(1)
+    close = 2000 + np.cumsum(rng.normal(0, 0.5, n))
+    prices = pd.DataFrame({
+        'open': close, 'high': close + 0.3, 'low': close - 0.3, 'close': close,
+        'atr_14': 1.0, 'spread': 30.0
+    }, index=pd.date_range('2024-01-01', periods=n, freq='5min'))
+    signals = np.where(rng.uniform(size=n) > 0.9, 1, 0)
+    
+    engine = VectorizedBacktestEngine(position_size=0.1, cost_config=costs, asset_config=asset)
+    engine.run(signals, prices)
+    trades = engine.trades
+    expected = (trades['exit_price'] - trades['entry_price'] - (30.0 + 5.0 + 2.0) * 0.01) * 100 * 0.1
+    assert np.allclose(trades['pnl'], expected)
+    
+    # Equity is in the same currency units: at each exit bar where no new trade
+    # opens it equals the booked PnL, and an open trade is marked net of its
+    # costs from the entry bar
+    exits = prices.index.get_indexer(trades['exit_time'])
+    entries = prices.index.get_indexer(trades['entry_time'])
+    booked = engine.initial_balance + np.cumsum(trades['pnl'].to_numpy())
+    flat = ~np.isin(exits, entries)
+    assert flat.any()
+    assert np.allclose(engine.equity.iloc[exits[flat]], booked[flat])
+    before = np.concatenate([[engine.initial_balance], booked[:-1]])
+    assert np.allclose(engine.equity.iloc[entries] - before, -(30.0 + 5.0 + 2.0) * 0.01 * 100 * 0.1)
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
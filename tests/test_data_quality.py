@@ -1,6 +1,8 @@
 """
 TEST: Data Quality Checks
 """
+import warnings
+
 import pytest
 import pandas as pd
 import numpy as np
@@ -8,10 +10,28 @@ import numpy as np
 from aurum_edge.data.validate import (
     check_missing_values,
     check_duplicates,
-    check_outliers,
     check_monotonic_time,
-    validate_ohlc_logic
+    validate_ohlc_logic,
+    validate_bars
 )
+from aurum_edge.core.calendar import TradingCalendar
+from aurum_edge.core.timeutils import check_gaps
+
+# NAS100: open Sunday 22:00, close Friday 21:00 (UTC)
+CALENDAR = TradingCalendar({'start': '22:00', 'end': '21:00'})
+
+def _week_of_bars():
+    """M5 bars from Monday to the next Monday, closed over the weekend"""
+    dates = pd.date_range('2024-01-08', '2024-01-15 23:55', freq='5min')
+    dates = dates[(dates < '2024-01-12 21:00') | (dates >= '2024-01-14 22:00')]
+    close = 16000 + np.sin(np.arange(len(dates)) / 50) * 20
+    return pd.DataFrame({
+        'open': close,
+        'high': close + 2,
+        'low': close - 2,
+        'close': close,
+        'tickvolume': 100
+    }, index=dates)
 
 def test_missing_values_detection():
     """Test missing value detection"""
@@ -25,7 +45,7 @@ def test_missing_values_detection():
     assert missing['close'] == 0, "Should detect 0 missing values in 'close'"
 
 def test_duplicate_detection():
-    """Test duplicate row detection"""
+    """Duplicates are repeated timestamps, not repeated values"""
     dates = pd.date_range('2024-01-01', periods=5, freq='5min')
     df = pd.DataFrame({
         'value': [1, 2, 2, 3, 4]
@@ -36,6 +56,7 @@ def test_duplicate_detection():
     
     dup_count = check_duplicates(df)
     assert dup_count == 1, f"Should detect 1 duplicate, found {dup_count}"
+    assert check_duplicates(df.iloc[:5]) == 0, "Equal values at different times are not duplicates"
 
 def test_monotonic_time():
     """Test time monotonicity check"""
@@ -74,5 +95,55 @@ def test_ohlc_logic():
     errors = validate_ohlc_logic(df_bad)
     assert len(errors) > 0, "Should detect invalid OHLC"
 
+def test_session_aware_gaps():
+    """The weekend closure is not a gap, a missing hour on Wednesday is"""
+    df = _week_of_bars()
+    assert len(check_gaps(df, max_gap_minutes=15)) == 1  # weekend, without sessions
+    assert check_gaps(df, max_gap_minutes=15, calendar=CALENDAR) == []
+    
+    outage = (df.index >= '2024-01-10 14:00') & (df.index < '2024-01-10 15:00')
+    gaps = check_gaps(df[~outage], max_gap_minutes=15, calendar=CALENDAR)
+    assert gaps == [(pd.Timestamp('2024-01-10 13:55'), pd.Timestamp('2024-01-10 15:00'), 65.0)]
+    
+    # Friday bars stopping an hour early: more missing than the closure explains
+    early = (df.index >= '2024-01-12 20:00') & (df.index < '2024-01-12 21:00')
+    assert len(check_gaps(df[~early], max_gap_minutes=15, calendar=CALENDAR)) == 1
+
+def test_validate_bars_report():
+    """One pass fills every field of the report"""
+    df = _week_of_bars()
+    report = validate_bars(df, {'min_rows': 100}, CALENDAR)
+    assert report.passed and report.issues == []
+    assert report.total_rows == len(df) and report.gaps == []
+    assert report.date_range == (df.index[0], df.index[-1])
+    
+    bad = df.copy()
+    bad.iloc[10, bad.columns.get_loc('close')] = np.nan
+    bad.iloc[20, bad.columns.get_loc('high')] = bad['low'].iloc[20] - 1
+    bad.iloc[30, bad.columns.get_loc('low')] = -1e6
+    bad = pd.concat([bad, bad.iloc[[40]]]).sort_index()
+    bad = bad.drop(bad.index[100:120])
+    
+    report = validate_bars(bad, {'min_rows': 100, 'max_gap_minutes': 15}, CALENDAR)
+    assert not report.passed
+    assert report.missing_values['close'] == 1 and report.missing_values['open'] == 0
+    assert report.duplicate_rows == 1
+    assert report.outliers == {'low': 1}
+    assert len(report.gaps) == 1
+    assert any(issue.startswith('High < Low') for issue in report.issues)
+    assert any(issue.startswith('High < max(open, close)') for issue in report.issues)
+
+def test_validate_bars_all_nan_column():
+    """A column without values is reported as missing, not scored for outliers"""
+    df = _week_of_bars()
+    df['open'] = np.nan
+    with warnings.catch_warnings():
+        warnings.simplefilter('error', RuntimeWarning)
+        report = validate_bars(df, {'min_rows': 100}, CALENDAR)
+        empty = validate_bars(df.iloc[:0], {'min_rows': 0}, CALENDAR)
+    assert report.missing_values['open'] == len(df)
+    assert report.outliers == {}
+    assert empty.passed and empty.outliers == {}
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
@@ -0,0 +1,88 @@
+"""
+TEST: Vectorized Backtest Engine
+"""
+import pytest
+import pandas as pd
+import numpy as np
+
+from aurum_edge.backtest.engine import VectorizedBacktestEngine
+
+def _prices(n=3000, seed=0):
+    rng = np.random.default_rng(seed)
+    close = 16000 + rng.normal(0, 5, n).cumsum()
+    open_ = close + rng.normal(0, 1, n)
+    return pd.DataFrame({
+        'open': open_,
+        'high': np.maximum(close, open_) + rng.uniform(0, 4, n),
+        'low': np.minimum(close, open_) - rng.uniform(0, 4, n),
+        'close': close,
+        'atr_14': 6.0
+    }, index=pd.date_range('2024-01-01', periods=n, freq='5min'))
+
+def _reference(signal, prices, tp=2.0, sl=1.0, hold=12):
+    """Bar-by-bar loop: one position, SL before TP in the same bar, gaps fill at the open"""
+    o, h, l, c, atr = (prices[col].to_numpy() for col in ['open', 'high', 'low', 'close', 'atr_14'])
+    n = len(c)
+    trades = []
+    i = 0
+    while i < n - 1:
+        d = signal[i]
+        if d == 0:
+            i += 1
+            continue
+        tp_price, sl_price = c[i] + d * tp * atr[i], c[i] - d * sl * atr[i]
+        exit_ = (min(i + hold, n - 1), c[min(i + hold, n - 1)], 'time')
+        for j in range(i + 1, min(i + hold + 1, n)):
+            sl_hit = l[j] <= sl_price if d > 0 else h[j] >= sl_price
+            tp_hit = h[j] >= tp_price if d > 0 else l[j] <= tp_price
+            if sl_hit:
+                exit_ = (j, min(sl_price, o[j]) if d > 0 else max(sl_price, o[j]), 'sl')
+                break
+            if tp_hit:
+                exit_ = (j, max(tp_price, o[j]) if d > 0 else min(tp_price, o[j]), 'tp')
+                break
+        trades.append((i,) + exit_)
+        i = exit_[0]
+    return trades
+
+def test_matches_bar_by_bar_loop():
+    """Same entries, exits, fills and exit reasons as the event loop"""
+    prices = _prices()
+    signal = np.random.default_rng(1).choice([-1, 0, 1], len(prices), p=[0.2, 0.6, 0.2])
+    
+    engine = VectorizedBacktestEngine()
+    metrics = engine.run(signal, prices)
+    trades = engine.trades
+    expected = _reference(signal, prices)
+    
+    assert len(trades) == len(expected) == metrics['num_trades']
+    np.testing.assert_array_equal(prices.index.get_indexer(trades['entry_time']), [t[0] for t in expected])
+    np.testing.assert_array_equal(prices.index.get_indexer(trades['exit_time']), [t[1] for t in expected])
+    np.testing.assert_allclose(trades['exit_price'], [t[2] for t in expected])
+    assert list(trades['exit_reason']) == [t[3] for t in expected]
+    
+    # Never more than one open position
+    assert (trades['entry_time'].to_numpy()[1:] >= trades['exit_time'].to_numpy()[:-1]).all()
+
+def test_equity_and_costs():
+    """Equity is marked every bar and ends at balance + net PnL"""
+    prices = _prices(500)
+    signal = np.zeros(len(prices))
+    signal[[10, 100, 200]] = 1
+    
+    engine = VectorizedBacktestEngine(tp_multiplier=None, sl_multiplier=None, max_hold_bars=5)
+    engine.run(signal, prices)
+    trades = engine.trades
+    
+    assert len(engine.equity) == len(prices)
+    assert list(trades['exit_reason']) == ['time'] * 3
+    np.testing.assert_allclose(trades['exit_price'], prices['close'].iloc[[15, 105, 205]])
+    np.testing.assert_allclose(trades['pnl'], (trades['exit_price'] - trades['entry_price'] - 0.25) * 0.01)
+    assert engine.equity.iloc[-1] == pytest.approx(1000.0 + trades['pnl'].sum())
+    
+    # Open position marked to market at the close, net of its costs
+    mark = 1000.0 + (prices['close'].iloc[12] - prices['close'].iloc[10] - 0.25) * 0.01
+    assert engine.equity.iloc[12] == pytest.approx(mark)
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -7,6 +7,31 @@ import numpy as np
 
 from aurum_edge.features.returns import add_return_features
 from aurum_edge.features.volatility import add_volatility_features
+from aurum_edge.features.build import build_all_features, compute_features
+from aurum_edge.features.incremental import IncrementalFeatureBuilder
+from aurum_edge.features.streaming import FeatureState
+from aurum_edge.features.multi_timeframe import MultiTimeframeFeatures
+from aurum_edge.data.store import load_partitioned, save_partitioned
+from aurum_edge.pipelines.build_features import run_incremental
+
+FEATURE_CONFIG = {
+    'returns_periods': [1, 3, 5, 10, 20],
+    'volatility_windows': [10, 20, 50],
+    'ema_periods': [9, 21, 50, 200],
+    'tick_volume_zscore_window': 20,
+    'validate_on_build': False
+}
+
+def _bars(n, seed=0):
+    rng = np.random.default_rng(seed)
+    close = rng.normal(0, 5, n).cumsum() + 16000
+    return pd.DataFrame({
+        'open': close,
+        'high': close + rng.uniform(0, 5, n),
+        'low': close - rng.uniform(0, 5, n),
+        'close': close,
+        'tickvolume': rng.integers(1, 500, n)
+    }, index=pd.date_range('2024-01-02', periods=n, freq='5min', name='datetime'))
 
 def test_return_features():
     """Test return calculation"""
@@ -35,5 +60,132 @@ def test_volatility_features():
     assert 'atr_14' in df.columns, "ATR should be calculated"
     assert df['atr_14'].notna().sum() > 0, "ATR should have values"
 
+def test_log_returns_vectorized():
+    """Log returns are log(close / close.shift(p)), 0 where undefined"""
+    df = pd.DataFrame({'close': [100.0, 102.0, 0.0, 103.0, 105.0]})
+    df = add_return_features(df, periods=[1])
+    
+    expected = [0.0, np.log(1.02), 0.0, 0.0, np.log(105 / 103)]
+    np.testing.assert_allclose(df['log_return_1'].to_numpy(), expected)
+
+def test_feature_graph_selection():
+    """Requested columns only run the nodes behind them and match the full build"""
+    df = _bars(1000)
+    full = build_all_features(df.copy(), FEATURE_CONFIG)
+    
+    requested = ['close', 'volatility_20', 'macd_signal', 'range_atr_ratio']
+    selected, timings = compute_features(df, FEATURE_CONFIG, requested)
+    
+    assert list(selected.columns) == ['volatility_20', 'macd_signal', 'range_atr_ratio']
+    assert set(timings) == {'pct_change_1', 'volatility_20', 'tr', 'atr_14',
+                            'ewm_12', 'ewm_26', 'macd', 'range_atr_ratio'}
+    pd.testing.assert_frame_equal(selected, full[selected.columns])
+    
+    with pytest.raises(ValueError):
+        compute_features(df, FEATURE_CONFIG, ['not_a_feature'])
+
+def test_incremental_matches_batch():
+    """Features extended block by block equal the batch build"""
+    df = _bars(3000)
+    batch = build_all_features(df.copy(), FEATURE_CONFIG)
+    
+    builder = IncrementalFeatureBuilder(FEATURE_CONFIG)
+    blocks = [(0, 1000), (1000, 1001), (1001, 1010), (1010, 3000)]
+    incremental = pd.concat([builder.update(df.iloc[start:end]) for start, end in blocks])
+    
+    pd.testing.assert_frame_equal(incremental, batch, check_exact=False, rtol=1e-9, atol=1e-9)
+    assert len(builder.tail) == builder.warmup
+
+def test_incremental_state_round_trip(tmp_path):
+    """State seeded from a batch build and reloaded extends to new bars"""
+    df = _bars(2000, seed=1)
+    batch = build_all_features(df.copy(), FEATURE_CONFIG)
+    
+    builder = IncrementalFeatureBuilder(FEATURE_CONFIG)
+    builder.seed(df.iloc[:1500])
+    builder.save(str(tmp_path / "feature_state.joblib"))
+    
+    builder = IncrementalFeatureBuilder.load(str(tmp_path / "feature_state.joblib"))
+    new_features = builder.update(df.iloc[1500:])
+    pd.testing.assert_frame_equal(new_features, batch.iloc[1500:], check_exact=False, rtol=1e-9, atol=1e-9)
+    
+    with pytest.raises(ValueError):
+        builder.update(df.iloc[-10:])
+
+def test_incremental_run_appends_to_store(tmp_path):
+    """The incremental pipeline writes only the new rows; stored files are not rewritten"""
+    df = _bars(2000, seed=2)
+    batch = build_all_features(df.copy(), FEATURE_CONFIG)
+    bars, features = tmp_path / "bars", tmp_path / "features"
+    asset_config = {'symbol': 'NAS100', 'timeframe': {'name': 'M5'}}
+    
+    save_partitioned(df, str(bars), 'NAS100', 'M5')
+    save_partitioned(batch.iloc[:1500], str(features), 'NAS100', 'M5')
+    stored = {path: path.stat().st_mtime_ns for path in features.rglob('*.parquet')}
+    builder = IncrementalFeatureBuilder(FEATURE_CONFIG)
+    builder.seed(df.iloc[:1500])
+    
+    run_incremental(builder, bars, asset_config, features, tmp_path / "state.joblib", tmp_path / "mtf.joblib",
+                    compact=False)
+    
+    assert all(path.stat().st_mtime_ns == mtime for path, mtime in stored.items())
+    assert len(list(features.rglob('*.parquet'))) > len(stored)
+    loaded = load_partitioned(str(features), 'NAS100', 'M5')
+    pd.testing.assert_frame_equal(loaded, batch, check_exact=False, rtol=1e-9, atol=1e-9, check_freq=False)
+
+def test_streaming_matches_batch():
+    """Bar-by-bar FeatureState reproduces the batch feature columns"""
+    df = _bars(1500, seed=2)
+    batch = build_all_features(df.copy(), FEATURE_CONFIG)
+    
+    state = FeatureState(FEATURE_CONFIG)
+    rows = [
+        state.update(ts, row.high, row.low, row.close, row.tickvolume)
+        for ts, row in zip(df.index, df.itertuples())
+    ]
+    streamed = pd.DataFrame(rows, index=df.index, columns=state.feature_names)
+    
+    assert state.feature_names == [c for c in batch.columns if c not in df.columns]
+    pd.testing.assert_frame_equal(
+        streamed, batch[state.feature_names].astype(float), check_exact=False, rtol=1e-9, atol=1e-9
+    )
+    
+    # warm_up feeds history the same way
+    warm = FeatureState(FEATURE_CONFIG)
+    np.testing.assert_allclose(warm.warm_up(df), rows[-1], rtol=1e-12)
+
+MTF_CONFIG = {**FEATURE_CONFIG, 'higher_timeframes': ['M15', 'H1', 'H4']}
+
+def test_multi_timeframe_uses_closed_bars_only():
+    """Changing bars after t never changes higher-timeframe features at t"""
+    df = _bars(3000, seed=3)
+    features = MultiTimeframeFeatures(MTF_CONFIG).update(df)
+    
+    # H1 bar 10:00-10:55 is only visible from the 10:55 bar on
+    h1_close_time = pd.Timestamp('2024-01-03 10:55')
+    before = features.loc[:h1_close_time - pd.Timedelta('5min'), 'h1_ema_9']
+    assert before.iloc[-1] == features.loc[pd.Timestamp('2024-01-03 09:55'), 'h1_ema_9']
+    assert features.loc[h1_close_time, 'h1_ema_9'] != before.iloc[-1]
+    
+    cut = 1700
+    perturbed = df.copy()
+    perturbed.iloc[cut:, :4] *= 1.05
+    features_perturbed = MultiTimeframeFeatures(MTF_CONFIG).update(perturbed)
+    pd.testing.assert_frame_equal(features.iloc[:cut], features_perturbed.iloc[:cut])
+
+def test_multi_timeframe_incremental():
+    """Feeding bars in blocks (incl. single bars) matches one full update"""
+    df = _bars(3000, seed=4)
+    df = df[df.index.hour != 21]  # daily gap
+    full = MultiTimeframeFeatures(MTF_CONFIG).update(df)
+    
+    mtf = MultiTimeframeFeatures(MTF_CONFIG)
+    cuts = [0, 7, 100, 101, 102, 1500, 1503, len(df)]
+    incremental = pd.concat([mtf.update(df.iloc[a:b]) for a, b in zip(cuts[:-1], cuts[1:])])
+    
+    pd.testing.assert_frame_equal(incremental, full, check_exact=False, rtol=1e-9, atol=1e-9)
+    assert len(mtf.pending) <= 48  # at most one open H4 bar of M5 bars
+    assert list(full.columns) == mtf.feature_names
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
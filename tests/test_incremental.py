@@ -0,0 +1,98 @@
+"""
+TEST: Incremental Dataset Append
+"""
+import pytest
+import pandas as pd
+import numpy as np
+
+from aurum_edge.data.incremental import build_manifest, load_manifest, read_new_bars, save_manifest
+from aurum_edge.data.ingest import load_mt5_csv
+from aurum_edge.data.store import save_partitioned, load_partitioned
+from aurum_edge.pipelines.build_dataset import run_incremental
+
+def _export_lines(dates, close):
+    """MT5-style CSV lines (header + one line per bar)"""
+    lines = ['Date,Time,Open,High,Low,Close,TickVolume,Spread']
+    for ts, c in zip(dates, close):
+        lines.append(f"{ts:%Y.%m.%d},{ts:%H:%M},{c},{c + 1.5},{c - 1.5},{c},{int(c) % 100},2.5")
+    return lines
+
+def _write(path, lines):
+    path.write_text('\n'.join(lines) + '\n')
+
+def test_append_matches_full_build(tmp_path):
+    """Appending the new tail gives the same store as rebuilding from scratch"""
+    dates = pd.date_range('2024-01-30', periods=3000, freq='5min')
+    close = np.random.default_rng(0).normal(0, 1, 3000).cumsum() + 16000
+    lines = _export_lines(dates, close)
+    csv = tmp_path / "nas100_m5.csv"
+    store = tmp_path / "store"
+
+    # Initial build on the first 2000 bars
+    _write(csv, lines[:2001])
+    df = load_mt5_csv(str(csv))
+    save_partitioned(df, str(store), 'NAS100', 'M5')
+    manifest = build_manifest([csv], df.index[-1])
+    assert manifest['sources']['nas100_m5.csv']['last_timestamp'] == str(dates[1999])
+
+    # Nothing changed -> nothing to append
+    new_bars, _ = read_new_bars([csv], manifest)
+    assert new_bars.empty
+
+    # Export grows by 1000 bars (crossing into March); only those are returned
+    _write(csv, lines)
+    new_bars, manifest = read_new_bars([csv], manifest)
+    assert new_bars.index.equals(pd.DatetimeIndex(dates[2000:], name='datetime'))
+    assert manifest['last_timestamp'] == str(dates[-1])
+
+    save_partitioned(new_bars, str(store), 'NAS100', 'M5', append=True)
+    loaded = load_partitioned(str(store), 'NAS100', 'M5')
+    pd.testing.assert_frame_equal(loaded, load_mt5_csv(str(csv)), check_freq=False)
+
+def test_rewritten_and_new_sources(tmp_path):
+    """Rewritten files are re-parsed, but only bars after the last stored one are kept"""
+    dates = pd.date_range('2024-01-02', periods=600, freq='5min')
+    close = np.linspace(16000, 16600, 600)
+    lines = _export_lines(dates, close)
+    old_csv, new_csv = tmp_path / "jan_a.csv", tmp_path / "jan_b.csv"
+
+    _write(old_csv, lines[:301])
+    manifest = build_manifest([old_csv], dates[299])
+
+    # Broker re-export: history edited in place and 100 more bars
+    edited = _export_lines(dates[:400], close[:400] + 0.25)
+    _write(old_csv, edited)
+    # New export overlapping the re-export
+    _write(new_csv, [lines[0]] + lines[351:])
+
+    new_bars, manifest = read_new_bars([old_csv, new_csv], manifest)
+    assert new_bars.index.equals(pd.DatetimeIndex(dates[300:], name='datetime'))
+    # Overlap (bars 350..399) comes from the file listed last
+    assert (new_bars['close'].iloc[:50] == close[300:350] + 0.25).all()
+    assert (new_bars['close'].iloc[50:] == close[350:]).all()
+    assert set(manifest['sources']) == {'jan_a.csv', 'jan_b.csv'}
+
+def test_incremental_run_with_no_clean_bars(tmp_path):
+    """New bars that cleaning drops entirely leave the store and manifest untouched"""
+    dates = pd.date_range('2024-01-02', periods=400, freq='5min')
+    close = np.linspace(16000, 16400, 400)
+    lines = _export_lines(dates, close)
+    csv = tmp_path / "nas100_m5.csv"
+    store = tmp_path / "store"
+    manifest_file = tmp_path / "manifest.json"
+    
+    _write(csv, lines[:301])
+    df = load_mt5_csv(str(csv))
+    save_partitioned(df, str(store), 'NAS100', 'M5')
+    save_manifest(build_manifest([csv], df.index[-1]), manifest_file)
+    
+    # 100 new bars without a close price
+    broken = [line.split(',') for line in lines[301:]]
+    _write(csv, lines[:301] + [','.join(parts[:5] + [''] + parts[6:]) for parts in broken])
+    run_incremental([csv], store, 'NAS100', 'M5', manifest_file, {}, {'outlier_threshold': 5.0})
+    
+    assert load_partitioned(str(store), 'NAS100', 'M5').index.equals(df.index)
+    assert load_manifest(manifest_file)['last_timestamp'] == str(dates[299])
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,53 @@
+"""
+TEST: MT5 CSV Ingestion
+"""
+import pytest
+import pandas as pd
+import numpy as np
+
+from aurum_edge.data.ingest import load_mt5_csv, load_mt5_csvs
+
+def _write_export(path, dates, close):
+    """Write an MT5-style export (Date, Time, OHLC, TickVolume, Spread)"""
+    pd.DataFrame({
+        'Date': dates.strftime('%Y.%m.%d'),
+        'Time': dates.strftime('%H:%M'),
+        'Open': close,
+        'High': close + 1.5,
+        'Low': close - 1.5,
+        'Close': close,
+        'TickVolume': np.arange(len(dates)),
+        'Spread': 2.5
+    }).to_csv(path, index=False)
+
+def test_typed_load(tmp_path):
+    """Timestamps use the fixed MT5 format and columns get explicit dtypes"""
+    dates = pd.date_range('2024-01-02', periods=100, freq='5min')
+    _write_export(tmp_path / "nas100_m5.csv", dates, np.linspace(16500, 16600, 100))
+
+    df = load_mt5_csv(str(tmp_path / "nas100_m5.csv"))
+
+    assert df.index.equals(pd.DatetimeIndex(dates, name='datetime'))
+    assert df['close'].dtype == np.float64
+    assert df['tickvolume'].dtype == np.int32
+    assert df['spread'].dtype == np.float32
+    assert 'date' not in df.columns and 'time' not in df.columns
+    assert abs(df['close'].iloc[-1] - 16600) < 1e-9
+
+def test_multi_file_merge(tmp_path):
+    """Monthly exports are merged sorted, overlapping bars keep the last file's values"""
+    dates = pd.date_range('2024-01-30', periods=1000, freq='5min')
+    close = np.arange(1000, dtype=float) + 16000
+    _write_export(tmp_path / "m1.csv", dates[:600], close[:600])
+    _write_export(tmp_path / "m2.csv", dates[500:], close[500:] + 0.5)
+
+    df = load_mt5_csvs([tmp_path / "m2.csv", tmp_path / "m1.csv"], n_jobs=2)
+    assert df.index.is_unique and df.index.is_monotonic_increasing
+    assert len(df) == 1000
+
+    # Overlap (bars 500..599) comes from m1.csv, the file listed last
+    assert (df['close'].iloc[500:600] == close[500:600]).all()
+    assert (df['close'].iloc[600:] == close[600:] + 0.5).all()
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -5,7 +5,15 @@ import pytest
 import pandas as pd
 import numpy as np
 
-from aurum_edge.labeling.triple_barrier import apply_triple_barrier
+from aurum_edge.labeling.triple_barrier import (
+    apply_triple_barrier,
+    apply_triple_barrier_chunked,
+    triple_barrier_labels,
+    LABEL_COLUMNS
+)
+from aurum_edge.labeling.grid import make_barrier_grid, triple_barrier_grid
+from aurum_edge.data.store import save_partitioned
+from aurum_edge.pipelines.build_labels import label_grid
 
 def test_triple_barrier_labels():
     """Test triple barrier labeling"""
@@ -54,5 +62,172 @@ def test_label_distribution():
     
     print(f"✓ Label distribution validated")
 
+def _bars(n, seed, start='2024-01-01'):
+    """Random-walk M5 bars with a random ATR"""
+    rng = np.random.default_rng(seed)
+    close = rng.normal(0, 1, n).cumsum() + 100
+    return pd.DataFrame({
+        'open': close,
+        'high': close + rng.uniform(0, 2, n),
+        'low': close - rng.uniform(0, 2, n),
+        'close': close,
+        'atr_14': rng.uniform(0.5, 2.0, n)
+    }, index=pd.date_range(start, periods=n, freq='5min', name='datetime'))
+
+def _loop_labels(df, tp_multiplier, sl_multiplier, time_bars):
+    """Reference per-row implementation (original labeling loop)"""
+    labels = np.full(len(df), -1)
+    for i in range(len(df) - time_bars):
+        entry_price = df['close'].iloc[i]
+        atr = df['atr_14'].iloc[i]
+        if pd.isna(atr) or atr == 0:
+            continue
+        future = df.iloc[i+1:i+1+time_bars]
+        tp_mask = (future['high'] >= entry_price + tp_multiplier * atr).to_numpy()
+        sl_mask = (future['low'] <= entry_price - sl_multiplier * atr).to_numpy()
+        tp_idx = tp_mask.argmax() if tp_mask.any() else None
+        sl_idx = sl_mask.argmax() if sl_mask.any() else None
+        if tp_idx is not None and sl_idx is not None:
+            labels[i] = 1 if tp_idx < sl_idx else 0
+        elif tp_idx is not None:
+            labels[i] = 1
+        elif sl_idx is not None:
+            labels[i] = 0
+    return labels
+
+def test_vectorized_matches_loop():
+    """Vectorized engine must reproduce the per-row loop exactly"""
+    df = _bars(600, seed=7)
+    df.iloc[:14, df.columns.get_loc('atr_14')] = np.nan
+    df.iloc[50, df.columns.get_loc('atr_14')] = 0.0
+
+    for tp, sl, bars in [(2.0, 1.0, 12), (1.0, 1.0, 5), (3.0, 2.0, 30)]:
+        expected = _loop_labels(df, tp, sl, bars)
+        labels, offsets = triple_barrier_labels(
+            df['close'], df['high'], df['low'], df['atr_14'],
+            tp_multiplier=tp, sl_multiplier=sl, time_bars=bars, chunk_size=97
+        )
+        np.testing.assert_array_equal(labels, expected)
+        assert (offsets[labels == -1] == 0).all()
+        assert ((offsets[labels != -1] >= 1) & (offsets[labels != -1] <= bars)).all()
+
+        df_labeled = apply_triple_barrier(df, tp, sl, bars)
+        assert df_labeled.index.equals(df.index[expected != -1])
+        np.testing.assert_array_equal(df_labeled['label'].to_numpy(), expected[expected != -1])
+
+def test_chunked_matches_in_memory(tmp_path):
+    """Chunked parquet labeling must match the in-memory result"""
+    df = _bars(1000, seed=11)
+    
+    input_path = tmp_path / "features.parquet"
+    output_path = tmp_path / "labels" / "labeled_dataset.parquet"
+    df.to_parquet(input_path, row_group_size=128)
+    
+    expected = apply_triple_barrier(df, time_bars=12)
+    
+    # Chunks smaller than, close to and larger than the carried overlap
+    for chunk_rows in [7, 13, 250, 5000]:
+        samples = apply_triple_barrier_chunked(
+            str(input_path), str(output_path), time_bars=12, chunk_rows=chunk_rows
+        )
+        result = pd.read_parquet(output_path)
+        
+        assert samples == len(expected)
+        pd.testing.assert_frame_equal(result, expected, check_freq=False)
+
+def test_chunked_from_store(tmp_path):
+    """Chunked labeling reads a partitioned features store month by month"""
+    df = _bars(12000, seed=12, start='2024-01-10')  # ~6 weeks of M5 bars: two month partitions
+    save_partitioned(df, str(tmp_path / "store"), 'NAS100', 'M5')
+    output_path = tmp_path / "labeled_dataset.parquet"
+    
+    samples = apply_triple_barrier_chunked(
+        str(tmp_path / "store"), str(output_path), time_bars=12, chunk_rows=3000,
+        symbol='NAS100', timeframe='M5'
+    )
+    expected = apply_triple_barrier(df, time_bars=12)
+    assert samples == len(expected)
+    pd.testing.assert_frame_equal(pd.read_parquet(output_path), expected, check_freq=False)
+
+def test_barrier_outcome_columns():
+    """t1, barrier_hit, barrier_return and label_short come out of the same pass"""
+    dates = pd.date_range('2024-01-01', periods=8, freq='5min')
+    df = pd.DataFrame({
+        'open':   [100, 100, 100, 100, 100, 100, 100, 100],
+        'high':   [100, 101, 103, 100, 100, 100, 100, 100],
+        'low':    [100,  99, 100, 100, 100, 98.5, 100, 100],
+        'close':  [100, 100, 100, 100, 100, 100, 100, 101],
+        'atr_14': [1.0, 1.0, 1.0, 1.0, 1.0, 1.0, 1.0, 1.0]
+    }, index=dates)
+    
+    df_labeled = apply_triple_barrier(df, tp_multiplier=2.0, sl_multiplier=1.0, time_bars=2, handle_neutrals='keep')
+    assert all(col in df_labeled.columns for col in LABEL_COLUMNS)
+    
+    # Bar 0: SL (99) touched on bar 1 before TP (102) on bar 2
+    row = df_labeled.loc[dates[0]]
+    assert row['label'] == 0 and row['barrier_hit'] == 'sl'
+    assert row['t1'] == dates[1]
+    assert abs(row['barrier_return'] - (-0.01)) < 1e-12
+    
+    # Bar 1: TP touched on bar 2
+    row = df_labeled.loc[dates[1]]
+    assert row['label'] == 1 and row['barrier_hit'] == 'tp' and row['t1'] == dates[2]
+    assert abs(row['barrier_return'] - 0.02) < 1e-12
+    
+    # Bar 2: nothing touched -> time barrier, exit at close of bar 4
+    row = df_labeled.loc[dates[2]]
+    assert row['label'] == -1 and row['barrier_hit'] == 'time' and row['t1'] == dates[4]
+    assert row['barrier_return'] == 0.0
+    
+    # Bar 3: low 98.5 hits the long SL (99) but neither short barrier (TP 98, SL 101)
+    row = df_labeled.loc[dates[3]]
+    assert row['label'] == 0 and row['label_short'] == -1
+    
+    # Last time_bars rows have no complete forward window
+    assert dates[-1] not in df_labeled.index
+    
+    # Dropping neutrals keeps only decided long labels
+    df_dropped = apply_triple_barrier(df, tp_multiplier=2.0, sl_multiplier=1.0, time_bars=2)
+    assert (df_dropped['label'] != -1).all()
+
+def test_short_label_mirrors_long():
+    """Short-side label on a series equals the long label on the mirrored series"""
+    df = _bars(400, seed=5)
+    mirrored = df.assign(high=200 - df['low'], low=200 - df['high'], close=200 - df['close'])
+    
+    labeled = apply_triple_barrier(df, handle_neutrals='keep')
+    labeled_mirror = apply_triple_barrier(mirrored, handle_neutrals='keep')
+    np.testing.assert_array_equal(labeled['label_short'].to_numpy(), labeled_mirror['label'].to_numpy())
+
+def test_label_grid_matches_single_runs():
+    """Each grid row must equal a separate single-config labeling run"""
+    df = _bars(1500, seed=21)
+    df.iloc[:14, df.columns.get_loc('atr_14')] = np.nan
+    df.iloc[300, df.columns.get_loc('high')] = np.nan
+    
+    configs = make_barrier_grid([1.0, 2.0, 3.0], [0.5, 1.0], [1, 12, 40])
+    
+    # Small chunks + 2 workers exercise the block boundaries and the process pool
+    labels, configs_df = triple_barrier_grid(df, configs, n_jobs=2, chunk_size=256)
+    assert labels.shape == (len(configs), len(df))
+    assert len(configs_df) == len(configs)
+    
+    for row, config in zip(labels, configs):
+        expected, _ = triple_barrier_labels(df['close'], df['high'], df['low'], df['atr_14'], **config)
+        np.testing.assert_array_equal(row, expected)
+
+def test_label_grid_from_config(tmp_path):
+    """The labeling `grid` section sweeps the features store, one summary row per config"""
+    df = _bars(2000, seed=22)
+    save_partitioned(df, str(tmp_path / "store"), 'NAS100', 'M5')
+    grid = {'tp_multipliers': [1.0, 2.0], 'sl_multipliers': [1.0], 'time_bars': [12, 24], 'n_jobs': 1}
+    
+    summary = label_grid(tmp_path / "store", grid, 'NAS100', 'M5')
+    assert len(summary) == 4
+    for row in summary.itertuples():
+        expected = apply_triple_barrier(df, row.tp_multiplier, row.sl_multiplier, int(row.time_bars))
+        assert row.n_tp == (expected['label'] == 1).sum()
+        assert row.n_sl == (expected['label'] == 0).sum()
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
@@ -0,0 +1,68 @@
+"""
+TEST: Columnar Trade Ledger
+"""
+import pytest
+import pandas as pd
+import numpy as np
+
+from aurum_edge.backtest.ledger import TradeLedger
+from aurum_edge.backtest.metrics import calculate_win_rate
+from aurum_edge.execution.paper import PaperTradingEngine
+
+def _recomputed(pnl, initial_balance):
+    """Metrics from scratch, as the list-of-dicts engines computed them"""
+    equity = initial_balance + np.concatenate([[0], np.cumsum(pnl)])
+    peak = np.maximum.accumulate(equity)
+    wins, losses = pnl[pnl > 0], pnl[pnl < 0]
+    return {
+        'total_pnl': pnl.sum(),
+        'num_trades': len(pnl),
+        'win_rate': len(wins) / len(pnl),
+        'avg_win': wins.mean(),
+        'avg_loss': losses.mean(),
+        'profit_factor': abs(wins.sum() / losses.sum()),
+        'max_drawdown': ((equity - peak) / peak).min(),
+        'expectancy': pnl.mean()
+    }
+
+def test_running_metrics_match_recomputation():
+    """Appends (past the initial capacity) and bulk extends keep exact running totals"""
+    rng = np.random.default_rng(0)
+    pnl = rng.normal(0.5, 10, 500)
+    times = pd.date_range('2024-01-01', periods=500, freq='15min')
+    
+    ledger = TradeLedger(1000.0, capacity=8)
+    for t, p in zip(times, pnl):
+        ledger.append(entry_time=t, exit_time=t + pd.Timedelta(minutes=10),
+                      entry_price=100.0, exit_price=100.0 + p, pnl=p)
+    
+    expected = _recomputed(pnl, 1000.0)
+    for key, value in ledger.metrics().items():
+        assert value == pytest.approx(expected[key]), key
+    
+    bulk = TradeLedger(1000.0, capacity=8)
+    bulk.extend({'entry_time': times[:200], 'exit_time': times[:200], 'entry_price': np.full(200, 100.0),
+                 'exit_price': 100.0 + pnl[:200], 'pnl': pnl[:200]})
+    bulk.extend({'entry_time': times[200:], 'exit_time': times[200:], 'entry_price': np.full(300, 100.0),
+                 'exit_price': 100.0 + pnl[200:], 'pnl': pnl[200:]})
+    assert bulk.metrics() == pytest.approx(ledger.metrics())
+    
+    frame = ledger.to_frame()
+    assert len(frame) == 500 and frame['entry_time'].iloc[-1] == times[-1]
+    assert ledger[-1].pnl == pnl[-1]
+    assert calculate_win_rate(ledger) == calculate_win_rate(frame) == expected['win_rate']
+
+def test_paper_trades_recorded_in_ledger():
+    """Closed paper trades land in the ledger with their direction"""
+    engine = PaperTradingEngine(initial_balance=1000.0)
+    trade = engine.execute_trade(16500.0, 'short', size=0.1, stop_loss=16520.0, take_profit=16450.0)
+    engine.close_trade(trade, exit_price=16450.0)
+    
+    summary = engine.get_summary()
+    assert summary['num_trades'] == 1 and summary['open_trades'] == 0
+    assert summary['total_pnl'] == pytest.approx(5.0)
+    assert summary['win_rate'] == 1.0
+    assert engine.trades[0].direction == -1
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,65 @@
+"""
+TEST: Dtype Policy and Memory Report
+"""
+import pytest
+import pandas as pd
+import numpy as np
+
+from aurum_edge.core.memory import MemoryReport, compact_frame
+from aurum_edge.features.build import build_all_features
+from aurum_edge.labeling.triple_barrier import apply_triple_barrier
+
+def _bars(n=2000):
+    dates = pd.date_range('2024-01-01', periods=n, freq='5min')
+    close = np.random.default_rng(0).normal(0, 5, n).cumsum() + 16000
+    return pd.DataFrame({
+        'open': close,
+        'high': close + 3,
+        'low': close - 3,
+        'close': close,
+        'tickvolume': (np.arange(n) % 500 + 1).astype(np.int32)
+    }, index=dates)
+
+def test_compact_features_and_labels():
+    """Prices stay float64, features float32, flags/labels int8, no scratch columns"""
+    df = _bars()
+    features = build_all_features(df, {'validate_on_build': False})
+    compact = compact_frame(features)
+    
+    assert 'tr' in features.columns and 'tr' not in compact.columns
+    assert (compact[['open', 'high', 'low', 'close']].dtypes == np.float64).all()
+    assert compact['atr_14'].dtype == np.float32
+    assert compact['session_london'].dtype == np.int8
+    assert compact['tickvolume'].dtype == np.int32
+    np.testing.assert_allclose(compact['ema_21'], features['ema_21'], rtol=1e-6)
+    
+    labeled = compact_frame(apply_triple_barrier(compact))
+    assert labeled['label'].dtype == np.int8 and labeled['label_short'].dtype == np.int8
+    assert labeled['barrier_return'].dtype == np.float32
+    assert labeled.memory_usage().sum() < 0.7 * apply_triple_barrier(features).memory_usage().sum()
+
+def test_compact_dtypes_do_not_depend_on_values():
+    """Two batches of the same columns get the same dtypes whatever their values"""
+    quiet = pd.DataFrame({'tick_volume': [0, 1, 1], 'session_asian': [0, 0, 0], 'label': [0, 1, 0]})
+    busy = pd.DataFrame({'tick_volume': [120, 7, 3000], 'session_asian': [1, 0, 1], 'label': [1, 1, 0]})
+    
+    assert (compact_frame(quiet).dtypes == compact_frame(busy).dtypes).all()
+    assert compact_frame(quiet)['tick_volume'].dtype == np.int32
+    assert compact_frame(quiet)['session_asian'].dtype == np.int8
+
+def test_memory_report(tmp_path):
+    """One row per stage, saved as CSV"""
+    df = _bars()
+    report = MemoryReport('build_test')
+    report.record('load', df)
+    report.record('compact', compact_frame(df))
+    report.record('save')
+    
+    path = report.save(str(tmp_path))
+    saved = pd.read_csv(path)
+    assert list(saved['stage']) == ['load', 'compact', 'save']
+    assert saved['rows'].iloc[0] == len(df) and pd.isna(saved['rows'].iloc[2])
+    assert (saved['peak_rss_mb'] > 0).all()
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
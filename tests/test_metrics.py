@@ -0,0 +1,110 @@
+"""
+TEST: Vectorized Performance Metrics
+"""
+import pytest
+import pandas as pd
+import numpy as np
+
+from aurum_edge.backtest.engine import VectorizedBacktestEngine
+from aurum_edge.backtest.metrics import aggregate_folds, performance_metrics, rolling_metrics
+
+def _loop_metrics(equity, positions, periods_per_year):
+    """Reference metrics with explicit loops"""
+    returns = [equity[i] / equity[i - 1] - 1 for i in range(1, len(equity))]
+    peak, drawdowns, duration, longest = equity[0], [], 0, 0
+    for value in equity:
+        if value >= peak:
+            peak, duration = value, 0
+        else:
+            duration += 1
+        drawdowns.append(value / peak - 1)
+        longest = max(longest, duration)
+    mean, std = np.mean(returns), np.std(returns, ddof=1)
+    downside = np.sqrt(np.mean([min(r, 0) ** 2 for r in returns]))
+    changes = [abs(positions[i] - (positions[i - 1] if i else 0)) for i in range(len(positions))]
+    return {
+        'sharpe': mean / std * np.sqrt(periods_per_year),
+        'sortino': mean / downside * np.sqrt(periods_per_year),
+        'max_drawdown': min(drawdowns),
+        'max_drawdown_duration': longest,
+        'ulcer_index': np.sqrt(np.mean(np.square(drawdowns))),
+        'exposure': sum(p != 0 for p in positions) / len(positions),
+        'turnover': sum(changes) * periods_per_year / len(positions)
+    }
+
+def test_performance_metrics_match_loop():
+    """One vectorized pass reproduces the loop definitions"""
+    rng = np.random.default_rng(0)
+    equity = 1000 * np.cumprod(1 + rng.normal(0.0002, 0.01, 2000))
+    positions = rng.choice([-1.0, 0.0, 0.0, 1.0], 2000)
+
+    metrics = performance_metrics(equity, positions, periods_per_year=252)
+    for key, value in _loop_metrics(equity, positions, 252).items():
+        assert metrics[key] == pytest.approx(value), key
+    assert metrics['calmar'] == pytest.approx(metrics['annual_return'] / -metrics['max_drawdown'])
+    assert performance_metrics([1000.0]) == {}
+
+def test_rolling_metrics_match_window_slices():
+    """Each rolling row equals the metrics of its window"""
+    rng = np.random.default_rng(1)
+    index = pd.date_range('2024-01-01', periods=500, freq='5min')
+    equity = 1000 * np.cumprod(1 + rng.normal(0, 0.001, 500))
+    positions = rng.choice([0.0, 1.0], 500)
+    window = 50
+
+    rolling = rolling_metrics(equity, window, positions, periods_per_year=252 * 288, index=index)
+    assert rolling.index.equals(index)
+    assert rolling.iloc[:window].drop(columns=['drawdown', 'exposure']).isna().all().all()
+
+    for end in (window, 200, 499):
+        sliced = performance_metrics(equity[end - window:end + 1], periods_per_year=252 * 288)
+        row = rolling.iloc[end]
+        assert row['return'] == pytest.approx(sliced['total_return'])
+        assert row['sharpe'] == pytest.approx(sliced['sharpe'])
+        assert row['sortino'] == pytest.approx(sliced['sortino'])
+        assert row['drawdown'] == pytest.approx(equity[end] / equity[end - window + 1:end + 1].max() - 1)
+        assert row['exposure'] == pytest.approx((positions[end - window + 1:end + 1] != 0).mean())
+
+def test_aggregate_folds():
+    """Summary statistics and trade-weighted averages across folds"""
+    folds = [
+        {'fold': 0, 'sharpe': 1.0, 'max_drawdown': -0.10, 'num_trades': 10, 'test_start': '2024-01-01'},
+        {'fold': 1, 'sharpe': 3.0, 'max_drawdown': -0.02, 'num_trades': 30, 'test_start': '2024-01-15'},
+        {'fold': 2, 'sharpe': np.nan, 'max_drawdown': -0.05, 'num_trades': 0, 'test_start': '2024-02-01'}
+    ]
+    summary = aggregate_folds(folds)
+
+    assert list(summary.index) == ['mean', 'median', 'std', 'min', 'max', 'weighted']
+    assert 'test_start' not in summary.columns
+    assert summary.loc['mean', 'sharpe'] == pytest.approx(2.0)
+    assert summary.loc['weighted', 'sharpe'] == pytest.approx(2.5)
+    assert summary.loc['min', 'max_drawdown'] == pytest.approx(-0.10)
+    assert summary.loc['weighted', 'max_drawdown'] == pytest.approx(-0.04)
+    assert aggregate_folds(pd.DataFrame(folds), weight=None).loc['weighted', 'sharpe'] == pytest.approx(2.0)
+
+def test_engine_equity_metrics():
+    """The vectorized engine reports the metrics of its equity and positions"""
+    n = 400
+    rng = np.random.default_rng(2)
+    close = 15000 + np.cumsum(rng.normal(0, 5, n))
+    prices = pd.DataFrame({
+        'open': close, 'high': close + 3, 'low': close - 3, 'close': close, 'atr_14': 10.0
+    }, index=pd.date_range('2024-01-01', periods=n, freq='5min'))
+    signals = np.where(rng.uniform(size=n) > 0.9, 1, 0)
+
+    engine = VectorizedBacktestEngine(periods_per_year=252 * 288)
+    metrics = engine.run(signals, prices)
+    expected = performance_metrics(
+        np.concatenate([[engine.initial_balance], engine.equity.to_numpy()]),
+        np.concatenate([[0.0], engine.positions.to_numpy()]),
+        periods_per_year=252 * 288
+    )
+
+    assert metrics['num_trades'] == len(engine.ledger)
+    for key, value in expected.items():
+        assert metrics[key] == pytest.approx(value), key
+    assert 0 < metrics['exposure'] < 1
+    assert (engine.positions.abs() <= engine.position_size).all()
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,82 @@
+"""
+TEST: Monte Carlo Robustness
+"""
+import pytest
+import pandas as pd
+import numpy as np
+
+from aurum_edge.backtest.ledger import TradeLedger
+from aurum_edge.backtest.montecarlo import resample_indices, run_monte_carlo, simulate_paths
+from aurum_edge.models.gating import should_promote_model
+
+def _ledger(pnl, initial_balance=1000.0):
+    ledger = TradeLedger(initial_balance)
+    times = pd.date_range('2024-01-01', periods=len(pnl), freq='h')
+    ledger.extend({'entry_time': times, 'exit_time': times, 'entry_price': np.full(len(pnl), 100.0),
+                   'exit_price': np.full(len(pnl), 100.0), 'pnl': pnl})
+    return ledger
+
+def test_resample_indices():
+    """Shuffles are permutations, blocks are runs of consecutive trades"""
+    rng = np.random.default_rng(0)
+    shuffled = resample_indices(50, 20, 'shuffle', rng=rng)
+    assert (np.sort(shuffled, axis=1) == np.arange(50)).all()
+
+    blocks = resample_indices(50, 20, 'block', block_size=5, rng=rng)
+    assert blocks.shape == (20, 50)
+    steps = np.diff(blocks.reshape(20, 10, 5), axis=2) % 50
+    assert (steps == 1).all()
+
+    drawn = resample_indices(50, 20, 'bootstrap', rng=rng)
+    assert drawn.min() >= 0 and drawn.max() < 50
+    with pytest.raises(ValueError):
+        resample_indices(50, 20, 'jackknife')
+
+def test_paths_match_ledger_metrics():
+    """Each path's metrics are those of a ledger filled with its trades"""
+    rng = np.random.default_rng(1)
+    pnl = rng.normal(1, 20, 200)
+    paths = simulate_paths(_ledger(pnl), n_paths=50, method='bootstrap', ruin_fraction=0.1, seed=3)
+
+    rerun = np.random.default_rng(np.random.SeedSequence(3).spawn(1)[0])
+    idx = resample_indices(len(pnl), 50, 'bootstrap', rng=rerun)
+    for i in (0, 17, 49):
+        metrics = _ledger(pnl[idx[i]]).metrics()
+        assert paths.loc[i, 'final_pnl'] == pytest.approx(metrics['total_pnl'])
+        assert paths.loc[i, 'max_drawdown'] == pytest.approx(metrics['max_drawdown'])
+        assert paths.loc[i, 'profit_factor'] == pytest.approx(metrics['profit_factor'])
+        balance = 1000 + np.cumsum(pnl[idx[i]])
+        assert paths.loc[i, 'ruined'] == (balance.min() <= 900)
+
+def test_shuffle_keeps_totals_and_seeding():
+    """Shuffles only reorder; results do not depend on the worker count"""
+    pnl = np.random.default_rng(2).normal(0.5, 10, 300)
+    paths = simulate_paths(pnl, n_paths=200, method='shuffle')
+    assert np.allclose(paths['final_pnl'], pnl.sum())
+    assert paths['max_drawdown'].nunique() > 1
+
+    serial = simulate_paths(pnl, n_paths=30_000, n_jobs=1, seed=5)
+    parallel = simulate_paths(pnl, n_paths=30_000, n_jobs=2, seed=5)
+    pd.testing.assert_frame_equal(serial, parallel)
+
+def test_summary_feeds_gating():
+    """Percentiles, risk of ruin and the robustness gates"""
+    rng = np.random.default_rng(3)
+    edge = rng.normal(2, 10, 400)
+    _, summary = run_monte_carlo(edge, config={'n_paths': 5000, 'percentiles': [5, 50]})
+    assert summary['n_paths'] == 5000
+    assert summary['max_drawdown_p5'] <= summary['max_drawdown_p50'] <= 0
+    assert summary['profit_factor_p5'] <= summary['profit_factor_p50']
+    assert summary['risk_of_ruin'] == 0
+
+    losing = rng.normal(-1, 20, 400)
+    _, ruinous = run_monte_carlo(losing, config={'n_paths': 5000, 'ruin_fraction': 0.2})
+    assert ruinous['risk_of_ruin'] > 0.5
+
+    thresholds = {'min_profit_factor': 1.0, 'max_drawdown': -0.5, 'min_trades': 100}
+    point = {'profit_factor': 1.2, 'max_drawdown': -0.1, 'expectancy': 1.0, 'num_trades': 400}
+    assert should_promote_model({**point, **summary}, thresholds)
+    assert not should_promote_model({**point, **ruinous}, thresholds)
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -6,7 +6,10 @@ import pytest
 import pandas as pd
 import numpy as np
 
-from aurum_edge.data.split import train_test_split_temporal, get_walk_forward_splits
+from aurum_edge.data.split import (
+    train_test_split_temporal, get_walk_forward_splits, iter_walk_forward_bounds,
+    CombinatorialPurgedKFold
+)
 
 def test_temporal_split_no_overlap():
     """Test that train and test sets don't overlap"""
@@ -45,5 +48,61 @@ def test_walk_forward_splits_sequential():
     
     print(f"✓ Walk-forward splits validated: {len(splits)} folds")
 
+def test_walk_forward_bounds_match_masks():
+    """Positional folds select the same rows as date masks, as views of the frame"""
+    dates = pd.date_range('2024-01-01', periods=60000, freq='5min')
+    df = pd.DataFrame({'value': np.random.randn(60000)}, index=dates)
+    
+    splits = get_walk_forward_splits(df, train_months=2, test_weeks=2, step_weeks=2)
+    assert len(splits) > 0
+    
+    from dateutil.relativedelta import relativedelta
+    for i, (train, test) in enumerate(splits):
+        train_start = dates[0] + relativedelta(weeks=2 * i)
+        train_end = train_start + relativedelta(months=2)
+        test_end = train_end + relativedelta(weeks=2)
+        assert train.index.equals(df.index[(df.index >= train_start) & (df.index < train_end)])
+        assert test.index.equals(df.index[(df.index >= train_end) & (df.index < test_end)])
+        assert np.shares_memory(train['value'].to_numpy(), df['value'].to_numpy())
+    
+    # Purge trims the end of train, embargo the start of test
+    for plain, bounds in zip(iter_walk_forward_bounds(df.index, 2, 2, 2),
+                             iter_walk_forward_bounds(df.index, 2, 2, 2, purge_bars=10, embargo_bars=5)):
+        assert bounds.train_start == plain.train_start
+        assert bounds.train_end == plain.train_end - 10
+        assert bounds.test_start == plain.test_start + 5
+        assert bounds.test_end == plain.test_end
+
+def test_cpcv_purges_overlapping_labels():
+    """No train label interval overlaps a test block; embargo follows each block"""
+    n = 600
+    dates = pd.date_range('2024-01-01', periods=n, freq='5min')
+    horizon = np.random.default_rng(0).integers(1, 12, n)
+    t1 = pd.Series(dates[np.minimum(np.arange(n) + horizon, n - 1)], index=dates)
+    
+    cv = CombinatorialPurgedKFold(n_groups=6, n_test_groups=2, embargo_bars=5)
+    splits = list(cv.split(dates, t1))
+    assert len(splits) == cv.n_splits == 15
+    assert cv.n_paths == 5
+    
+    bounds = cv.group_bounds(n)
+    for (train, test), combo in zip(splits, cv.combinations):
+        assert len(np.intersect1d(train, test)) == 0
+        assert len(test) == sum(bounds[g][1] - bounds[g][0] for g in combo)
+        for g in combo:
+            a, b = bounds[g]
+            block_start, block_end = dates[a], t1.iloc[a:b].max()
+            overlaps = (dates[train] <= block_end) & (t1.iloc[train].to_numpy() >= block_start)
+            assert not overlaps.any()
+            if b < n and b not in test:
+                assert not np.isin(np.arange(b, min(b + 5, n)), train).any()
+    
+    # Every group is tested exactly once per path
+    paths = cv.paths()
+    assert paths.shape == (5, 6)
+    for g in range(6):
+        assert all(g in cv.combinations[s] for s in paths[:, g])
+        assert len(set(paths[:, g])) == 5
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
@@ -0,0 +1,59 @@
+"""
+TEST: Partitioned OHLC Store
+"""
+import pytest
+import pandas as pd
+import numpy as np
+
+from aurum_edge.data.store import save_partitioned, load_partitioned, list_partitions
+
+def _bars(start: str, periods: int) -> pd.DataFrame:
+    dates = pd.date_range(start, periods=periods, freq='5min', name='datetime')
+    close = np.random.default_rng(0).normal(0, 1, periods).cumsum() + 100
+    return pd.DataFrame({
+        'open': close,
+        'high': close + 1,
+        'low': close - 1,
+        'close': close,
+        'tick_volume': np.arange(periods)
+    }, index=dates)
+
+def test_round_trip_and_partitions(tmp_path):
+    """Saved bars come back identical and are split by symbol/timeframe/month"""
+    df = _bars('2024-01-20', 20000)  # ~70 days -> 3 months
+    save_partitioned(df, str(tmp_path), 'NAS100', 'M5', row_group_rows=1000)
+    save_partitioned(df.iloc[:50], str(tmp_path), 'US30', 'M5')
+
+    loaded = load_partitioned(str(tmp_path), symbol='NAS100', timeframe='M5')
+    pd.testing.assert_frame_equal(loaded, df, check_freq=False)
+
+    partitions = list_partitions(str(tmp_path))
+    assert len(partitions) == 4
+    assert set(partitions[partitions['symbol'] == 'NAS100']['month']) == {'2024-01', '2024-02', '2024-03'}
+
+def test_date_filter_and_projection(tmp_path):
+    """Date range [start, end) and column selection are applied on load"""
+    df = _bars('2024-01-20', 20000)
+    save_partitioned(df, str(tmp_path), 'NAS100', 'M5', row_group_rows=1000)
+
+    start, end = pd.Timestamp('2024-02-03'), pd.Timestamp('2024-02-05 12:00')
+    loaded = load_partitioned(str(tmp_path), 'NAS100', 'M5', start=start, end=end, columns=['close'])
+
+    expected = df.loc[(df.index >= start) & (df.index < end), ['close']]
+    pd.testing.assert_frame_equal(loaded, expected, check_freq=False)
+
+def test_resave_replaces_months(tmp_path):
+    """Re-saving a month replaces it without touching the other months"""
+    df = _bars('2024-01-20', 20000)
+    save_partitioned(df, str(tmp_path), 'NAS100', 'M5')
+
+    february = df[df.index.month == 2].assign(close=0.0)
+    save_partitioned(february, str(tmp_path), 'NAS100', 'M5')
+
+    loaded = load_partitioned(str(tmp_path), 'NAS100', 'M5')
+    assert len(loaded) == len(df)
+    assert (loaded.loc[loaded.index.month == 2, 'close'] == 0.0).all()
+    assert (loaded.loc[loaded.index.month != 2, 'close'] != 0.0).all()
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,67 @@
+"""
+TEST: Batch Parameter Sweep
+"""
+import pytest
+import pandas as pd
+import numpy as np
+
+from aurum_edge.backtest.sweep import sweep_parameters
+
+def _prices(n=2000, seed=0):
+    rng = np.random.default_rng(seed)
+    close = 16000 + rng.normal(0, 5, n).cumsum()
+    open_ = close + rng.normal(0, 1, n)
+    return pd.DataFrame({
+        'open': open_,
+        'high': np.maximum(close, open_) + rng.uniform(0, 4, n),
+        'low': np.minimum(close, open_) - rng.uniform(0, 4, n),
+        'close': close,
+        'atr_14': rng.uniform(3, 8, n)
+    }, index=pd.date_range('2024-01-01', periods=n, freq='5min'))
+
+def _reference(predictions, prices, threshold, hold, tp, sl):
+    """One trade per qualifying bar, resolved bar by bar"""
+    o, h, l, c, atr = (prices[col].to_numpy() for col in ['open', 'high', 'low', 'close', 'atr_14'])
+    returns = []
+    for i in range(len(c)):
+        if predictions[i] < threshold or i + hold > len(c) - 1:
+            continue
+        tp_price, sl_price = c[i] + tp * atr[i], c[i] - sl * atr[i]
+        exit_price = c[i + hold]
+        for j in range(i + 1, i + hold + 1):
+            if l[j] <= sl_price:
+                exit_price = min(sl_price, o[j])
+                break
+            if h[j] >= tp_price:
+                exit_price = max(tp_price, o[j])
+                break
+        returns.append((exit_price - c[i] - 0.25) / c[i])
+    return np.array(returns)
+
+def test_sweep_matches_per_combination_loop():
+    """Every row equals a separate bar-by-bar evaluation of that combination"""
+    prices = _prices()
+    predictions = np.random.default_rng(1).uniform(size=len(prices))
+    
+    result = sweep_parameters(
+        predictions, prices,
+        thresholds=[0.5, 0.7, 0.9], hold_bars=[3, 12],
+        tp_multipliers=[1.0, 2.0, np.inf], sl_multipliers=[1.0, np.inf],
+        chunk_size=300
+    )
+    assert len(result) == 3 * 2 * 3 * 2
+    
+    for row in result.sample(10, random_state=0).itertuples():
+        returns = _reference(predictions, prices, row.threshold, row.hold_bars,
+                             row.tp_multiplier, row.sl_multiplier)
+        assert row.n_trades == len(returns)
+        assert row.win_rate == pytest.approx((returns > 0).mean())
+        assert row.total_return == pytest.approx(returns.sum())
+        assert row.trade_sharpe == pytest.approx(returns.mean() / returns.std(ddof=1))
+    
+    # Higher thresholds select subsets
+    counts = result.groupby(['hold_bars', 'tp_multiplier', 'sl_multiplier'])['n_trades']
+    assert counts.apply(lambda c: c.is_monotonic_decreasing).all()
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
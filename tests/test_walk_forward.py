@@ -0,0 +1,145 @@
+"""
+TEST: Parallel Walk-Forward Runner and Fold Cache
+"""
+import pytest
+import pandas as pd
+import numpy as np
+
+from aurum_edge.backtest.walk_forward import run_walk_forward, iter_walk_forward
+from aurum_edge.pipelines.run_walkforward import WalkForwardModel
+
+CONFIG = {
+    'windows': {'train_months': 1, 'test_weeks': 1, 'step_weeks': 1},
+    'purging': {'enabled': True, 'purge_bars': 10},
+    'embargo': {'enabled': True, 'embargo_bars': 5}
+}
+CALLS = []
+
+def _fold_stats(train_df, test_df):
+    """Module level so worker processes can unpickle it"""
+    CALLS.append(test_df.index[0])
+    return {
+        'train_end': train_df.index[-1],
+        'test_start': test_df.index[0],
+        'test_mean': float(test_df['value'].mean())
+    }
+
+class _PricesMean:
+    """Callable model reading the test window of `prices` (module level for the workers)"""
+    def __init__(self, scale=1.0):
+        self.scale = scale
+    
+    def __call__(self, train_df, test_df, prices=None):
+        CALLS.append(test_df.index[0])
+        window = prices.loc[test_df.index[0]:test_df.index[-1], 'value'].to_numpy()
+        return {'test_start': test_df.index[0], 'mean': float(window.mean()) * self.scale,
+                'read_only': not window.flags.writeable}
+
+def _dataset(n=20000):
+    dates = pd.date_range('2024-01-01', periods=n, freq='5min')
+    return pd.DataFrame({'value': np.random.default_rng(0).normal(size=n)}, index=dates)
+
+def test_parallel_matches_serial():
+    """Workers read the memory-mapped dataset; results come back in fold order"""
+    df = _dataset()
+    
+    serial = run_walk_forward(df, _fold_stats, CONFIG, n_jobs=1)
+    parallel = run_walk_forward(df, _fold_stats, CONFIG, n_jobs=2)
+    
+    assert len(serial) > 2
+    assert parallel == serial
+    for fold in serial:
+        # Purge + embargo leave 15 bars between train and test
+        assert fold['test_start'] - fold['train_end'] == pd.Timedelta(minutes=5 * 16)
+
+def test_cache_recomputes_changed_folds_only(tmp_path):
+    """Reruns hit the cache; new params or changed rows only redo affected folds"""
+    df = _dataset()
+    CALLS.clear()
+    
+    first = run_walk_forward(df, _fold_stats, CONFIG, n_jobs=1, cache_dir=str(tmp_path))
+    assert len(CALLS) == len(first)
+    
+    CALLS.clear()
+    assert run_walk_forward(df, _fold_stats, CONFIG, n_jobs=1, cache_dir=str(tmp_path)) == first
+    assert CALLS == []
+    
+    # Changing a row of the last test window only touches that fold
+    df.loc[first[-1]['test_start'], 'value'] = 0.0
+    streamed = list(iter_walk_forward(df, _fold_stats, CONFIG, n_jobs=1, cache_dir=str(tmp_path)))
+    assert len(CALLS) == 1 and len(streamed) == len(first)
+    
+    CALLS.clear()
+    run_walk_forward(df, _fold_stats, CONFIG, n_jobs=1, cache_dir=str(tmp_path), params={'max_depth': 4})
+    assert len(CALLS) == len(first)
+
+def test_prices_memory_mapped_and_cached(tmp_path):
+    """Workers read `prices` memory-mapped; its test windows and the model state are in the cache key"""
+    prices = _dataset()
+    df = prices.iloc[::2]  # labeled subset
+    
+    serial = run_walk_forward(df, _PricesMean(), CONFIG, n_jobs=1, prices=prices)
+    parallel = run_walk_forward(df, _PricesMean(), CONFIG, n_jobs=2, prices=prices)
+    assert [f['mean'] for f in parallel] == [f['mean'] for f in serial]
+    assert all(f['read_only'] for f in parallel)
+    
+    CALLS.clear()
+    first = run_walk_forward(df, _PricesMean(), CONFIG, n_jobs=1, cache_dir=str(tmp_path), prices=prices)
+    assert len(CALLS) == len(first)
+    
+    # A price outside the labeled rows, in the last test window
+    CALLS.clear()
+    changed = prices.copy()
+    changed.iloc[prices.index.get_loc(first[-1]['test_start']) + 1, 0] += 1.0
+    run_walk_forward(df, _PricesMean(), CONFIG, n_jobs=1, cache_dir=str(tmp_path), prices=changed)
+    assert len(CALLS) == 1
+    
+    CALLS.clear()
+    run_walk_forward(df, _PricesMean(scale=2.0), CONFIG, n_jobs=1, cache_dir=str(tmp_path), prices=prices)
+    assert len(CALLS) == len(first)
+
+def test_warm_started_folds():
+    """Each fold boosts on from the previous booster and is backtested with costs"""
+    df = _dataset()
+    rng = np.random.default_rng(1)
+    # 'value' predicts the next bar's move
+    moves = 3 * df['value'].to_numpy() + rng.normal(0, 1, len(df))
+    df['close'] = 16000 + np.concatenate([[0.0], moves[:-1]]).cumsum()
+    df['high'] = df['close'] + 0.5
+    df['low'] = df['close'] - 0.5
+    df['atr_14'] = 2.0
+    df['label'] = (moves > 0).astype(int)
+    
+    retraining = {'num_boost_round': 30, 'warm_start_rounds': 5, 'calibration_fraction': 0.1}
+    barriers = {'tp_multiplier': 1.0, 'sl_multiplier': 1.0, 'time_bars': 12}
+    model = WalkForwardModel(retraining, threshold=0.5, barriers=barriers)
+    folds = run_walk_forward(df, model, CONFIG, n_jobs=1)
+    
+    assert [f['rounds'] for f in folds] == [30 + 5 * i for i in range(len(folds))]
+    assert all(f['num_trades'] > 0 and f['win_rate'] > 0.5 for f in folds)
+    assert all(len(f['trade_pnl']) == f['num_trades'] for f in folds)
+    assert all(f['exposure'] <= 1 for f in folds)  # one position at a time
+    
+    cold = WalkForwardModel({**retraining, 'warm_start': False}, threshold=0.5, barriers=barriers)
+    cold = run_walk_forward(df, cold, CONFIG, n_jobs=1)
+    assert [f['rounds'] for f in cold] == [30] * len(folds)
+    
+    # Capped tree count; a calibration tail longer than the step is still unseen by the chain
+    capped = WalkForwardModel({**retraining, 'max_boost_rounds': 40, 'calibration_fraction': 0.5},
+                              threshold=0.5, barriers=barriers)
+    capped = run_walk_forward(df, capped, CONFIG, n_jobs=1)
+    assert [f['rounds'] for f in capped] == [30, 35, 40, 30, 35, 40][:len(folds)]
+    
+    # Neutral rows (handle_neutrals: keep) are no binary target: dropped before fit and calibration
+    neutral = df.copy()
+    neutral.iloc[::7, neutral.columns.get_loc('label')] = -1
+    kept = run_walk_forward(neutral, WalkForwardModel(retraining, threshold=0.5, barriers=barriers), CONFIG, n_jobs=1)
+    assert all(f['num_trades'] > 0 for f in kept)
+    
+    # No calibration tail: warm folds fit on the whole window, uncalibrated
+    uncalibrated = WalkForwardModel({**retraining, 'calibration_fraction': 0.0}, threshold=0.5, barriers=barriers)
+    uncalibrated = run_walk_forward(df, uncalibrated, CONFIG, n_jobs=1)
+    assert [f['rounds'] for f in uncalibrated] == [30 + 5 * i for i in range(len(folds))]
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])